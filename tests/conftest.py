@@ -0,0 +1,32 @@
+"""Shared fixtures: the GUI script is loaded under win11optimizator (the name
+w11o_sim imports it by), so the tests run on Linux against the simulator."""
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = os.path.join(ROOT, "win11optimizator-bun - v1.0.1.py")
+
+def load_app():
+    if "win11optimizator" in sys.modules:
+        return sys.modules["win11optimizator"]
+    spec = importlib.util.spec_from_file_location("win11optimizator", SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["win11optimizator"] = module
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture(scope="session")
+def app():
+    return load_app()
+
+@pytest.fixture(scope="session")
+def sim(app):
+    return app.load_simulator()
+
+@pytest.fixture
+def logger():
+    import logging
+    return logging.getLogger("win11optimizator.tests")
@@ -0,0 +1,13 @@
+"""The benchmark suite measures what it says it measures."""
+
+def test_dispatch_runs_every_tweak(sim, monkeypatch):
+    runs = []
+    run_plan = sim.TweakEngine.run_plan
+
+    def counting_run_plan(self, plan, *args, **kwargs):
+        runs.append(len(plan.tweaks))
+        return run_plan(self, plan, *args, **kwargs)
+    monkeypatch.setattr(sim.TweakEngine, "run_plan", counting_run_plan)
+    result = sim.benchmark_dispatch(repeat=1, count=20)
+    assert runs == [20]
+    assert result["tweak_dispatch"]["unit"] == "us/tweak"
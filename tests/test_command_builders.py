@@ -0,0 +1,64 @@
+"""Command builders return argv lists; command_line() and powershell_command() render them."""
+import subprocess
+
+import pytest
+
+def test_sc_config_start(app):
+    assert app.sc_config_start("Spooler", "delayed-auto") == ["sc.exe", "config", "Spooler", "start=", "delayed-auto"]
+    assert app.command_line(app.sc_config_start("Some Service", "demand")) == 'sc.exe config "Some Service" start= demand'
+    with pytest.raises(ValueError):
+        app.sc_config_start("Spooler", "manual")
+
+def test_powercfg(app):
+    assert app.powercfg_hibernate(False) == ["powercfg", "/h", "off"]
+    assert app.powercfg_hibernate(True) == ["powercfg", "/h", "on"]
+    assert app.powercfg_set_active("SCHEME_MIN") == ["powercfg", "/setactive", "SCHEME_MIN"]
+    guid = "e9a42b02-d5df-448d-aa00-03f14749eb61"
+    assert app.powercfg_set_active(guid) == ["powercfg", "/setactive", guid]
+    for scheme in ("Ultimate Performance", f"{guid} & calc"):
+        with pytest.raises(ValueError):
+            app.powercfg_set_active(scheme)
+
+def test_dism_set_feature(app):
+    assert app.dism_set_feature("Recall", False) == ["DISM", "/Online", "/Disable-Feature", "/FeatureName:Recall"]
+    assert app.dism_set_feature("Recall", True)[2] == "/Enable-Feature"
+
+def test_winget(app):
+    assert app.winget_install("Google.Chrome") == ["winget", "install", "--id", "Google.Chrome", "-e",
+                                                   "--accept-source-agreements", "--accept-package-agreements"]
+    assert app.winget_uninstall("Microsoft Edge") == ["winget", "uninstall", "Microsoft Edge"]
+    assert app.command_line(app.winget_uninstall("Microsoft Edge")) == 'winget uninstall "Microsoft Edge"'
+
+def test_cleanmgr_and_delete(app):
+    assert app.cleanmgr_sagerun("1") == ["cleanmgr", "/sagerun:1"]
+    command = app.delete_directory_contents(r"C:\Users\Jane Doe\AppData\Local\Temp")
+    assert command == ["cmd.exe", "/d", "/c", "del", "/q", "/f", "/s", r"C:\Users\Jane Doe\AppData\Local\Temp\*"]
+    assert app.command_line(command).endswith(r'"C:\Users\Jane Doe\AppData\Local\Temp\*"')
+
+@pytest.mark.parametrize("argv, expected", [
+    (["sc.exe", "config", "My Service", "start=", "auto"], 'sc.exe config "My Service" start= auto'),
+    (["winget", "uninstall", 'Say "hi"'], r'winget uninstall "Say \"hi\""'),
+    (["cmd.exe", "/c", "del", ""], 'cmd.exe /c del ""'),
+])
+def test_command_line_quotes_arguments_with_spaces(app, argv, expected):
+    assert app.command_line(argv) == expected
+
+def test_powershell_command_single_quotes_every_argument(app):
+    statement = app.powershell_command(app.sc_config_start("O'Brien Service", "auto"))
+    assert statement == "& 'sc.exe' 'config' 'O''Brien Service' 'start=' 'auto'"
+
+@pytest.mark.parametrize("on_output", [None, print])
+def test_children_get_no_console_window(app, monkeypatch, on_output):
+    seen = {}
+
+    class Stop(Exception):
+        pass
+
+    def fake_popen(command, **options):
+        seen.update(options)
+        raise Stop
+    monkeypatch.setattr(subprocess, "CREATE_NO_WINDOW", 0x08000000, raising=False)
+    monkeypatch.setattr(subprocess, "Popen", fake_popen)
+    with pytest.raises(Stop):
+        app.SubprocessBackend().run(["sc.exe", "query"], on_output=on_output)
+    assert seen["creationflags"] == 0x08000000
@@ -0,0 +1,18 @@
+"""Handlers log through the logger they are given, once per line."""
+import logging
+
+import pytest
+
+@pytest.mark.parametrize("installed", [True, False])
+def test_remove_edge_logs_each_line_once(sim, app, caplog, installed):
+    engine, machine = sim.simulated_engine()
+    if not installed:
+        machine.winget_installed.pop("Microsoft.Edge")
+    events = []
+    run_log = app.RunLog(directory=None, sinks=[events.append])
+    with caplog.at_level(logging.INFO):
+        engine.remove_edge(run_log)
+    messages = [event["message"] for event in events if event["type"] == "log"]
+    assert len(messages) == len(set(messages))
+    assert any(message.startswith("Remove Edge: Winget command") for message in messages)
+    assert not [record for record in caplog.records if "Remove Edge" in record.getMessage()] # Nothing besides the run log
@@ -0,0 +1,88 @@
+"""Run journal and revert: every mutation is journaled first, and replaying the journal
+puts the machine back as it was, including values that did not exist before."""
+import pytest
+
+KEY = r"SOFTWARE\W11O\Journal"
+
+def registry_state(backend):
+    """Every value on the in-memory backend, {(key id, name): (type, data)}; empty keys are ignored."""
+    return {(key_id, name): (value_type, data)
+            for key_id, entry in backend.keys.items()
+            for name, (_, value_type, data) in entry["values"].items()}
+
+@pytest.fixture
+def backend(app):
+    backend = app.MemoryRegistryBackend()
+    handle = backend.open_key("HKCU", KEY)
+    backend.set_value(handle, "Changed", "REG_DWORD", 0)
+    backend.set_value(handle, "Deleted", "REG_SZ", "keep me")
+    backend.set_value(handle, "Blob", "REG_BINARY", b"\x00\x01")
+    backend.set_value(handle, "Untouched", "REG_SZ", "same")
+    return backend
+
+def test_revert_restores_the_original_registry(app, backend, logger, tmp_path):
+    original = registry_state(backend)
+    registry = app.RegistryEngine(backend)
+    journal = app.RunJournal(str(tmp_path / "run.journal.jsonl"))
+    batch = app.RegistryBatch()
+    for op in (app.reg_dword("HKCU", KEY, "Changed", 1),
+               app.reg_delete("HKCU", KEY, "Deleted"),
+               app.RegistryOp("HKCU", KEY, "Blob", "REG_BINARY", b"\xff"),
+               app.reg_sz("HKCU", KEY, "Untouched", "same"),
+               app.reg_dword("HKCU", KEY, "Created", 1),
+               app.reg_sz("HKLM", KEY + r"\New", "AlsoCreated", "x")):
+        batch.add(op, "tweak")
+    registry.apply_batch(batch, logger, journal)
+    journal.close()
+    assert journal.count == 5 # Values already in place are not journaled
+    assert registry_state(backend) != original
+
+    engine = app.TweakEngine(registry=registry)
+    result = engine.revert_journal(journal.path, logger)
+    assert result["failed"] == []
+    assert result["registry"] == 5
+    assert registry_state(backend) == original
+
+def test_revert_keeps_the_first_prior_value(app, backend, logger, tmp_path):
+    original = registry_state(backend)
+    registry = app.RegistryEngine(backend)
+    journal = app.RunJournal(str(tmp_path / "run.journal.jsonl"))
+    registry.apply([app.reg_dword("HKCU", KEY, "Changed", 1)], logger, journal)
+    registry.apply([app.reg_dword("HKCU", KEY, "Changed", 2)], logger, journal)
+    journal.close()
+    app.TweakEngine(registry=registry).revert_journal(journal.path, logger)
+    assert registry_state(backend) == original
+
+def test_tasks_are_restored_by_the_scheduled_task_batch(sim, app, logger, tmp_path):
+    machine = sim.WindowsSimulator()
+    machine.add_task("Vendor\\Telemetry")
+    machine.add_task("Vendor\\Updater", enabled=False)
+    engine, _ = sim.simulated_engine(machine)
+    journal = app.RunJournal(str(tmp_path / "run.journal.jsonl"))
+    engine.journal = journal
+    engine.set_tasks_enabled(logger, ["Vendor\\Telemetry"], False)
+    engine.set_tasks_enabled(logger, ["Vendor\\Updater"], True)
+    journal.close()
+    engine.journal = None
+    machine.calls.clear()
+
+    result = engine.revert_journal(journal.path, logger)
+    assert result["failed"] == []
+    assert result["tasks"] == 2
+    assert machine.tasks["vendor\\telemetry"]["enabled"] is True
+    assert machine.tasks["vendor\\updater"]["enabled"] is False
+    scripts = machine.calls_of("powershell")
+    assert any("Enable-ScheduledTask" in script for script in scripts)
+    assert any("Disable-ScheduledTask" in script for script in scripts)
+    assert machine.calls_of("process") == []
+
+def test_revert_reports_tasks_that_are_gone(sim, app, logger, tmp_path):
+    machine = sim.WindowsSimulator()
+    machine.add_task("Vendor\\Telemetry")
+    engine, _ = sim.simulated_engine(machine)
+    journal = app.RunJournal(str(tmp_path / "run.journal.jsonl"))
+    engine.journal = journal
+    engine.set_tasks_enabled(logger, ["Vendor\\Telemetry"], False)
+    journal.close()
+    del machine.tasks["vendor\\telemetry"]
+    assert engine.revert_journal(journal.path, logger)["failed"] == ["tasks"]
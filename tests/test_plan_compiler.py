@@ -0,0 +1,55 @@
+"""compile_plan: duplicate selections, merged registry writes and conflict detection."""
+import pytest
+
+KEY = r"SOFTWARE\W11O\Plan"
+
+@pytest.fixture
+def tweaks(app):
+    return app.TWEAKS
+
+def test_identical_registry_writes_merge_into_one_value(app):
+    first = app.Tweak("first", "First", (app.reg_dword("HKCU", KEY, "Shared", 1), app.reg_dword("HKCU", KEY, "Own", 1)))
+    second = app.Tweak("second", "Second", (app.reg_dword("HKCU", KEY.upper(), "shared", 1),))
+    plan = app.compile_plan([first, second])
+    assert [tweak.id for tweak in plan.tweaks] == ["first", "second"]
+    assert plan.batch.requested == 3
+    assert len(plan.batch) == 2
+    assert len(plan.batch.groups) == 1
+    (group,) = plan.batch.groups.values()
+    assert group["values"]["shared"][1] == ["first", "second"]
+    assert plan.conflicts == []
+
+def test_same_tweak_selected_twice_runs_once(tweaks, app):
+    plan = app.compile_plan([tweaks["disable_sticky_keys"], tweaks["disable_sticky_keys"]])
+    assert [tweak.id for tweak in plan.tweaks] == ["disable_sticky_keys"]
+    assert plan.duplicates == ["disable_sticky_keys"]
+
+@pytest.mark.parametrize("first, second", [
+    ("disable_sticky_keys", "enable_sticky_keys"),
+    ("disable_snap_flyout", "enable_snap_assist_flyout"),
+])
+def test_opposite_registry_writes_are_conflicts(tweaks, app, first, second):
+    plan = app.compile_plan([tweaks[first], tweaks[second]])
+    assert [(conflict.first, conflict.second) for conflict in plan.conflicts] == [(first, second)]
+    assert "both set" in plan.conflicts[0].reason
+
+def test_declared_conflicts_are_reported(tweaks, app):
+    plan = app.compile_plan([tweaks["disable_hibernation"], tweaks["set_hibernation_default"]])
+    assert [(conflict.first, conflict.second) for conflict in plan.conflicts] == [("disable_hibernation", "set_hibernation_default")]
+
+def test_one_install_per_package(tweaks, app):
+    plan = app.compile_plan([tweaks["install_chrome"], tweaks["winget:Google.Chrome"],
+                             tweaks["winget:Mozilla.Firefox"], tweaks["install_firefox"]])
+    assert [tweak.id for tweak in plan.tweaks] == ["install_chrome", "winget:Mozilla.Firefox"]
+    assert plan.duplicates == ["winget:Google.Chrome", "install_firefox"]
+
+def test_handlers_without_arguments_stay_separate(app):
+    first = app.Tweak("nvidia_tasks", "NVIDIA tasks", handler="disable_nvidia_telemetry_tasks")
+    second = app.Tweak("nvidia_tasks_again", "NVIDIA tasks again", handler="disable_nvidia_telemetry_tasks")
+    plan = app.compile_plan([first, second])
+    assert [tweak.id for tweak in plan.tweaks] == ["nvidia_tasks", "nvidia_tasks_again"]
+    assert plan.duplicates == []
+
+def test_same_handler_with_other_arguments_stays_separate(tweaks, app):
+    plan = app.compile_plan([tweaks["install_chrome"], tweaks["install_firefox"]])
+    assert [tweak.id for tweak in plan.tweaks] == ["install_chrome", "install_firefox"]
@@ -0,0 +1,57 @@
+"""SubprocessBackend must take down the whole process tree on timeout and on cancel,
+not just the direct child (a shell whose background children keep running)."""
+import os
+import shutil
+import subprocess
+import threading
+import time
+
+import pytest
+
+pytestmark = pytest.mark.skipif(os.name == "nt" or not shutil.which("pgrep"), reason="needs a POSIX shell and pgrep")
+
+def leftovers(seconds):
+    """PIDs of the `sleep <seconds>` processes still alive (killed children can take a moment to go)."""
+    for _ in range(20):
+        found = subprocess.run(["pgrep", "-f", f"sleep {seconds}"], capture_output=True, text=True).stdout.split()
+        if not found:
+            return []
+        time.sleep(0.05)
+    return found
+
+def test_timeout_kills_every_child(app):
+    backend = app.SubprocessBackend()
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        backend.run(["sh", "-c", "sleep 3017 & sleep 3018"], timeout=0.5)
+    assert time.monotonic() - start < 5
+    assert leftovers(3017) == []
+    assert leftovers(3018) == []
+
+def test_cancel_kills_every_child(app):
+    backend = app.SubprocessBackend()
+    cancel = threading.Event()
+    timer = threading.Timer(0.3, cancel.set)
+    timer.start()
+    start = time.monotonic()
+    try:
+        with pytest.raises(app.RunCancelled):
+            backend.run(["sh", "-c", "sleep 3027 & sleep 3028"], cancel=cancel)
+    finally:
+        timer.cancel()
+    assert time.monotonic() - start < 5
+    assert leftovers(3027) == []
+    assert leftovers(3028) == []
+
+def test_grandchildren_of_an_exited_child_are_killed(app):
+    # sh exits at once, but the background sleep holds the output pipe open until killed
+    backend = app.SubprocessBackend()
+    with pytest.raises(subprocess.TimeoutExpired):
+        backend.run(["sh", "-c", "sleep 3037 & echo started"], timeout=0.5)
+    assert leftovers(3037) == []
+
+def test_kill_process_tree_reaches_the_group_after_the_leader_exited(app):
+    process = subprocess.Popen(["sh", "-c", "sleep 3047 & exit 0"], **app.process_group_options())
+    process.wait()
+    app.kill_process_tree(process)
+    assert leftovers(3047) == []
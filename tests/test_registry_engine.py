@@ -0,0 +1,129 @@
+"""RegistryEngine against MemoryRegistryBackend: value types, deletes and failures."""
+import pytest
+
+KEY = r"SOFTWARE\W11O\Tests"
+SAMPLE_DATA = {
+    "REG_SZ": "text",
+    "REG_EXPAND_SZ": r"%TEMP%\w11o",
+    "REG_DWORD": 1,
+    "REG_QWORD": 2 ** 40,
+    "REG_BINARY": b"\x01\x02\xff",
+    "REG_MULTI_SZ": ["first", "second"],
+}
+
+@pytest.fixture
+def failing_backend(app):
+    """A MemoryRegistryBackend that cannot open keys named "Locked" or write values named "Broken"."""
+    class FailingBackend(app.MemoryRegistryBackend):
+        def open_key(self, hive, key):
+            if key.endswith("Locked"):
+                raise PermissionError("Access is denied")
+            return super().open_key(hive, key)
+
+        def set_value(self, handle, name, value_type, data):
+            if name == "Broken":
+                raise OSError("The parameter is incorrect")
+            super().set_value(handle, name, value_type, data)
+    return FailingBackend()
+
+@pytest.fixture
+def backend(app):
+    return app.MemoryRegistryBackend()
+
+@pytest.fixture
+def registry(app, backend):
+    return app.RegistryEngine(backend)
+
+def test_sample_data_covers_every_type(app):
+    assert set(SAMPLE_DATA) == set(app.REGISTRY_VALUE_TYPES)
+
+@pytest.mark.parametrize("value_type", sorted(SAMPLE_DATA))
+def test_writes_each_value_type(app, registry, backend, value_type):
+    op = app.RegistryOp("HKLM", KEY, f"Value{value_type}", value_type, SAMPLE_DATA[value_type])
+    result = registry.apply([op])
+    assert result["writes"] == 1
+    assert backend.get_value("HKLM", KEY, op.name) == (value_type, SAMPLE_DATA[value_type])
+
+def test_names_and_keys_are_case_insensitive(app, registry, backend):
+    registry.apply([app.reg_dword("HKCU", KEY, "Flag", 1)])
+    assert backend.get_value("hkcu", KEY.upper(), "FLAG") == ("REG_DWORD", 1)
+
+def test_delete_removes_the_value_and_tolerates_a_missing_one(app, registry, backend):
+    registry.apply([app.reg_sz("HKCU", KEY, "Gone", "x"), app.reg_sz("HKCU", KEY, "Kept", "y")])
+    result = registry.apply([app.reg_delete("HKCU", KEY, "Gone"), app.reg_delete("HKCU", KEY, "NeverThere")])
+    assert backend.get_value("HKCU", KEY, "Gone") is None
+    assert backend.get_value("HKCU", KEY, "Kept") == ("REG_SZ", "y")
+    assert result["already_applied"] == 1 # Deleting an absent value is already done
+
+def test_failures_are_reported_per_owner_and_do_not_stop_the_batch(app, failing_backend):
+    registry = app.RegistryEngine(failing_backend)
+    batch = app.RegistryBatch()
+    batch.add(app.reg_dword("HKLM", KEY, "Broken", 1), "bad_value")
+    batch.add(app.reg_dword("HKLM", KEY, "Fine", 1), "good")
+    batch.add(app.reg_dword("HKLM", KEY + r"\Locked", "Fine", 1), "bad_key")
+    result = registry.apply_batch(batch)
+    assert set(result["failed"]) == {"bad_value", "bad_key"}
+    assert isinstance(result["failed"]["bad_key"], PermissionError)
+    assert result["writes"] == 1
+    assert failing_backend.get_value("HKLM", KEY, "Fine") == ("REG_DWORD", 1)
+
+def test_apply_raises_the_first_failure(app, failing_backend):
+    registry = app.RegistryEngine(failing_backend)
+    with pytest.raises(OSError, match="parameter is incorrect"):
+        registry.apply([app.reg_dword("HKLM", KEY, "Broken", 1)])
+
+def test_each_distinct_key_is_opened_once(app, registry, backend):
+    batch = app.RegistryBatch()
+    for index in range(12):
+        batch.add(app.reg_dword("HKCU", KEY, f"Value{index}", index), "many_values")
+    batch.add(app.reg_dword("HKCU", KEY.lower(), "SameKeyOtherCase", 1), "other_case")
+    batch.add(app.reg_dword("HKLM", KEY, "OtherHive", 1), "other_hive")
+    batch.add(app.reg_sz("HKCU", KEY + r"\Sub", "Sub", "x"), "subkey")
+    result = registry.apply_batch(batch)
+    assert result["writes"] == 15
+    assert result["key_opens"] == 3
+    assert backend.open_count == 3
+
+def test_keys_with_nothing_to_write_are_not_opened(app, registry, backend):
+    ops = [app.reg_dword("HKCU", KEY, f"Value{index}", index) for index in range(5)]
+    registry.apply(ops)
+    opens = backend.open_count
+    result = registry.apply(ops)
+    assert result["key_opens"] == 0
+    assert backend.open_count == opens
+
+def test_values_already_in_place_are_read_and_skipped(app):
+    writes = []
+
+    class CountingBackend(app.MemoryRegistryBackend):
+        def set_value(self, handle, name, value_type, data):
+            writes.append(name)
+            super().set_value(handle, name, value_type, data)
+    backend = CountingBackend()
+    registry = app.RegistryEngine(backend)
+    registry.apply([app.reg_dword("HKCU", KEY, "InPlace", 1), app.reg_dword("HKCU", KEY, "Stale", 0)])
+    writes.clear()
+    reads = backend.read_count
+    result = registry.apply([app.reg_dword("HKCU", KEY, "InPlace", 1), app.reg_dword("HKCU", KEY, "Stale", 1),
+                             app.reg_sz("HKCU", KEY, "InPlace2", "x")])
+    assert backend.read_count == reads + 1 # One read-only pass over the key
+    assert writes == ["Stale", "InPlace2"]
+    assert (result["already_applied"], result["writes"]) == (1, 2)
+
+def test_a_different_type_is_not_in_place(app, registry, backend):
+    registry.apply([app.reg_sz("HKCU", KEY, "Typed", "1")])
+    result = registry.apply([app.reg_dword("HKCU", KEY, "Typed", 1)])
+    assert result["writes"] == 1
+    assert backend.get_value("HKCU", KEY, "Typed") == ("REG_DWORD", 1)
+
+def test_skipped_values_show_in_the_run_report(app, registry, backend):
+    backend.set_value(backend.open_key("HKCU", KEY), "Done", "REG_DWORD", 1)
+    done = app.Tweak("already_done", "Already done", (app.reg_dword("HKCU", KEY, "Done", 1),))
+    partly = app.Tweak("partly_done", "Partly done", (app.reg_dword("HKCU", KEY, "Done", 1), app.reg_dword("HKCU", KEY, "New", 1)))
+    engine = app.TweakEngine(registry=registry)
+    report = engine.run_plan(app.compile_plan([done, partly]), app.RunLog(directory=None))
+    assert report.registry_skipped == 1
+    assert report.registry_writes == 1
+    assert report.already_applied == ["already_done"]
+    assert sorted(report.completed) == ["already_done", "partly_done"]
+    assert "(1 already applied)" in report.summary()
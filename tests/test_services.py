@@ -0,0 +1,58 @@
+"""configure_services against the simulated service table (services live in the
+simulated registry under SERVICES_KEY, as in the real SCM)."""
+import pytest
+
+@pytest.fixture
+def machine(sim):
+    machine = sim.WindowsSimulator()
+    machine.add_service("Spooler", "auto")
+    machine.add_service("WSearch", "delayed-auto")
+    machine.add_service("lfsvc", "demand")
+    machine.add_service("disk", "boot")
+    machine.add_service("Tcpip", "system")
+    return machine
+
+@pytest.fixture
+def engine(sim, machine, app, tmp_path):
+    engine, _ = sim.simulated_engine(machine)
+    journal = app.RunJournal(str(tmp_path / "run.journal.jsonl"))
+    engine.journal = journal
+    yield engine
+    journal.close()
+
+def test_changes_in_one_request_and_skips_missing_and_already_set(engine, machine, logger):
+    result = engine.configure_services(logger, {"Spooler": "demand", "lfsvc": "demand", "Ghost": "disabled"})
+    assert result["changed"] == ["Spooler"]
+    assert result["already"] == ["lfsvc"]
+    assert result["missing"] == ["Ghost"]
+    assert len(machine.calls_of("powershell")) == 1
+    assert machine.calls_of("process") == []
+    assert machine.service_start("Spooler") == "demand"
+
+def test_nothing_to_change_spawns_nothing(engine, machine, logger):
+    result = engine.configure_services(logger, {"lfsvc": "demand", "Ghost": "disabled"})
+    assert result["changed"] == []
+    assert machine.calls_of("powershell") == []
+
+def test_boot_and_system_drivers_are_left_alone(engine, machine, logger):
+    result = engine.configure_services(logger, {"disk": "demand", "Tcpip": "disabled"})
+    assert sorted(result["skipped"]) == ["Tcpip", "disk"]
+    assert machine.service_start("disk") == "boot"
+    assert machine.service_start("Tcpip") == "system"
+    assert engine.journal.count == 0
+
+def test_delayed_auto_to_auto_clears_the_delayed_flag(engine, machine, logger):
+    result = engine.configure_services(logger, {"WSearch": "auto", "Spooler": "delayed-auto"})
+    assert sorted(result["changed"]) == ["Spooler", "WSearch"]
+    assert machine.service_start("WSearch") == "auto"
+    assert machine.service_start("Spooler") == "delayed-auto"
+
+def test_prior_start_types_are_journaled_and_reverted(engine, machine, logger):
+    engine.configure_services(logger, {"Spooler": "disabled", "WSearch": "demand", "lfsvc": "auto"})
+    assert engine.journal.count == 3
+    engine.journal.close()
+    result = engine.revert_journal(engine.journal.path, logger)
+    assert result["failed"] == []
+    assert machine.service_start("Spooler") == "auto"
+    assert machine.service_start("WSearch") == "delayed-auto"
+    assert machine.service_start("lfsvc") == "demand"
@@ -0,0 +1,63 @@
+"""ShellSession driven through PosixShellFramer and a local `sh`, the stand-in for the
+PowerShell host: framing, exit status, restarts and per-command timeouts."""
+import os
+import shutil
+import subprocess
+import threading
+
+import pytest
+
+pytestmark = pytest.mark.skipif(os.name == "nt" or not shutil.which("base64"), reason="needs sh and base64")
+
+@pytest.fixture
+def shell(app):
+    session = app.ShellSession(argv=["sh"], framer=app.PosixShellFramer())
+    yield session
+    session.close()
+
+def test_output_is_framed_per_request(shell):
+    assert shell.run("echo first").stdout == "first\n"
+    result = shell.run("printf 'a\\nb\\n'; echo \"quotes ' and \\\" survive\"")
+    assert result.returncode == 0
+    assert result.stdout == "a\nb\nquotes ' and \" survive\n"
+    # Text that looks like another request's end marker is output, not the end of this one
+    assert shell.run("echo '<<W11O-END:1:0>>'").stdout == "<<W11O-END:1:0>>\n"
+    assert shell.starts == 1
+
+def test_exit_status_is_reported(shell):
+    assert shell.run("true").returncode == 0
+    assert shell.run("false").returncode == 1
+    result = shell.run("echo partial; (exit 7)")
+    assert (result.returncode, result.stdout) == (7, "partial\n")
+
+def test_host_is_restarted_after_it_dies(shell):
+    result = shell.run("echo going; kill -9 $$")
+    assert result.returncode == -1
+    assert "host exited unexpectedly" in result.stdout
+    assert shell.run("echo back").stdout == "back\n"
+    assert shell.starts == 2
+
+def test_host_killed_between_requests_is_restarted(shell):
+    shell.run("true")
+    shell.process.kill()
+    shell.process.wait()
+    assert shell.run("echo back").stdout == "back\n"
+    assert shell.starts == 2
+
+def test_timeout_kills_the_host_and_the_next_request_gets_a_new_one(shell):
+    with pytest.raises(subprocess.TimeoutExpired):
+        shell.run("echo started; sleep 30", timeout=0.5)
+    assert shell.process is None
+    assert shell.run("echo next", timeout=5).stdout == "next\n"
+    assert shell.starts == 2
+
+def test_cancel_kills_the_host(app, shell):
+    cancel = threading.Event()
+    timer = threading.Timer(0.3, cancel.set)
+    timer.start()
+    try:
+        with pytest.raises(app.RunCancelled):
+            shell.run("sleep 30", cancel=cancel)
+    finally:
+        timer.cancel()
+    assert shell.run("echo next").stdout == "next\n"
@@ -0,0 +1,73 @@
+"""Scheduled tasks against the simulated task library: one cached inventory, one
+PowerShell request per batch, and a journal the revert can replay."""
+import pytest
+
+NVIDIA_SUFFIX = "{B2FE1952-0186-46C3-BAEC-A80AA35AC5B8}"
+
+@pytest.fixture
+def machine(sim):
+    machine = sim.WindowsSimulator()
+    machine.add_task(f"NvTmMon_{NVIDIA_SUFFIX}")
+    machine.add_task(f"NvTmRep_{NVIDIA_SUFFIX}")
+    machine.add_task(f"NvTmRepOnLogon_{NVIDIA_SUFFIX}", enabled=False)
+    machine.add_task("Microsoft\\Windows\\Defrag\\ScheduledDefrag")
+    return machine
+
+@pytest.fixture
+def engine(sim, machine, app, tmp_path):
+    engine, _ = sim.simulated_engine(machine)
+    journal = app.RunJournal(str(tmp_path / "run.journal.jsonl"))
+    engine.journal = journal
+    yield engine
+    journal.close()
+
+@pytest.mark.parametrize("path, pattern, expected", [
+    ("\\NvTmMon_{X}", "nvtmmon_*", True),
+    ("\\Microsoft\\Windows\\Defrag\\ScheduledDefrag", "\\Microsoft\\Windows\\Defrag\\*", True),
+    ("\\Microsoft\\Windows\\Defrag\\ScheduledDefrag", "scheduleddefrag", True),
+    ("\\Microsoft\\Windows\\Defrag\\ScheduledDefrag", "ScheduledDef", False),
+])
+def test_task_matches(app, path, pattern, expected):
+    assert app.task_matches(path, pattern) is expected
+
+def test_task_states_do_not_depend_on_the_display_language(app):
+    # What schtasks shows as "Bereit"/"Deaktiviert" on a German system is 3/1 here
+    tasks = app.parse_task_states("\\A\\Ready|3\n\\A\\Off|1\n\\Running|4\nnot a task\n")
+    assert tasks == {"\\a\\ready": ("\\A\\Ready", True), "\\a\\off": ("\\A\\Off", False), "\\running": ("\\Running", True)}
+
+def test_disables_matches_in_one_request(app, engine, machine, logger):
+    result = engine.set_tasks_enabled(logger, app.NVIDIA_TELEMETRY_TASKS + ["Missing*"], False)
+    assert sorted(result["changed"]) == [f"\\NvTmMon_{NVIDIA_SUFFIX}", f"\\NvTmRep_{NVIDIA_SUFFIX}"]
+    assert result["already"] == [f"\\NvTmRepOnLogon_{NVIDIA_SUFFIX}"]
+    assert result["unmatched"] == ["Missing*"]
+    assert result["failed"] == {}
+    assert len(machine.calls_of("powershell")) == 2 # The inventory and the batch
+    assert machine.calls_of("process") == []
+    assert not machine.tasks[f"nvtmmon_{NVIDIA_SUFFIX}".lower()]["enabled"]
+    assert machine.tasks["microsoft\\windows\\defrag\\scheduleddefrag"]["enabled"]
+
+def test_inventory_is_cached_until_refreshed(engine, machine, logger):
+    key = f"\\nvtmmon_{NVIDIA_SUFFIX}".lower()
+    assert engine.task_inventory(logger)[key][1] is True
+    machine.tasks[key.lstrip("\\")]["enabled"] = False # Changed behind the engine's back
+    assert engine.task_inventory(logger)[key][1] is True
+    assert engine.task_inventory(logger, refresh=True)[key][1] is False
+    assert len(machine.calls_of("powershell")) == 2
+
+def test_nothing_to_change_sends_no_batch(app, engine, machine, logger):
+    result = engine.set_tasks_enabled(logger, ["Missing*", f"NvTmRepOnLogon_{NVIDIA_SUFFIX}"], False)
+    assert result["changed"] == []
+    assert len(machine.calls_of("powershell")) == 1
+
+def test_prior_states_are_journaled_and_reverted(app, engine, machine, logger):
+    engine.set_tasks_enabled(logger, app.NVIDIA_TELEMETRY_TASKS, False)
+    assert engine.journal.count == 2
+    engine.journal.close()
+    result = engine.revert_journal(engine.journal.path, logger)
+    assert result["failed"] == []
+    assert {task["path"]: task["enabled"] for task in machine.tasks.values()} == {
+        f"NvTmMon_{NVIDIA_SUFFIX}": True,
+        f"NvTmRep_{NVIDIA_SUFFIX}": True,
+        f"NvTmRepOnLogon_{NVIDIA_SUFFIX}": False,
+        "Microsoft\\Windows\\Defrag\\ScheduledDefrag": True,
+    }
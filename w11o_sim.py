@@ -0,0 +1,676 @@
+"""Windows simulator and benchmark suite for Win11Optimizator.
+
+Test doubles that let the engine run off Windows (--simulate, Linux CI, the
+tests), and the --benchmark suite built on them. The GUI never needs this
+module: the main script imports it only for those options (load_simulator).
+"""
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from win11optimizator import (
+    APP_VERSION, BENCHMARK_BASELINE_FILENAME, BENCHMARK_THRESHOLD, CommandResult, EXIT_OK, EXIT_REGRESSION,
+    EXIT_USAGE, EventBus, MANUAL_SERVICES, MICROSOFT_APPS_TO_REMOVE, MemoryRegistryBackend,
+    NVIDIA_TELEMETRY_TASKS, OUTPUT_BREAKS, OUTPUT_TAIL_LINES, REG_BINARY, REG_DWORD, REG_MULTI_SZ, REG_SZ,
+    RegistryBatch, RegistryEngine, RunCancelled, RunJournal, RunLog, SC_CONFIG_START_TYPES, SECTIONS,
+    SERVICES_KEY, SERVICE_STARTUP_TYPES, SOFTWARE_CATEGORIES, TASK_STATE_DISABLED, TWEAKS, TweakEngine,
+    WINGET_ALREADY_INSTALLED, Win11Optimizator, benchmark_log_rendering, command_line, compile_plan, load_gui_modules,
+    measure_import_times, pane_sink, reg_dword, temp_directory
+)
+
+# --- Windows Simulator ---
+# An in-memory Windows machine for running the engine off Windows: registry hives
+# with typed values, services (kept in the registry like the real SCM), scheduled
+# tasks, Appx packages, winget packages, DISM features and powercfg state. It
+# interprets the subset of reg, sc, powercfg, DISM, winget and PowerShell
+# that the tweaks use, and can inject latency per call while recording every call.
+SERVICE_START_VALUES = {"boot": 0, "system": 1, "auto": 2, "delayed-auto": 2, "demand": 3, "disabled": 4}
+POWER_SCHEMES = {
+    "SCHEME_MIN": "8c5e7fda-e8bf-4a96-9a85-a6e23a8c635c", # High performance
+    "SCHEME_MAX": "a1841308-3541-4fab-bc81-f71556f20b4a", # Power saver
+    "SCHEME_BALANCED": "381b4222-f694-41f0-9685-ff5bb260df2e",
+}
+REG_TYPE_CODES = {"REG_SZ": REG_SZ, "REG_DWORD": REG_DWORD, "REG_BINARY": REG_BINARY, "REG_MULTI_SZ": REG_MULTI_SZ}
+REG_HIVE_ALIASES = {"HKEY_LOCAL_MACHINE": "HKLM", "HKEY_CURRENT_USER": "HKCU", "HKEY_CLASSES_ROOT": "HKCR",
+                    "HKEY_USERS": "HKU", "HKEY_CURRENT_CONFIG": "HKCC"}
+WINGET_NO_PACKAGE = 0x8A150014 # Unsigned, as Popen.returncode has them on Windows
+DISM_UNKNOWN_FEATURE = 0x800F080C
+SIMULATED_PROGRESS_FRAMES = 10 # Progress bar redraws in simulated winget and DISM output
+SIMULATED_NVIDIA_TASK_SUFFIX = "{B2FE1952-0186-46C3-BAEC-A80AA35AC5B8}"
+SIMULATED_SYSTEM_TASKS = [ # Tasks no tweak touches, so the task library is more than its targets
+    "Microsoft\\Windows\\Defrag\\ScheduledDefrag",
+    "Microsoft\\Windows\\Application Experience\\ProgramDataUpdater",
+    "Microsoft\\Windows\\Customer Experience Improvement Program\\Consolidator",
+    "Microsoft\\Windows\\WindowsUpdate\\Scheduled Start",
+]
+SC_NO_SERVICE = 1060
+TASK_STATE_READY = 3 # MSFT_ScheduledTask State of an enabled, idle task
+
+def split_command_line(command):
+    """Split a cmd.exe command line into arguments (double quotes group, no escapes)."""
+    return [quoted if quoted or not bare else bare for quoted, bare in re.findall(r'"([^"]*)"|(\S+)', command)]
+
+class SimulatedRegistryBackend(MemoryRegistryBackend):
+    """In-memory registry that sleeps `latency` seconds per call and records the calls."""
+    def __init__(self, latency=0.0):
+        super().__init__()
+        self.latency = latency
+        self.calls = []
+
+    def _call(self, *call):
+        self.calls.append(call)
+        if self.latency:
+            time.sleep(self.latency)
+
+    def open_key(self, hive, key):
+        self._call("open_key", hive, key)
+        return super().open_key(hive, key)
+
+    def set_value(self, handle, name, value_type, data):
+        self._call("set_value", handle["path"], name)
+        super().set_value(handle, name, value_type, data)
+
+    def delete_value(self, handle, name):
+        self._call("delete_value", handle["path"], name)
+        super().delete_value(handle, name)
+
+    def read_values(self, hive, key, names):
+        self._call("read_values", hive, key)
+        return super().read_values(hive, key, names)
+
+    def read_subkeys(self, hive, key, names):
+        self._call("read_subkeys", hive, key)
+        return super().read_subkeys(hive, key, names)
+
+class WindowsSimulator:
+    """Simulated machine. Use it as the engine's process backend, `shell` as its PowerShell
+    session and `registry` as its registry backend (see simulated_engine)."""
+    def __init__(self, latency=None):
+        latency = latency or {}
+        self.process_latency = latency.get("process", 0.0)
+        self.shell_latency = latency.get("shell", 0.0)
+        self.registry = SimulatedRegistryBackend(latency.get("registry", 0.0))
+        self.lock = threading.RLock()
+        self.calls = [] # (kind, command line or script)
+        self.launched = []
+        self.delays = {} # lower-case substring -> extra seconds a matching command or script takes (a hung DISM, say)
+        self.tasks = {} # lower-case path without leading backslash -> {"path", "enabled"}
+        self.appx = {} # package name -> [full names]
+        self.winget_available = {} # package id -> display name
+        self.winget_installed = {} # package id -> display name
+        self.features = {} # DISM feature name -> "Enabled" / "Disabled"
+        self.hibernate = True
+        self.active_scheme = POWER_SCHEMES["SCHEME_BALANCED"]
+        self.temp_files = 0
+        self.restore_points = []
+        self.shell = SimulatedPowerShell(self)
+
+    @classmethod
+    def typical(cls, latency=None):
+        """A Windows 11 machine with everything the catalog touches present and at its defaults."""
+        machine = cls(latency)
+        for service in MANUAL_SERVICES:
+            machine.add_service(service, "auto")
+        for task in NVIDIA_TELEMETRY_TASKS:
+            machine.add_task(task.replace("*", SIMULATED_NVIDIA_TASK_SUFFIX))
+        for task in SIMULATED_SYSTEM_TASKS:
+            machine.add_task(task)
+        for app in MICROSOFT_APPS_TO_REMOVE:
+            machine.add_appx(app)
+        for apps in SOFTWARE_CATEGORIES.values():
+            for name, package_id in apps:
+                machine.winget_available[package_id] = name
+        machine.winget_available["Microsoft.Edge"] = "Microsoft Edge"
+        machine.winget_installed["Microsoft.Edge"] = "Microsoft Edge"
+        machine.features["Recall"] = "Enabled"
+        machine.temp_files = 250
+        return machine
+
+    # Internal registry access: bypasses the latency and call recording meant for the engine
+    def _read_values(self, hive, key, names):
+        return MemoryRegistryBackend.read_values(self.registry, hive, key, names)
+
+    def _set_value(self, hive, key, name, value_type, data):
+        handle = MemoryRegistryBackend.open_key(self.registry, hive, key)
+        MemoryRegistryBackend.set_value(self.registry, handle, name, value_type, data)
+
+    # --- State setup and inspection ---
+    def add_service(self, name, start_type="demand", delayed=None):
+        """Install a service or change its Start value. Like Set-Service, this leaves the
+        DelayedAutostart flag alone unless start_type is delayed-auto or `delayed` is given."""
+        key = f"{SERVICES_KEY}\\{name}"
+        self._set_value("HKLM", key, "Start", REG_DWORD, SERVICE_START_VALUES[start_type])
+        if start_type == "delayed-auto":
+            delayed = True
+        if delayed is not None:
+            self._set_value("HKLM", key, "DelayedAutostart", REG_DWORD, int(delayed))
+
+    def service_start(self, name):
+        """sc.exe start type name of an installed service, or None."""
+        values = self._read_values("HKLM", f"{SERVICES_KEY}\\{name}", ["Start", "DelayedAutostart"])
+        if "start" not in values:
+            return None
+        start = {code: start_type for start_type, code in SERVICE_START_VALUES.items() if start_type != "delayed-auto"}[values["start"][1]]
+        if start == "auto" and values.get("delayedautostart", (None, 0))[1] == 1:
+            return "delayed-auto"
+        return start
+
+    def add_task(self, path, enabled=True):
+        path = path.lstrip("\\")
+        self.tasks[path.lower()] = {"path": path, "enabled": enabled}
+
+    def add_appx(self, name, version="1.0.0.0"):
+        self.appx.setdefault(name, []).append(f"{name}_{version}_x64__8wekyb3d8bbwe")
+
+    def calls_of(self, kind):
+        return [command for call_kind, command in self.calls if call_kind == kind]
+
+    def summary(self):
+        with self.lock:
+            disabled_tasks = sum(not task["enabled"] for task in self.tasks.values())
+            return (f"Simulated machine: {len(self.calls_of('process'))} command(s), {len(self.calls_of('powershell'))} PowerShell "
+                    f"script(s), {len(self.registry.calls)} registry call(s); {len(self.appx)} Appx package(s), "
+                    f"{len(self.winget_installed)} winget package(s), {disabled_tasks} disabled task(s), "
+                    f"hibernation {'on' if self.hibernate else 'off'}, {len(self.restore_points)} restore point(s)")
+
+    def wait(self, seconds, command, timeout=None, cancel=None):
+        """Spend a simulated call's time, honouring a timeout and a cancellation Event like a real process."""
+        seconds += next((delay for pattern, delay in self.delays.items() if pattern in command.lower()), 0)
+        budget = seconds if timeout is None else min(seconds, timeout)
+        if cancel is not None:
+            if cancel.wait(budget):
+                raise RunCancelled(f"Cancelled: {command_line(command)}")
+        elif budget:
+            time.sleep(budget)
+        if timeout is not None and seconds > timeout:
+            raise subprocess.TimeoutExpired(command, timeout)
+
+    # --- Process backend ---
+    def run(self, command, timeout=None, cancel=None, on_output=None):
+        """Execute an argv command and return a CompletedProcess, like SubprocessBackend.run."""
+        self.calls.append(("process", command_line(command)))
+        self.wait(self.process_latency, command_line(command), timeout, cancel)
+        returncode, stdout, stderr = self.execute(command)
+        if on_output is None:
+            return subprocess.CompletedProcess(command, returncode, stdout, stderr)
+        tail = deque(maxlen=OUTPUT_TAIL_LINES)
+        for segment in OUTPUT_BREAKS.split(stdout + stderr):
+            if segment.strip():
+                tail.append(segment)
+                on_output(segment)
+        result = subprocess.CompletedProcess(command, returncode, "\n".join(tail), "")
+        result.output_bytes = len((stdout + stderr).encode("utf-8"))
+        return result
+
+    def launch(self, command):
+        self.calls.append(("launch", command_line(command)))
+        self.launched.append(command_line(command))
+
+    def execute(self, command):
+        """Interpret one argv command or command line. Returns (returncode, stdout, stderr)."""
+        args = split_command_line(command) if isinstance(command, str) else list(command)
+        if not args:
+            return 0, "", ""
+        program = os.path.basename(args[0]).lower()
+        if program.endswith(".exe"):
+            program = program[:-4]
+        handler = getattr(self, f"_cmd_{program}", None)
+        if handler is None:
+            return 1, "", f"'{args[0]}' is not recognized as an internal or external command,\noperable program or batch file.\n"
+        with self.lock:
+            return handler(args[1:])
+
+    @staticmethod
+    def _option(args, name, default=None):
+        """Value following a /NAME switch (case-insensitive)."""
+        lowered = [arg.lower() for arg in args]
+        if name.lower() in lowered:
+            index = lowered.index(name.lower())
+            if index + 1 < len(args):
+                return args[index + 1]
+        return default
+
+    @staticmethod
+    def _flags(args):
+        return {arg.lower() for arg in args if arg.startswith(("/", "-"))}
+
+    def _registry_path(self, path):
+        hive, _, key = path.partition("\\")
+        return REG_HIVE_ALIASES.get(hive.upper(), hive.upper()), key
+
+    def _cmd_reg(self, args):
+        if len(args) < 2:
+            return 1, "", "ERROR: Invalid syntax.\n"
+        verb, (hive, key) = args[0].lower(), self._registry_path(args[1])
+        name = self._option(args, "/v")
+        if verb == "add":
+            value_type = REG_TYPE_CODES.get((self._option(args, "/t") or "REG_SZ").upper())
+            if value_type is None or name is None:
+                return 1, "", "ERROR: Invalid syntax.\n"
+            data = self._option(args, "/d", "")
+            if value_type == REG_DWORD:
+                data = int(data, 0)
+            elif value_type == REG_BINARY:
+                data = bytes.fromhex(data)
+            elif value_type == REG_MULTI_SZ:
+                data = data.split("\\0")
+            self._set_value(hive, key, name, value_type, data)
+            return 0, "The operation completed successfully.\n", ""
+        if verb == "delete":
+            if name is None or self.registry.get_value(hive, key, name) is None:
+                return 1, "", "ERROR: The system was unable to find the specified registry key or value.\n"
+            MemoryRegistryBackend.delete_value(self.registry, MemoryRegistryBackend.open_key(self.registry, hive, key), name)
+            return 0, "The operation completed successfully.\n", ""
+        if verb == "query":
+            value = self.registry.get_value(hive, key, name) if name else None
+            if value is None:
+                return 1, "", "ERROR: The system was unable to find the specified registry key or value.\n"
+            type_name = next(type_name for type_name, code in REG_TYPE_CODES.items() if code == value[0])
+            data = f"0x{value[1]:x}" if value[0] == REG_DWORD else value[1]
+            return 0, f"\n{args[1]}\n    {name}    {type_name}    {data}\n\n", ""
+        return 1, "", "ERROR: Invalid syntax.\n"
+
+    def _cmd_sc(self, args):
+        if len(args) < 2:
+            return 1, "", "[SC] Invalid syntax.\n"
+        verb, service = args[0].lower(), args[1]
+        current = self.service_start(service)
+        if current is None:
+            return SC_NO_SERVICE, f"[SC] OpenService FAILED {SC_NO_SERVICE}:\n\nThe specified service does not exist as an installed service.\n", ""
+        if verb == "config":
+            start_type = self._option(args, "start=")
+            if start_type not in SERVICE_START_VALUES:
+                return 1, "", "[SC] Invalid start type.\n"
+            self.add_service(service, start_type, delayed=start_type == "delayed-auto") # start= auto clears the delayed flag
+            return 0, "[SC] ChangeServiceConfig SUCCESS\n", ""
+        if verb in ("qc", "query"):
+            code = SERVICE_START_VALUES[current]
+            return 0, f"SERVICE_NAME: {service}\n        START_TYPE         : {code}   {current.upper()}\n", ""
+        return 1, "", "[SC] Invalid syntax.\n"
+
+    def _cmd_powercfg(self, args):
+        lowered = [arg.lower() for arg in args]
+        if lowered[:1] in (["/h"], ["-h"], ["/hibernate"], ["-hibernate"]) and lowered[1:2] in (["on"], ["off"]):
+            self.hibernate = lowered[1] == "on"
+            return 0, "", ""
+        if lowered[:1] in (["/setactive"], ["-setactive"]) and len(args) > 1:
+            scheme = args[1].upper()
+            if scheme == "SCHEME_CURRENT":
+                return 0, "", ""
+            guid = POWER_SCHEMES.get(scheme, args[1].lower())
+            if guid not in POWER_SCHEMES.values():
+                return 1, "", "Unable to perform operation. An unexpected error (0x65b) has occurred: Execution of function failed.\n"
+            self.active_scheme = guid
+            return 0, "", ""
+        if lowered[:1] in (["/getactivescheme"], ["-getactivescheme"]):
+            return 0, f"Power Scheme GUID: {self.active_scheme}\n", ""
+        return 1, "", "Invalid Parameters -- try \"/?\" for help\n"
+
+    def _cmd_dism(self, args):
+        flags = self._flags(args)
+        feature = next((arg.split(":", 1)[1] for arg in args if arg.lower().startswith("/featurename:")), None)
+        if "/online" not in flags or feature is None:
+            return 87, "Error: 87\n\nThe option is unknown.\n", ""
+        name = next((known for known in self.features if known.lower() == feature.lower()), None)
+        if name is None:
+            return DISM_UNKNOWN_FEATURE, f"Error: 0x800f080c\n\nFeature name {feature} is unknown.\n", ""
+        if "/disable-feature" in flags:
+            self.features[name] = "Disabled"
+        elif "/enable-feature" in flags:
+            self.features[name] = "Enabled"
+        else:
+            return 87, "Error: 87\n\nThe option is unknown.\n", ""
+        frames = "\r".join(f"[{'=' * (step * 5)}{step * 100 / SIMULATED_PROGRESS_FRAMES:.1f}%{' ' * ((SIMULATED_PROGRESS_FRAMES - step) * 5)}]"
+                           for step in range(1, SIMULATED_PROGRESS_FRAMES + 1))
+        return 0, f"Deployment Image Servicing and Management tool\n\n{frames}\nThe operation completed successfully.\n", ""
+
+    def _cmd_winget(self, args):
+        verb = args[0].lower() if args else ""
+        package_id = self._option(args, "--id")
+        if package_id is None and len(args) > 1 and not args[1].startswith("-"):
+            wanted = args[1].lower() # Positional query: matches a name or an id
+            package_id = next((pid for pid, name in {**self.winget_available, **self.winget_installed}.items()
+                               if wanted in (pid.lower(), name.lower())), args[1])
+        if verb == "install":
+            if package_id in self.winget_installed:
+                return WINGET_ALREADY_INSTALLED, "Found an existing package already installed.\n", ""
+            if package_id not in self.winget_available:
+                return WINGET_NO_PACKAGE, "No package found matching input criteria.\n", ""
+            self.winget_installed[package_id] = self.winget_available[package_id]
+            return 0, (f"Found {self.winget_available[package_id]} [{package_id}] Version 1.0.0\n"
+                       f"Downloading https://example.invalid/{package_id}/setup.exe\n"
+                       + "\r".join(f"  {'█' * step}{'▒' * (SIMULATED_PROGRESS_FRAMES - step)}  {step * 8.0:.1f} MB / {SIMULATED_PROGRESS_FRAMES * 8.0:.1f} MB"
+                                   for step in range(1, SIMULATED_PROGRESS_FRAMES + 1))
+                       + "\nSuccessfully verified installer hash\nStarting package install...\nSuccessfully installed\n"), ""
+        if verb == "uninstall":
+            if package_id not in self.winget_installed:
+                return WINGET_NO_PACKAGE, "No installed package found matching input criteria.\n", ""
+            del self.winget_installed[package_id]
+            return 0, "Successfully uninstalled\n", ""
+        if verb == "list":
+            return 0, "".join(f"{name}  {pid}\n" for pid, name in sorted(self.winget_installed.items())), ""
+        return 1, "", "Unrecognized command\n"
+
+    def _cmd_cmd(self, args):
+        lowered = [arg.lower() for arg in args]
+        if "/c" not in lowered:
+            return 1, "", "cmd: interactive sessions are not simulated\n"
+        return self.execute(args[lowered.index("/c") + 1:])
+
+    def _cmd_del(self, args):
+        temp = f"{temp_directory()}\\*".lower()
+        if any(arg.lower() == temp or "%temp%" in arg.lower() for arg in args):
+            self.temp_files = 0
+        return 0, "", ""
+
+class SimulatedPowerShell:
+    """PowerShell session of a WindowsSimulator: interprets the scripts the engine sends."""
+    def __init__(self, machine):
+        self.machine = machine
+        self.starts = 1
+
+    def run(self, script, timeout=None, cancel=None):
+        machine = self.machine
+        machine.calls.append(("powershell", script))
+        machine.wait(machine.shell_latency, script, timeout, cancel)
+        with machine.lock:
+            if script.startswith("Get-AppxPackage"):
+                return CommandResult(0, "".join(f"{name}|{full_name}\n" for name, full_names in machine.appx.items()
+                                                for full_name in full_names))
+            if script.startswith("Get-ScheduledTask"): # TaskPath + TaskName | State enum
+                return CommandResult(0, "".join(f"\\{task['path']}|{TASK_STATE_READY if task['enabled'] else TASK_STATE_DISABLED}\n"
+                                                for task in sorted(self.machine.tasks.values(), key=lambda item: item["path"].lower())))
+            if "Remove-AppxPackage" in script:
+                targets = re.search(r"@\((.*?)\)", script)
+                return CommandResult(0, self._remove_appx(re.findall(r"'([^']+)'", targets.group(1) if targets else "")))
+            if "Set-Service" in script:
+                targets = re.search(r"@\((.*?)\)", script)
+                return CommandResult(0, self._set_services(re.findall(r"'([^']+)'", targets.group(1) if targets else "")))
+            if "-ScheduledTask" in script:
+                targets = re.search(r"@\((.*?)\)", script)
+                return CommandResult(0, self._set_tasks([path.replace("''", "'") for path in re.findall(r"'((?:[^']|'')+)'", targets.group(1) if targets else "")],
+                                                        "Enable-ScheduledTask" in script))
+            if "NameSpace(10)" in script: # Empty the Recycle Bin
+                return CommandResult(0, "")
+            return self._run_statements(script)
+
+    def _remove_appx(self, full_names):
+        output = []
+        for full_name in full_names:
+            name = full_name.split("_", 1)[0]
+            if full_name in self.machine.appx.get(name, []):
+                self.machine.appx[name].remove(full_name)
+                if not self.machine.appx[name]:
+                    del self.machine.appx[name]
+                output.append(f"OK|{full_name}\n")
+            else:
+                output.append(f"FAIL|{full_name}|Package was not found.\n")
+        return "".join(output)
+
+    def _set_tasks(self, paths, enabled):
+        output = []
+        for path in paths:
+            task = self.machine.tasks.get(path.lstrip("\\").lower())
+            if task is None:
+                output.append(f"FAIL|{path}|No MSFT_ScheduledTask objects found with property 'TaskName' equal to '{path.rsplit(chr(92), 1)[-1]}'.\n")
+            else:
+                task["enabled"] = enabled
+                output.append(f"OK|{path}\n")
+        return "".join(output)
+
+    def _set_services(self, entries):
+        """Entries are "name|sc.exe start type|Set-Service type"; auto types go through sc.exe as in the script."""
+        output = []
+        for entry in entries:
+            name, start_type, startup_type = entry.split("|", 2)
+            if start_type in SC_CONFIG_START_TYPES:
+                code, stdout, _ = self.machine._cmd_sc(["config", name, "start=", start_type])
+                output.append(f"OK|{name}\n" if code == 0 else f"FAIL|{name}|{' '.join(stdout.split())}\n")
+            elif self.machine.service_start(name) is None:
+                output.append(f"FAIL|{name}|Service '{name}' was not found on computer '.'.\n")
+            else:
+                self.machine.add_service(name, {startup: start for start, startup in SERVICE_STARTUP_TYPES.items()}[startup_type])
+                output.append(f"OK|{name}\n")
+        return "".join(output)
+
+    def _run_statements(self, script):
+        """Statement by statement: native commands run through the machine, variables and
+        `if` blocks are bookkeeping, the exit status is that of the last failing command."""
+        returncode = 0
+        output = []
+        for statement in (part.strip() for part in script.split(";")):
+            if not statement or statement.startswith(("$", "if ", "if(", "}")):
+                continue
+            if statement.startswith("&"): # Call operator with single-quoted arguments (powershell_command)
+                words = [quoted.replace("''", "'") if quoted or not bare else bare
+                         for quoted, bare in re.findall(r"'((?:[^']|'')*)'|(\S+)", statement[1:])]
+            else:
+                words = split_command_line(statement)
+            program = os.path.basename(words[0]).lower()
+            if program.endswith(".exe"):
+                program = program[:-4]
+            if hasattr(self.machine, f"_cmd_{program}"):
+                code, stdout, stderr = self.machine.execute(words)
+                output.append(stdout + stderr)
+                returncode = code or returncode
+            elif program == "enable-computerrestore":
+                continue
+            elif program == "checkpoint-computer":
+                self.machine.restore_points.append(statement)
+            else:
+                output.append(f"{words[0]} : The term '{words[0]}' is not recognized as the name of a cmdlet.\n")
+                returncode = 1
+        return CommandResult(returncode, "".join(output))
+
+    def close(self):
+        pass
+
+def simulated_engine(machine=None, latency=None):
+    """A TweakEngine driving a WindowsSimulator (a typical machine by default). Returns (engine, machine)."""
+    machine = machine if machine is not None else WindowsSimulator.typical(latency)
+    engine = TweakEngine(registry=RegistryEngine(machine.registry), shell_factory=lambda: machine.shell, processes=machine)
+    return engine, machine
+
+# --- Benchmark Suite ---
+# `--benchmark` times the hot paths against the Windows simulator, so it runs the
+# same on Linux CI as on Windows; whole runs get BENCHMARK_LATENCY injected per
+# simulated call. Results are compared with a stored baseline; anything slower than
+# the threshold fails.
+BENCHMARK_REPEAT = 7 # Each timing is the best of this many rounds
+BENCHMARK_LATENCY = {"registry": 0.00005, "process": 0.002, "shell": 0.003} # Seconds per simulated call
+
+def full_profile():
+    """Every catalog tweak, keeping the first of each conflicting pair."""
+    plan = compile_plan([TWEAKS[tweak_id] for layout in SECTIONS for tweak_id in layout["tweaks"]])
+    dropped = {conflict.second for conflict in plan.conflicts}
+    return compile_plan([tweak for tweak in plan.tweaks if tweak.id not in dropped])
+
+def best_of(func, repeat=BENCHMARK_REPEAT):
+    """Shortest wall time of `repeat` calls of func, in seconds. Like timeit, the
+    garbage collector is paused while the clock runs."""
+    import gc
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            times.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return min(times)
+
+def benchmark_result(value, unit, tolerance=None, note=""):
+    return {"value": round(value, 3), "unit": unit, "tolerance": tolerance, "note": note}
+
+def benchmark_skipped(reason):
+    return {"value": None, "unit": None, "tolerance": None, "note": f"skipped: {reason}"}
+
+def benchmark_startup():
+    try:
+        modules, init = measure_import_times()
+    except (OSError, RuntimeError) as e:
+        return {"startup_imports": benchmark_skipped(e)}
+    total = sum(cost[1] for cost in modules.values() if cost[2] == 0) / 1000
+    return {"startup_imports": benchmark_result(total, "ms", note=f"module init to first-paint readiness {init * 1000:.1f} ms")}
+
+def benchmark_gui(repeat, records=5000):
+    """Section build, theme switch and log pane rendering. Needs a display."""
+    names = ("section_build", "theme_switch", "log_pane_render")
+    try:
+        load_gui_modules()
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e: # TclError without a display
+        return {name: benchmark_skipped(f"no display ({str(e).splitlines()[0]})") for name in names}
+    try:
+        root.withdraw()
+        app = Win11Optimizator(root)
+        for index in range(len(SECTIONS)):
+            if app.sections[index] is None:
+                app.create_section(index)
+        section_build = sum(app.section_build_times.values()) * 1000
+
+        def switch():
+            app.toggle_theme()
+            root.update_idletasks()
+        theme_switch = best_of(switch, repeat) * 1000
+    finally:
+        root.destroy()
+    rate = benchmark_log_rendering(records)["coalesced LogPane"]
+    return {"section_build": benchmark_result(section_build, "ms", note=f"all {len(SECTIONS)} sections"),
+            "theme_switch": benchmark_result(theme_switch, "ms"),
+            "log_pane_render": benchmark_result(1e6 / rate, "us/record", note=f"{rate:,.0f} records/s")}
+
+def benchmark_plan_compile(repeat, rounds=20):
+    tweaks = [TWEAKS[tweak_id] for layout in SECTIONS for tweak_id in layout["tweaks"]]
+    seconds = best_of(lambda: [compile_plan(tweaks) for _ in range(rounds)], repeat) / rounds
+    return {"plan_compile": benchmark_result(seconds * 1000, "ms", note=f"{len(tweaks)} tweaks")}
+
+def benchmark_dispatch(repeat, count=200):
+    """Engine cost per tweak (scheduling, events, logging) around a handler that does nothing."""
+    noop = TWEAKS["debloat_brave"] # Handler only logs a warning
+    plan = compile_plan([noop._replace(id=f"bench_{i}") for i in range(count)])
+    assert len(plan.tweaks) == count, f"compile_plan kept {len(plan.tweaks)} of {count} dispatch tweaks"
+    engine = simulated_engine(WindowsSimulator())[0]
+    seconds = best_of(lambda: engine.run_plan(plan, RunLog(directory=None)), repeat) / len(plan.tweaks)
+    return {"tweak_dispatch": benchmark_result(seconds * 1e6, "us/tweak")}
+
+def benchmark_registry_batch(repeat, keys=200, values=10):
+    batch = RegistryBatch()
+    for k in range(keys):
+        for v in range(values):
+            batch.add(reg_dword("HKCU", f"Software\\W11OBench\\Key{k}", f"Value{v}", v), "bench")
+
+    def apply():
+        RegistryEngine(MemoryRegistryBackend()).apply_batch(batch)
+    seconds = best_of(apply, repeat) / batch.requested
+    return {"registry_batch": benchmark_result(seconds * 1e6, "us/op", note=f"{1 / seconds:,.0f} ops/s, {keys} keys")}
+
+def benchmark_log_pipeline(repeat, records=5000):
+    """RunLog -> pane sink -> event bus -> drain, i.e. the log path minus the widget."""
+    def pipeline():
+        bus = EventBus()
+        run = RunLog(directory=None, sinks=[pane_sink(bus.channel(0))])
+        for i in range(records):
+            run.info(f"record {i}")
+        bus.drain()
+    seconds = best_of(pipeline, repeat) / records
+    return {"log_pipeline": benchmark_result(seconds * 1e6, "us/record")}
+
+def benchmark_full_profile(repeat):
+    """Every catalog tweak on a typical simulated machine with BENCHMARK_LATENCY injected."""
+    import tempfile
+    plan = full_profile()
+    counts = {}
+
+    def run():
+        engine, machine = simulated_engine(latency=BENCHMARK_LATENCY)
+        with tempfile.TemporaryDirectory() as directory:
+            engine.run_plan(plan, RunLog(directory=None), journal=RunJournal(os.path.join(directory, "journal.jsonl")))
+        counts.update(registry=len(machine.registry.calls), processes=len(machine.calls_of("process")) + len(machine.launched),
+                      shell=len(machine.calls_of("powershell")))
+    seconds = best_of(run, repeat)
+    latency = ", ".join(f"{name} {value * 1000:g} ms" for name, value in BENCHMARK_LATENCY.items())
+    return {"full_profile": benchmark_result(seconds * 1000, "ms", note=f"{len(plan.tweaks)} tweaks; simulated latency: {latency}"),
+            "full_profile_registry_calls": benchmark_result(counts["registry"], "calls", tolerance=0),
+            "full_profile_processes": benchmark_result(counts["processes"], "processes", tolerance=0),
+            "full_profile_powershell_calls": benchmark_result(counts["shell"], "calls", tolerance=0)}
+
+def run_benchmarks(repeat=BENCHMARK_REPEAT):
+    """Run the suite and return {name: result}. Results that cannot be measured here are skipped."""
+    results = {}
+    logging.disable(logging.CRITICAL) # Keep the simulated runs' warnings out of the application log
+    try:
+        results.update(benchmark_startup())
+        results.update(benchmark_gui(repeat))
+        results.update(benchmark_plan_compile(repeat))
+        results.update(benchmark_dispatch(repeat))
+        results.update(benchmark_registry_batch(repeat))
+        results.update(benchmark_log_pipeline(repeat))
+        results.update(benchmark_full_profile(repeat))
+    finally:
+        logging.disable(logging.NOTSET)
+    return results
+
+def benchmark_regressions(results, baseline, threshold=BENCHMARK_THRESHOLD):
+    """Names of results worse than their baseline by more than the threshold (or their own tolerance)."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name, {}).get("value")
+        if result["value"] is None or base is None:
+            continue
+        tolerance = threshold if result["tolerance"] is None else result["tolerance"]
+        if result["value"] > base * (1 + tolerance):
+            regressions.append(name)
+    return regressions
+
+def load_benchmark_baseline(path):
+    """{name: result} from a baseline file, or {} if there is none yet."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)["results"]
+    except FileNotFoundError:
+        return {}
+
+def save_benchmark_baseline(path, results):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": APP_VERSION, "created": datetime.now().isoformat(timespec="seconds"),
+                   "platform": sys.platform, "python": sys.version.split()[0], "results": results}, f, indent=2)
+
+def report_benchmarks(logger, baseline_path=BENCHMARK_BASELINE_FILENAME, threshold=BENCHMARK_THRESHOLD, save=False):
+    try:
+        baseline = load_benchmark_baseline(baseline_path)
+    except (OSError, ValueError, KeyError) as e:
+        logger.error(f"Cannot read benchmark baseline {baseline_path}: {e}")
+        return EXIT_USAGE
+    results = run_benchmarks()
+    regressions = benchmark_regressions(results, baseline, threshold)
+    print(f"{'benchmark':<30} {'value':>12} {'baseline':>12} {'change':>8}  unit")
+    for name, result in results.items():
+        if result["value"] is None:
+            print(f"{name:<30} {'-':>12} {'':>12} {'':>8}  {result['note']}")
+            continue
+        base = baseline.get(name, {}).get("value")
+        change = f"{(result['value'] / base - 1) * 100:+.0f}%" if base else ""
+        flag = "  REGRESSION" if name in regressions else ""
+        note = f" ({result['note']})" if result["note"] else ""
+        print(f"{name:<30} {result['value']:>12,.3f} {'-' if base is None else f'{base:,.3f}':>12} {change:>8}  "
+              f"{result['unit']}{note}{flag}")
+    if save:
+        save_benchmark_baseline(baseline_path, results)
+        print(f"Baseline saved to {baseline_path}")
+    elif not baseline:
+        print(f"No baseline at {baseline_path}; run with --benchmark-save to store one.")
+    summary = f"Benchmarks: {len(regressions)} regression(s) beyond {threshold:.0%}" + (f": {', '.join(regressions)}" if regressions else "")
+    print(summary)
+    logging.info(summary)
+    return EXIT_REGRESSION if regressions and not save else EXIT_OK
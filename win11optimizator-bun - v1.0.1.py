@@ -4,2116 +4,3583 @@
 # Date: 2025-08-05
 # Version: 1.0.2
 
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog, Menu, BooleanVar
-import configparser
+# --- Early Elevation Check ---
+# The GUI relaunches itself elevated through ShellExecuteW, which starts a whole
+# new interpreter. Only what that check needs is imported before it, so the
+# unelevated process exits without paying for the rest of the imports.
 import os
 import sys
-import ctypes
-import subprocess
-import winreg
-import threading
-import logging
-import traceback
-import time
-from datetime import datetime
-import urllib.request
-import queue
-
-# --- Configuration ---
-LOG_FILENAME = "win11optimizator.log"
-CONFIG_FILENAME = "win11optimizator.ini"
-APP_NAME = "Win11Optimizator"
-APP_VERSION = "1.0.1"
-
-# --- Logging Setup ---
-logging.basicConfig(
-    filename=LOG_FILENAME,
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
-logging.info(f"--- Starting {APP_NAME} v{APP_VERSION} ---")
-
-# --- Utility Functions ---
-def is_admin():
-    try:
-        return ctypes.windll.shell32.IsUserAnAdmin()
-    except:
-        return False
-
-def request_admin_privileges():
-    if not is_admin():
-        try:
-            ctypes.windll.shell32.ShellExecuteW(
-                None, "runas", sys.executable, " ".join(sys.argv), None, 1
-            )
-            sys.exit(0)
-        except Exception as e:
-            logging.error(f"Failed to elevate privileges: {e}")
-            messagebox.showerror("Error", f"Cannot obtain admin rights: {e}")
-            sys.exit(1)
-
-def resource_path(relative_path):
-    try:
-        base_path = sys._MEIPASS
-    except Exception:
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
-
-# --- Custom Logging Handler for Tkinter Text Widget ---
-class TextHandler(logging.Handler):
-    def __init__(self, text_widget):
-        super().__init__()
-        self.text_widget = text_widget
-        self.setLevel(logging.INFO)
-
-    def emit(self, record):
-        msg = self.format(record)
-        def append():
-            self.text_widget.configure(state='normal')
-            self.text_widget.insert(tk.END, msg + '\n')
-            self.text_widget.configure(state='disabled')
-            self.text_widget.see(tk.END)
-        self.text_widget.after(0, append)
-
-# --- Main Application Class ---
-class Win11Optimizator:
-    def __init__(self, root):
-        self.root = root
-        self.root.title(f"{APP_NAME} v{APP_VERSION}")
-        # Setează fereastra să pornească maximizată, păstrând barele de titlu și butoanele
-        self.root.state('zoomed')
-
-        try:
-            # self.root.iconbitmap(resource_path("icon.ico"))
-            pass
-        except tk.TclError:
-            logging.warning("Icon file 'icon.ico' not found. Using default icon.")
-
-        # --- Style Configuration ---
-        self.style = ttk.Style()
-        self.current_theme = "light" # Default theme
-        self.configure_styles()
-
-        # --- Menu Bar ---
-        #self.create_menu()
-
-        # --- Main Container ---
-        self.main_frame = ttk.Frame(root) # Main frame for overall theme application
-        self.main_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
-
-        # --- Section Navigation Buttons ---
-        self.nav_frame = ttk.Frame(self.main_frame) # Store nav_frame reference
-        self.nav_frame.pack(fill="x", pady=(0, 10))
-
-        self.nav_buttons = []
-        sections = ["Essential Tweaks", "Advanced Tweaks", "Customize Preferences", "Install Software"]
-        for i, text in enumerate(sections):
-            # Create button with green style
-            btn = ttk.Button(self.nav_frame, text=text, command=lambda idx=i: self.show_section(idx), style='Green.TButton')
-            btn.pack(side="left", padx=5, pady=2) # Add small pady for spacing
-            self.nav_buttons.append(btn)
-
-        # --- Additional Buttons (Toggle Theme, Export, Import, About) ---
-        self.theme_toggle_btn = ttk.Button(self.nav_frame, text="Light/Dark Theme", command=self.toggle_theme, style='Green.TButton')
-        self.theme_toggle_btn.pack(side="left", padx=5, pady=2)
-
-        self.export_btn = ttk.Button(self.nav_frame, text="Export", command=self.export_config, style='Green.TButton')
-        self.export_btn.pack(side="left", padx=5, pady=2)
-
-        self.import_btn = ttk.Button(self.nav_frame, text="Import", command=self.import_config, style='Green.TButton')
-        self.import_btn.pack(side="left", padx=5, pady=2)
-
-        self.about_btn = ttk.Button(self.nav_frame, text="About", command=self.show_about, style='Green.TButton')
-        self.about_btn.pack(side="left", padx=5, pady=2)
-
-        # --- Section Container ---
-        self.section_container = ttk.Frame(self.main_frame)
-        self.section_container.pack(fill="both", expand=True)
-
-        # --- Initialize Sections ---
-        self.sections = []
-        self.section1_vars = {}
-        self.section2_vars = {}
-        self.section3_vars = {}
-        self.section4_vars = {}
-
-        self.create_section1()
-        self.create_section2()
-        self.create_section3()
-        self.create_section4()
-
-        # --- Show First Section ---
-        self.show_section(0)
-
-        # Apply initial theme to ensure everything is styled correctly from the start
-        self.apply_theme(self.current_theme)
-
-        logging.info("Application initialized successfully.")
-
-    def configure_styles(self):
-        """Configure ttk styles for light and dark themes."""
-        # --- Light Theme ---
-        LIGHT_BG = "#f0f0f0"
-        LIGHT_FG = "black"
-        LIGHT_SCROLLBAR_TROUGH = "#e0e0e0"
-        LIGHT_SCROLLBAR_BG = "#c0c0c0"
-        self.style.configure("Light.TFrame", background=LIGHT_BG)
-        self.style.configure("Light.TLabel", background=LIGHT_BG, foreground=LIGHT_FG)
-        self.style.configure("Light.TCheckbutton", background=LIGHT_BG, foreground=LIGHT_FG)
-        self.style.configure("Light.Vertical.TScrollbar", troughcolor=LIGHT_SCROLLBAR_TROUGH, background=LIGHT_SCROLLBAR_BG)
-
-        # --- Dark Theme ---
-        DARK_BG = "#000000" # Pure Black
-        DARK_FG = "#FFFFFF" # Pure White
-        DARK_SCROLLBAR_TROUGH = "#2e2e2e"
-        DARK_SCROLLBAR_BG = "#444444"
-        self.style.configure("Dark.TFrame", background=DARK_BG)
-        self.style.configure("Dark.TLabel", background=DARK_BG, foreground=DARK_FG)
-        self.style.configure("Dark.TCheckbutton", background=DARK_BG, foreground=DARK_FG, indicatorcolor=DARK_BG)
-        self.style.configure("Dark.Vertical.TScrollbar", troughcolor=DARK_SCROLLBAR_TROUGH, background=DARK_SCROLLBAR_BG)
-
-        # --- Green Button Style (Solid green background, black text) ---
-        GREEN_BG = "#4CAF50" # Material Green 500
-        GREEN_BG_HOVER = "#45a049"
-        GREEN_BG_PRESSED = "#3d8b40"
-        BUTTON_FG = "black" # Black text for buttons
-
-        # Use map to define different states, ensuring solid background
-        self.style.configure("Green.TButton",
-                             foreground=BUTTON_FG,
-                             background=GREEN_BG, # Solid background
-                             borderwidth=1) # Minimal border
-        self.style.map("Green.TButton",
-                       background=[('active', GREEN_BG_HOVER), ('pressed', GREEN_BG_PRESSED)],
-                       foreground=[('pressed', BUTTON_FG), ('active', BUTTON_FG)])
-
-
-    def apply_theme(self, theme_name):
-        """Apply the selected theme to the application."""
-        self.current_theme = theme_name
-        suffix = "Dark" if theme_name == "dark" else "Light"
-        DARK_BG = "#000000"
-        DARK_FG = "#FFFFFF"
-        LIGHT_BG = "#f0f0f0"
-        LIGHT_FG = "black"
-
-        # --- Apply base theme style ---
-        bg_color = DARK_BG if theme_name == "dark" else LIGHT_BG
-        fg_color = DARK_FG if theme_name == "dark" else LIGHT_FG
-        self.root.configure(bg=bg_color) # Root window background
-        self.main_frame.configure(style=f"{suffix}.TFrame") # Main container frame
-
-        # --- Apply theme to Navigation Bar ---
-        self.nav_frame.configure(style=f"{suffix}.TFrame")
-        # Update nav buttons style (they use Green.TButton, which is static)
-        # Update additional buttons style (they also use Green.TButton)
-
-        # --- Update styles for existing widgets in sections ---
-        for i, section in enumerate(self.sections):
-            # --- Section Frame itself ---
-            section.configure(style=f"{suffix}.TFrame")
-
-            # --- Left Frame (Checkboxes) ---
-            left_frame = section.winfo_children()[0] if section.winfo_children() else None
-            if left_frame and isinstance(left_frame, ttk.Frame):
-                left_frame.configure(style=f"{suffix}.TFrame")
-                # Update left frame's canvas background
-                canvas = left_frame.winfo_children()[0] if left_frame.winfo_children() else None
-                if canvas and isinstance(canvas, tk.Canvas):
-                    canvas.configure(bg=bg_color) # Match section bg
-                    # Update scrollable frame
-                    scrollable_frame = canvas.winfo_children()[0] if canvas.winfo_children() else None
-                    if scrollable_frame and isinstance(scrollable_frame, ttk.Frame):
-                        scrollable_frame.configure(style=f"{suffix}.TFrame")
-                        # Update individual checkboxes and labels within the scrollable frame
-                        for child in scrollable_frame.winfo_children():
-                            if isinstance(child, ttk.Checkbutton):
-                                child.configure(style=f"{suffix}.TCheckbutton")
-                            elif isinstance(child, ttk.Label): # For section 4 categories
-                                child.configure(style=f"{suffix}.TLabel")
-
-            # --- Right Frame (Output) ---
-            # Assuming right frame is the second child
-            right_frame = section.winfo_children()[1] if len(section.winfo_children()) > 1 else None
-            if right_frame and isinstance(right_frame, ttk.Frame):
-                right_frame.configure(style=f"{suffix}.TFrame")
-                # Update output label
-                output_label = right_frame.winfo_children()[0] if right_frame.winfo_children() else None
-                if output_label and isinstance(output_label, ttk.Label):
-                     output_label.configure(style=f"{suffix}.TLabel")
-                # Update output text widget
-                output_text_widget = None
-                for widget in right_frame.winfo_children():
-                    if isinstance(widget, tk.Text):
-                        output_text_widget = widget
-                        break
-                if output_text_widget:
-                    output_text_widget.configure(
-                        bg='#111111' if theme_name == 'dark' else 'white', # Slightly off-black for dark theme
-                        fg=DARK_FG if theme_name == 'dark' else LIGHT_FG
-                    )
-                # Update output scrollbar trough and slider color
-                output_scrollbar = None
-                for widget in right_frame.winfo_children():
-                    if isinstance(widget, ttk.Scrollbar) and widget.cget('orient') == 'vertical':
-                        output_scrollbar = widget
-                        break
-                if output_scrollbar:
-                    # Reconfigure the scrollbar style based on theme
-                    if theme_name == "dark":
-                        self.style.configure("Vertical.TScrollbar", troughcolor="#2e2e2e", background="#444444")
-                    else:
-                        self.style.configure("Vertical.TScrollbar", troughcolor="#e0e0e0", background="#c0c0c0")
-                    output_scrollbar.configure(style="Vertical.TScrollbar")
-
-
-            # --- Bottom Frame (Progress/Execute Button) ---
-            # Find the bottom frame within the left frame
-            if left_frame:
-                 for child in left_frame.winfo_children():
-                      if isinstance(child, ttk.Frame) and child != canvas: # Assuming canvas is the first child
-                           # This should be the bottom frame
-                           child.configure(style=f"{suffix}.TFrame")
-                           # Update progress bar if it exists within (usually doesn't need specific styling)
-                           # Update execute/install buttons (they use Green.TButton)
-
-
-        # --- Update scrollbar styles for main sections (left side lists) ---
-        # This is tricky because scrollbars are inside dynamic frames.
-        # The best way is to reconfigure the style globally and ensure it's applied.
-        # We already did this above for the output scrollbars.
-        # For the section scrollbars, they should pick up the style when created/updated.
-        # Let's try reconfiguring the global Vertical.TScrollbar style here again.
-        if theme_name == "dark":
-             self.style.configure("Vertical.TScrollbar", troughcolor="#2e2e2e", background="#444444")
-             # Also explicitly set the background of the nav frame's potential background
-             self.nav_frame.configure(style=f"{suffix}.TFrame") # Re-assert
-        else: # light
-             self.style.configure("Vertical.TScrollbar", troughcolor="#e0e0e0", background="#c0c0c0")
-             self.nav_frame.configure(style=f"{suffix}.TFrame") # Re-assert
-
-        # --- Update About Window if it exists ---
-        for w in self.root.winfo_children():
-            if isinstance(w, tk.Toplevel) and w.title() == "About Win11Optimizator":
-                 try:
-                     # Update main frame of about window
-                     about_main_frame = w.winfo_children()[0] if w.winfo_children() else None
-                     if about_main_frame and isinstance(about_main_frame, ttk.Frame):
-                         about_main_frame.configure(style=f"{suffix}.TFrame")
-                         # Update labels inside about window
-                         for child in about_main_frame.winfo_children():
-                             if isinstance(child, ttk.Label):
-                                 child.configure(style=f"{suffix}.TLabel")
-                             elif isinstance(child, tk.Text):
-                                 child.configure(bg='#111111' if theme_name == 'dark' else '#f0f0f0',
-                                                 fg=DARK_FG if theme_name == 'dark' else LIGHT_FG)
-                 except tk.TclError:
-                     pass # Ignore errors if widget structure is unexpected
-
-        logging.info(f"Theme applied: {theme_name}")
-
-    def toggle_theme(self):
-        """Toggle between light and dark themes."""
-        new_theme = "dark" if self.current_theme == "light" else "light"
-        self.apply_theme(new_theme)
-        logging.info(f"Theme toggled to: {new_theme}")
-
-    #def create_menu(self):
-    #    menubar = Menu(self.root)
-    #    self.root.config(menu=menubar)
-
-        # --- Help Menu ---
-    #    help_menu = Menu(menubar, tearoff=0)
-    #    menubar.add_cascade(label="Help", menu=help_menu)
-    #    help_menu.add_command(label="About", command=self.show_about)
-    #    help_menu.add_command(label="Import Configuration", command=self.import_config)
-    #    help_menu.add_command(label="Export Configuration", command=self.export_config)
-
-    def show_section(self, index):
-        for i, section in enumerate(self.sections):
-            if i == index:
-                section.pack(fill="both", expand=True)
-            else:
-                section.pack_forget()
-
-    def show_about(self):
-        try:
-            about_window = tk.Toplevel(self.root)
-            about_window.title("About Win11Optimizator")
-            about_window.geometry("500x400")
-            about_window.resizable(False, False)
-            # Apply theme to about window if desired (requires more setup)
-            main_frame = ttk.Frame(about_window, style=f"{self.current_theme.capitalize()}.TFrame")
-            main_frame.pack(fill="both", expand=True, padx=20, pady=20)
-            title_label = ttk.Label(main_frame, text="Win11Optimizator", font=("Segoe UI", 18, "bold"), style=f"{self.current_theme.capitalize()}.TLabel")
-            title_label.pack(pady=10)
-            version_label = ttk.Label(main_frame, text=f"Version: {APP_VERSION}", style=f"{self.current_theme.capitalize()}.TLabel")
-            version_label.pack()
-            author_label = ttk.Label(main_frame, text="Author: EOLiann", style=f"{self.current_theme.capitalize()}.TLabel")
-            author_label.pack(pady=(10, 0))
-            desc_label = ttk.Label(main_frame, text="Optimize and customize Windows 11", wraplength=450, style=f"{self.current_theme.capitalize()}.TLabel")
-            desc_label.pack(pady=10)
-            disclaimer = tk.Text(main_frame, height=8, wrap="word", bg="#111111" if self.current_theme == "dark" else "#f0f0f0", fg="white" if self.current_theme == "dark" else "black")
-            disclaimer.insert("1.0", "DISCLAIMER:\n"
-                                     "This tool modifies system settings. Use at your own risk.\n"
-                                     "It's highly recommended to create a system restore point before making changes.\n"
-                                     "The author is not responsible for any damage caused by this tool.")
-            disclaimer.config(state="disabled")
-            disclaimer.pack(fill="both", expand=True, pady=10)
-            close_btn = ttk.Button(main_frame, text="Close", command=about_window.destroy, style='Green.TButton')
-            close_btn.pack(pady=5)
-        except Exception as e:
-            logging.error(f"Show about failed: {e}\n{traceback.format_exc()}")
-            messagebox.showerror("Error", f"Failed to show about dialog: {e}")
-
-    # --- Import/Export Configuration Methods ---
-    def export_config(self):
-        try:
-            config = configparser.ConfigParser()
-            config["Section1"] = {name: str(var.get()) for name, var in self.section1_vars.items()}
-            config["Section2"] = {name: str(var.get()) for name, var in self.section2_vars.items()}
-            config["Section3"] = {name: str(var.get()) for name, var in self.section3_vars.items()}
-            config["Section4"] = {name: str(data["var"].get()) for name, data in self.section4_vars.items()}
-
-            file_path = filedialog.asksaveasfilename(defaultextension=".ini", filetypes=[("INI files", "*.ini"), ("All files", "*.*")])
-            if file_path:
-                with open(file_path, 'w') as configfile:
-                    config.write(configfile)
-                logging.info("Export Config: Success")
-                messagebox.showinfo("Export Successful", "Configuration exported successfully.")
-            else:
-                logging.info("Export Config: Cancelled - No file selected")
-        except Exception as e:
-            logging.error(f"Export Config failed: {str(e)}\n{traceback.format_exc()}")
-            messagebox.showerror("Export Failed", f"Failed to export configuration: {str(e)}")
-
-    def import_config(self):
-        try:
-            file_path = filedialog.askopenfilename(filetypes=[("INI files", "*.ini"), ("All files", "*.*")])
-            if not file_path:
-                logging.info("Import Config: Cancelled - No file selected")
-                return
-
-            config = configparser.ConfigParser()
-            config.read(file_path)
-
-            if "Section1" in config:
-                for name, var in self.section1_vars.items():
-                    if name in config["Section1"]:
-                        var.set(config.getboolean("Section1", name, fallback=False))
-            if "Section2" in config:
-                for name, var in self.section2_vars.items():
-                    if name in config["Section2"]:
-                        var.set(config.getboolean("Section2", name, fallback=False))
-            if "Section3" in config:
-                for name, var in self.section3_vars.items():
-                    if name in config["Section3"]:
-                        var.set(config.getboolean("Section3", name, fallback=False))
-            if "Section4" in config:
-                for name, data in self.section4_vars.items():
-                    if name in config["Section4"]:
-                        data["var"].set(config.getboolean("Section4", name, fallback=False))
-
-            logging.info("Import Config: Success")
-            messagebox.showinfo("Import Successful", "Configuration imported successfully.")
-        except Exception as e:
-            logging.error(f"Import Config failed: {str(e)}\n{traceback.format_exc()}")
-            messagebox.showerror("Import Failed", f"Failed to import configuration: {str(e)}")
-
-    # --- Utility for Logging Commands ---
-    def log_and_run_command(self, logger, command, description=""):
-        """Logs a command and then executes it."""
-        if description:
-            logger.info(f"Executing: {description}")
-        logger.info(f"Command: {command}")
-        try:
-            # Use shell=True for registry commands and general execution
-            result = subprocess.run(command, shell=True, capture_output=True, text=True, check=True)
-            logger.info(f"Success: {description or command}")
-            # Optionally log stdout if needed for debugging specific commands
-            # if result.stdout.strip():
-            #     logger.debug(f"StdOut: {result.stdout.strip()}")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Failed: {description or command}")
-            logger.error(f"Error: {e.stderr.strip() if e.stderr else str(e)}")
-            raise # Re-raise to be caught by the calling function
-        except Exception as e:
-            logger.error(f"Unexpected error running command '{command}': {e}")
-            raise
-
-    # --- Section 1: Essential Tweaks ---
-    def create_section1(self):
-        try:
-            start_time = time.time()
-            frame = ttk.Frame(self.section_container, style=f"{self.current_theme.capitalize()}.TFrame")
-            self.sections.append(frame)
-
-            tweaks = [
-                "Create Restore Point",
-                "Delete Temporary Files",
-                "Disable ConsumerFeatures",
-                "Disable Telemetry",
-                "Disable Activity History",
-                "Disable Explorer Automatic Folder Discovery",
-                "Disable GameDVR",
-                "Disable Hibernation",
-                "Disable Homegroup",
-                "Disable Location Tracking",
-                "Disable Storage Sense",
-                "Disable Wifi-Sense",
-                "Enable End Task With Right Click",
-                "Run Disk Cleanup",
-                "Change Windows Terminal default: PowerShell 5 -> PowerShell 7",
-                "Disable Powershell 7 Telemetry",
-                "Disable Recall",
-                "Set Hibernation as default (good for laptops)",
-                "Set Services to Manual",
-                "Debloat Brave",
-                "Debloat Edge",
-                # --- New from comenzi.txt ---
-                "Disable Windows Setting Sync",
-                "Disable Handwriting Data Collection",
-                "Disable Clipboard Data Collection",
-                "Opt out of Privacy Consent",
-                "Disable 3rd-party apps Telemetry (Adobe/NVIDIA/VS)",
-                "Disable Lockscreen Camera Access",
-                "Disable Biometrics",
-                "Disable Cortana & Bing Search",
-                "Disable Feedback Notifications",
-                "Disable Verbose Logon",
-                "Disable Sticky Keys",
-                "Disable Numlock on startup",
-                "Disable Snap Flyout",
-                "Set Classic Right Click Menu",
-                "Show File Extensions",
-                "Disable Mouse Acceleration",
-                "Disable Fullscreen Optimizations",
-                "Disable Copilot",
-                "Disable IntelliCode Remote Analysis",
-                "Disable Media Player Telemetry",
-                "Disable System File Access Consent",
-                "Disable Account Info Access Consent",
-                # --- More from comenzi.txt ---
-                "Disable Language Sync",
-                "Disable Credentials Sync",
-                "Disable Desktop Theme Sync",
-                "Disable Personalization Sync",
-                "Disable Start Layout Sync",
-                "Disable Application Sync",
-                "Disable App Sync Setting Sync",
-                "Disable Sync on Paid Network",
-            ]
-            self.section1_vars = {tweak: BooleanVar(value=False) for tweak in tweaks}
-
-            # --- Layout Split ---
-            left_frame = ttk.Frame(frame, style=f"{self.current_theme.capitalize()}.TFrame")
-            left_frame.pack(side="left", fill="both", expand=True, padx=(0, 5))
-
-            right_frame = ttk.Frame(frame, width=400, style=f"{self.current_theme.capitalize()}.TFrame")
-            right_frame.pack_propagate(False)
-            right_frame.pack(side="right", fill="y", padx=(5, 0))
-
-            # --- Left Column: Checkboxes ---
-            canvas = tk.Canvas(left_frame, bg=self.style.lookup(f"{self.current_theme.capitalize()}.TFrame", 'background'), highlightthickness=0)
-            scrollbar = ttk.Scrollbar(left_frame, orient="vertical", command=canvas.yview, style="Vertical.TScrollbar")
-            scrollable_frame = ttk.Frame(canvas, style=f"{self.current_theme.capitalize()}.TFrame")
-
-            scrollable_frame.bind(
-                "<Configure>",
-                lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-            )
-
-            canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-            canvas.configure(yscrollcommand=scrollbar.set)
-
-            # --- Bind Mousewheel to Scrollable Frame for Section 1 ---
-            # Use lambda to capture the correct canvas instance
-            scrollable_frame.bind("<MouseWheel>", lambda event: canvas.yview_scroll(int(-1*(event.delta/120)), "units"))
-            # Also bind to canvas to ensure it works if mouse is over the canvas but not directly over a widget
-            canvas.bind("<MouseWheel>", lambda event: canvas.yview_scroll(int(-1*(event.delta/120)), "units"))
-            # --- End Mousewheel Binding ---
-
-            for i, tweak in enumerate(tweaks):
-                chk = ttk.Checkbutton(
-                    scrollable_frame,
-                    text=tweak,
-                    variable=self.section1_vars[tweak],
-                    command=lambda t=tweak: logging.info(f"Section1 {t}: Toggled to {self.section1_vars[t].get()}"),
-                    style=f"{self.current_theme.capitalize()}.TCheckbutton"
-                )
-                chk.grid(row=i, column=0, sticky="w", padx=10, pady=5)
-
-            canvas.pack(side="left", fill="both", expand=True)
-            scrollbar.pack(side="right", fill="y")
-
-            # --- Right Column: Execution Output ---
-            output_label = ttk.Label(right_frame, text="Execution Output:", font=("Segoe UI", 10, "bold"), style=f"{self.current_theme.capitalize()}.TLabel")
-            output_label.pack(anchor="w", padx=5, pady=(5, 0))
-
-            self.output_text1 = tk.Text(right_frame, state='disabled', wrap='word',
-                                        bg='black' if self.current_theme == 'dark' else 'white',
-                                        fg='white' if self.current_theme == 'dark' else 'black')
-            output_scrollbar = ttk.Scrollbar(right_frame, orient="vertical", command=self.output_text1.yview, style="Vertical.TScrollbar")
-            self.output_text1.configure(yscrollcommand=output_scrollbar.set)
-
-            self.output_text1.pack(side="left", fill="both", expand=True, padx=(5, 0), pady=5)
-            output_scrollbar.pack(side="right", fill="y", pady=5, padx=(0, 5))
-
-            # --- Bottom Frame (MOVED to LEFT FRAME) ---
-            bottom_frame = ttk.Frame(left_frame, style=f"{self.current_theme.capitalize()}.TFrame") # Changed parent to left_frame
-            bottom_frame.pack(side="bottom", fill="x", padx=10, pady=10) # Adjusted padding if needed
-
-            self.progress1 = ttk.Progressbar(bottom_frame, orient="horizontal", mode="determinate", length=300)
-            self.progress1.pack(side="left", fill="x", expand=True, padx=(0, 10))
-
-            execute_btn = ttk.Button(
-                bottom_frame,
-                text="Execute",
-                command=lambda: threading.Thread(target=self.execute_section1, daemon=True).start(),
-                style='Green.TButton'
-            )
-            execute_btn.pack(side="right")
-
-            logging.info(f"Section 1 created successfully in {time.time() - start_time:.3f} seconds")
-        except Exception as e:
-            logging.error(f"Create section 1 failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def execute_section1(self):
-        try:
-            if not hasattr(self, 'output_text1'):
-                logging.error("Output text widget for section 1 not found.")
-                return
-
-            exec_logger = logging.getLogger(f"Section1_Exec_{threading.get_ident()}")
-            exec_logger.setLevel(logging.INFO)
-            exec_logger.handlers.clear()
-            text_handler = TextHandler(self.output_text1)
-            formatter = logging.Formatter("[%(asctime)s] %(levelname)s: %(message)s", datefmt='%H:%M:%S')
-            text_handler.setFormatter(formatter)
-            exec_logger.addHandler(text_handler)
-
-            selected = [name for name, var in self.section1_vars.items() if var.get()]
-            if not selected:
-                exec_logger.info("No options selected for execution.")
-                logging.info("Section1: No options selected for execution.")
-                return
-
-            self.progress1["value"] = 0
-            self.progress1["maximum"] = len(selected)
-
-            self.output_text1.configure(state='normal')
-            self.output_text1.delete(1.0, tk.END)
-            self.output_text1.configure(state='disabled')
-
-            for i, option in enumerate(selected):
-                try:
-                    exec_logger.info(f"Starting: {option}")
-                    # --- Execution Logic with Command Logging ---
-                    if option == "Create Restore Point":
-                        self.create_restore_point(exec_logger)
-                    elif option == "Delete Temporary Files":
-                        self.delete_temp_files(exec_logger)
-                    elif option == "Disable ConsumerFeatures":
-                        self.disable_consumer_features(exec_logger)
-                    elif option == "Disable Telemetry":
-                        self.disable_telemetry(exec_logger)
-                    elif option == "Disable Activity History":
-                        self.disable_activity_history(exec_logger)
-                    elif option == "Disable Explorer Automatic Folder Discovery":
-                        self.disable_folder_discovery(exec_logger)
-                    elif option == "Disable GameDVR":
-                        self.disable_gamedvr(exec_logger)
-                    elif option == "Disable Hibernation":
-                        self.disable_hibernation(exec_logger)
-                    elif option == "Disable Homegroup":
-                        self.disable_homegroup(exec_logger)
-                    elif option == "Disable Location Tracking":
-                        self.disable_location_tracking(exec_logger)
-                    elif option == "Disable Storage Sense":
-                        self.disable_storage_sense(exec_logger)
-                    elif option == "Disable Wifi-Sense":
-                        self.disable_wifi_sense(exec_logger)
-                    elif option == "Enable End Task With Right Click":
-                        self.enable_end_task(exec_logger)
-                    elif option == "Run Disk Cleanup":
-                        self.run_disk_cleanup(exec_logger)
-                    elif option == "Change Windows Terminal default: PowerShell 5 -> PowerShell 7":
-                        self.set_powershell7_default(exec_logger)
-                    elif option == "Disable Powershell 7 Telemetry":
-                        self.disable_powershell7_telemetry(exec_logger)
-                    elif option == "Disable Recall":
-                        self.disable_recall(exec_logger)
-                    elif option == "Set Hibernation as default (good for laptops)":
-                        self.set_hibernation_default(exec_logger)
-                    elif option == "Set Services to Manual":
-                        self.set_services_manual(exec_logger)
-                    elif option == "Debloat Brave":
-                        self.debloat_brave(exec_logger)
-                    elif option == "Debloat Edge":
-                        self.debloat_edge(exec_logger)
-                    # --- New Executions ---
-                    elif option == "Disable Windows Setting Sync":
-                        self.disable_windows_setting_sync(exec_logger)
-                    elif option == "Disable Handwriting Data Collection":
-                        self.disable_handwriting_data_collection(exec_logger)
-                    elif option == "Disable Clipboard Data Collection":
-                        self.disable_clipboard_data_collection(exec_logger)
-                    elif option == "Opt out of Privacy Consent":
-                        self.opt_out_privacy_consent(exec_logger)
-                    elif option == "Disable 3rd-party apps Telemetry (Adobe/NVIDIA/VS)":
-                        self.disable_3rd_party_telemetry(exec_logger)
-                    elif option == "Disable Lockscreen Camera Access":
-                        self.disable_lockscreen_camera(exec_logger)
-                    elif option == "Disable Biometrics":
-                        self.disable_biometrics(exec_logger)
-                    elif option == "Disable Cortana & Bing Search":
-                        self.disable_cortana_bing_search(exec_logger)
-                    elif option == "Disable Feedback Notifications":
-                        self.disable_feedback_notifications(exec_logger)
-                    elif option == "Disable Verbose Logon":
-                        self.disable_verbose_logon(exec_logger)
-                    elif option == "Disable Sticky Keys":
-                        self.disable_sticky_keys(exec_logger)
-                    elif option == "Disable Numlock on startup":
-                        self.disable_numlock_startup(exec_logger)
-                    elif option == "Disable Snap Flyout":
-                        self.disable_snap_flyout(exec_logger)
-                    elif option == "Set Classic Right Click Menu":
-                        self.set_classic_right_click(exec_logger)
-                    elif option == "Show File Extensions":
-                        self.show_file_extensions(exec_logger)
-                    elif option == "Disable Mouse Acceleration":
-                        self.disable_mouse_acceleration(exec_logger)
-                    elif option == "Disable Fullscreen Optimizations":
-                        self.disable_fullscreen_optimizations(exec_logger) # Already implemented
-                    elif option == "Disable Copilot":
-                        self.disable_copilot(exec_logger) # Already implemented
-                    elif option == "Disable IntelliCode Remote Analysis":
-                        self.disable_intellicode_remote_analysis(exec_logger)
-                    elif option == "Disable Media Player Telemetry":
-                        self.disable_media_player_telemetry(exec_logger)
-                    elif option == "Disable System File Access Consent":
-                        self.disable_system_file_access_consent(exec_logger)
-                    elif option == "Disable Account Info Access Consent":
-                        self.disable_account_info_access_consent(exec_logger)
-                    elif option == "Disable Language Sync":
-                        self.disable_language_sync(exec_logger)
-                    elif option == "Disable Credentials Sync":
-                        self.disable_credentials_sync(exec_logger)
-                    elif option == "Disable Desktop Theme Sync":
-                        self.disable_desktop_theme_sync(exec_logger)
-                    elif option == "Disable Personalization Sync":
-                        self.disable_personalization_sync(exec_logger)
-                    elif option == "Disable Start Layout Sync":
-                        self.disable_start_layout_sync(exec_logger)
-                    elif option == "Disable Application Sync":
-                        self.disable_application_sync(exec_logger)
-                    elif option == "Disable App Sync Setting Sync":
-                        self.disable_app_sync_setting_sync(exec_logger)
-                    elif option == "Disable Sync on Paid Network":
-                        self.disable_sync_on_paid_network(exec_logger)
-                    # --- End New Executions ---
-                    exec_logger.info(f"Completed: {option}")
-                    logging.info(f"Section1 {option}: Enabled")
-                    self.progress1["value"] = i + 1
-                    self.progress1.update()
-                except Exception as e:
-                    error_msg = f"Failed: {option} - {str(e)}"
-                    exec_logger.error(error_msg)
-                    logging.error(f"Section1 {option}: Failed - {str(e)}\n{traceback.format_exc()}")
-
-            for name, var in self.section1_vars.items():
-                var.set(False)
-
-            exec_logger.info(f"Execution Complete: Applied {len(selected)} tweaks!")
-            logging.info(f"Section1: Finished applying {len(selected)} tweaks")
-
-        except Exception as e:
-            logging.error(f"Execute section 1 failed: {str(e)}\n{traceback.format_exc()}")
-            if hasattr(self, 'output_text1'):
-                try:
-                    fatal_logger = logging.getLogger(f"Section1_Exec_{threading.get_ident()}")
-                    if not fatal_logger.handlers:
-                        fatal_logger.addHandler(TextHandler(self.output_text1))
-                        fatal_logger.setLevel(logging.ERROR)
-                    fatal_logger.error(f"Execution Failed: {str(e)}")
-                except:
-                    pass
-            raise
-
-    # --- Section 1 Methods (Updated to accept logger) ---
-    def create_restore_point(self, logger):
-        try:
-            cmd = 'powershell -command "Enable-ComputerRestore -Drive $env:SystemDrive"'
-            self.log_and_run_command(logger, cmd, "Enable Computer Restore")
-            cmd = 'powershell -command "Checkpoint-Computer -Description \'Win11Optimizator Restore Point\' -RestorePointType \'MODIFY_SETTINGS\'"'
-            self.log_and_run_command(logger, cmd, "Create Restore Point")
-            logger.info("Create Restore Point: Success")
-        except subprocess.CalledProcessError as e:
-            logger.warning(f"Create Restore Point: Might have partially failed or requires manual check. Error: {e}")
-        except Exception as e:
-            logger.error(f"Create Restore Point failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def delete_temp_files(self, logger):
-        try:
-            cmd = 'del /q /f /s %TEMP%\\*'
-            self.log_and_run_command(logger, cmd, "Delete Temporary Files")
-            cmd = 'PowerShell -ExecutionPolicy Unrestricted -Command "$bin = (New-Object -ComObject Shell.Application).NameSpace(10); $bin.items()| ForEach {; Write-Host \"Deleting $($_.Name) from Recycle Bin\"; Remove-Item $_.Path -Recurse -Force; }"'
-            self.log_and_run_command(logger, cmd, "Empty Recycle Bin")
-            logger.info("Delete Temporary Files: Success")
-        except subprocess.CalledProcessError as e:
-            logger.warning(f"Delete Temporary Files: Some files might not have been deleted. Error: {e}")
-        except Exception as e:
-            logger.error(f"Delete Temporary Files failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def disable_consumer_features(self, logger):
-         try:
-             key_path = r"SOFTWARE\Policies\Microsoft\Windows\CloudContent"
-             with winreg.CreateKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
-                 winreg.SetValueEx(key, "DisableWindowsConsumerFeatures", 0, winreg.REG_DWORD, 1)
-             logger.info("Disable ConsumerFeatures: Applied registry change.")
-             logger.info(f"Command: reg add \"HKLM\\{key_path}\" /v \"DisableWindowsConsumerFeatures\" /t REG_DWORD /d 1 /f")
-         except Exception as e:
-             logger.error(f"Disable ConsumerFeatures failed: {str(e)}\n{traceback.format_exc()}")
-             raise
-
-    def disable_telemetry(self, logger):
-        try:
-            key_path = r"SOFTWARE\Policies\Microsoft\Windows\DataCollection"
-            with winreg.CreateKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
-                winreg.SetValueEx(key, "AllowTelemetry", 0, winreg.REG_DWORD, 0)
-            logger.info("Disable Telemetry: Applied registry change.")
-            logger.info(f"Command: reg add \"HKLM\\{key_path}\" /v \"AllowTelemetry\" /t REG_DWORD /d 0 /f")
-        except Exception as e:
-            logger.error(f"Disable Telemetry failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def disable_activity_history(self, logger):
-        try:
-             commands = [
-                 'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\System" /v "EnableActivityFeed" /t REG_DWORD /d 0 /f',
-                 'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\System" /v "PublishUserActivities" /t REG_DWORD /d 0 /f',
-                 'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\System" /v "UploadUserActivities" /t REG_DWORD /d 0 /f'
-             ]
-             for cmd in commands:
-                 self.log_and_run_command(logger, cmd)
-             logger.info("Disable Activity History: Applied registry changes.")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Disable Activity History failed (Registry error): {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"Disable Activity History failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def disable_folder_discovery(self, logger):
-        try:
-            key_path = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Explorer\Advanced"
-            with winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path) as key:
-                winreg.SetValueEx(key, "Start_SearchFiles", 0, winreg.REG_DWORD, 0)
-            logger.info("Disable Explorer Folder Discovery: Applied registry change.")
-            logger.info(f"Command: reg add \"HKCU\\{key_path}\" /v \"Start_SearchFiles\" /t REG_DWORD /d 0 /f")
-        except Exception as e:
-            logger.error(f"Disable Explorer Folder Discovery failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def disable_gamedvr(self, logger):
-        try:
-            key_path = r"SOFTWARE\Policies\Microsoft\Windows\GameDVR"
-            with winreg.CreateKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
-                winreg.SetValueEx(key, "AllowGameDVR", 0, winreg.REG_DWORD, 0)
-            logger.info("Disable GameDVR: Applied registry change.")
-            logger.info(f"Command: reg add \"HKLM\\{key_path}\" /v \"AllowGameDVR\" /t REG_DWORD /d 0 /f")
-        except Exception as e:
-            logger.error(f"Disable GameDVR failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def disable_hibernation(self, logger):
-        try:
-            cmd = "powercfg /h off"
-            self.log_and_run_command(logger, cmd, "Disable Hibernation")
-            logger.info("Disable Hibernation: Success")
-        except subprocess.CalledProcessError as e:
-            logger.warning(f"Disable Hibernation: Command might have failed. Error: {e}")
-        except Exception as e:
-            logger.error(f"Disable Hibernation failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def disable_homegroup(self, logger):
-        try:
-            services = ["HomeGroupListener", "HomeGroupProvider"]
-            for service in services:
-                cmd = f'sc config "{service}" start= disabled'
-                self.log_and_run_command(logger, cmd, f"Disable service {service}")
-            logger.info("Disable Homegroup: Success")
-        except subprocess.CalledProcessError as e:
-            logger.warning(f"Disable Homegroup: Service config might have failed. Error: {e}")
-        except Exception as e:
-            logger.error(f"Disable Homegroup failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def disable_location_tracking(self, logger):
-        try:
-            key_path = r"SOFTWARE\Microsoft\Windows\CurrentVersion\CapabilityAccessManager\ConsentStore\location"
-            with winreg.CreateKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
-                winreg.SetValueEx(key, "Value", 0, winreg.REG_SZ, "Deny")
-            logger.info("Disable Location Tracking: Applied registry change.")
-            logger.info(f"Command: reg add \"HKLM\\{key_path}\" /v \"Value\" /t REG_SZ /d \"Deny\" /f")
-        except Exception as e:
-            logger.error(f"Disable Location Tracking failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def disable_storage_sense(self, logger):
-        try:
-            key_path = r"SOFTWARE\Policies\Microsoft\Windows\StorageSense"
-            with winreg.CreateKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
-                winreg.SetValueEx(key, "AllowStorageSenseGlobal", 0, winreg.REG_DWORD, 0)
-            logger.info("Disable Storage Sense: Applied registry change.")
-            logger.info(f"Command: reg add \"HKLM\\{key_path}\" /v \"AllowStorageSenseGlobal\" /t REG_DWORD /d 0 /f")
-        except Exception as e:
-            logger.error(f"Disable Storage Sense failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def disable_wifi_sense(self, logger):
-        try:
-            key_path = r"SOFTWARE\Microsoft\WcmSvc\wifinetworkmanager\config"
-            with winreg.CreateKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
-                winreg.SetValueEx(key, "AutoConnectAllowedOEM", 0, winreg.REG_DWORD, 0)
-            logger.info("Disable Wifi-Sense: Applied registry change.")
-            logger.info(f"Command: reg add \"HKLM\\{key_path}\" /v \"AutoConnectAllowedOEM\" /t REG_DWORD /d 0 /f")
-        except Exception as e:
-            logger.error(f"Disable Wifi-Sense failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def enable_end_task(self, logger):
-        try:
-            key_path = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Explorer\Advanced\TaskbarDeveloperSettings"
-            with winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path) as key:
-                winreg.SetValueEx(key, "TaskbarEndTask", 0, winreg.REG_DWORD, 1)
-            logger.info("Enable End Task With Right Click: Applied registry change.")
-            logger.info(f"Command: reg add \"HKCU\\{key_path}\" /v \"TaskbarEndTask\" /t REG_DWORD /d 1 /f")
-        except Exception as e:
-            logger.error(f"Enable End Task With Right Click failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def run_disk_cleanup(self, logger):
-        try:
-            cmd = "cleanmgr /sagerun:1"
-            logger.info("Run Disk Cleanup: Initiated (command will open Disk Cleanup window)")
-            logger.info(f"Command: {cmd}")
-            subprocess.Popen(cmd, shell=True) # Use Popen to not block
-            logger.info("Run Disk Cleanup: Command sent.")
-        except Exception as e:
-            logger.error(f"Run Disk Cleanup failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def set_powershell7_default(self, logger):
-        try:
-            logger.warning("Change Windows Terminal default: PowerShell 5 -> PowerShell 7: Placeholder - Implementation depends on specific setup.")
-        except Exception as e:
-            logger.error(f"Set PowerShell 7 default failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def disable_powershell7_telemetry(self, logger):
-        try:
-             logger.warning("Disable Powershell 7 Telemetry: Placeholder - Implementation depends on specific setup.")
-        except Exception as e:
-            logger.error(f"Disable Powershell 7 Telemetry failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def disable_recall(self, logger):
-        try:
-            cmd = 'DISM /Online /Disable-Feature /FeatureName:Recall'
-            self.log_and_run_command(logger, cmd, "Disable Recall Feature")
-            logger.info("Disable Recall: Command executed.")
-        except subprocess.CalledProcessError as e:
-            logger.warning(f"Disable Recall: DISM command might have failed or feature not found. Error: {e}")
-        except Exception as e:
-            logger.error(f"Disable Recall failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def set_hibernation_default(self, logger):
-        try:
-            cmd = "powercfg /h on"
-            self.log_and_run_command(logger, cmd, "Enable Hibernation")
-            cmd = 'powercfg /setactive "SCHEME_MIN"'
-            self.log_and_run_command(logger, cmd, "Set Power Scheme to High Performance (often uses hibernation)")
-            logger.info("Set Hibernation as default: Success (set to High Performance scheme)")
-        except subprocess.CalledProcessError as e:
-            logger.warning(f"Set Hibernation as default: Command might have failed. Error: {e}")
-        except Exception as e:
-            logger.error(f"Set Hibernation as default failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def set_services_manual(self, logger):
-        try:
-            services = [
-                "diagnosticshub.standardcollector.service", # Microsoft (R) Diagnostics Hub Standard Collector Service
-                "dmwappushservice", # WAP Push Message Routing Service
-                "lfsvc", # Geolocation Service
-                "MapsBroker", # Downloaded Maps Manager
-                "NetTcpPortSharing", # Net.Tcp Port Sharing Service
-                "RemoteAccess", # Routing and Remote Access
-                "RemoteRegistry", # Remote Registry
-                "SharedAccess", # Internet Connection Sharing (ICS)
-                "TrkWks", # Distributed Link Tracking Client
-                "WbioSrvc", # Windows Biometric Service
-                "WlanSvc", # WLAN AutoConfig (if not needed)
-                "WMPNetworkSvc", # Windows Media Player Network Sharing Service
-                "XblAuthManager", # Xbox Live Auth Manager
-                "XblGameSave", # Xbox Live Game Save Service
-                "XboxNetApiSvc", # Xbox Live Networking Service
-            ]
-            for service in services:
-                try:
-                    cmd = f'sc config "{service}" start= demand'
-                    self.log_and_run_command(logger, cmd, f"Set service {service} to Manual")
-                except subprocess.CalledProcessError:
-                    logger.warning(f"Set Services to Manual: Failed to set {service} to Manual (might not exist or need higher privileges)")
-            logger.info("Set Services to Manual: Attempted for listed services")
-        except Exception as e:
-            logger.error(f"Set Services to Manual failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+import time
 
-    def debloat_brave(self, logger):
-        try:
-            logger.warning("Debloat Brave: Placeholder - Implementation depends on specific Brave components to remove.")
-        except Exception as e:
-            logger.error(f"Debloat Brave failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+APP_START_TIME = time.perf_counter() # Reference point for the startup metrics
 
-    def debloat_edge(self, logger):
-        try:
-            logger.warning("Debloat Edge: Placeholder - Implementation depends on specific Edge components to remove.")
-        except Exception as e:
-            logger.error(f"Debloat Edge failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+# tkinter is imported only when the GUI starts (see load_gui_modules), so the
+# headless command line never pays for it
+tk = ttk = messagebox = filedialog = Menu = BooleanVar = None
 
-    # --- New Methods from comenzi.txt (Updated to accept logger) ---
-    def disable_windows_setting_sync(self, logger):
-        try:
-            commands = [
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\SettingSync" /v "DisableWindowsSettingSync" /t REG_DWORD /d 2 /f',
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\SettingSync" /v "DisableWindowsSettingSyncUserOverride" /t REG_DWORD /d 1 /f',
-                'reg add "HKCU\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\SettingSync" /v "SyncPolicy" /t REG_DWORD /d 5 /f',
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\SettingSync" /v "DisableSettingSync" /t REG_DWORD /d 2 /f',
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\SettingSync" /v "DisableSettingSyncUserOverride" /t REG_DWORD /d 1 /f'
-            ]
-            for cmd in commands:
-                self.log_and_run_command(logger, cmd)
-            logger.info("Disable Windows Setting Sync: Applied registry changes.")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Disable Windows Setting Sync failed (Registry error): {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"Disable Windows Setting Sync failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+def is_admin():
+    try:
+        import ctypes
+        return ctypes.windll.shell32.IsUserAnAdmin()
+    except:
+        return False
 
-    def disable_handwriting_data_collection(self, logger):
+def request_admin_privileges():
+    if not is_admin():
         try:
-            commands = [
-                'reg add "HKCU\\Software\\Policies\\Microsoft\\InputPersonalization" /v "RestrictImplicitInkCollection" /t REG_DWORD /d 1 /f',
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\InputPersonalization" /v "RestrictImplicitInkCollection" /t REG_DWORD /d 1 /f',
-                'reg add "HKCU\\Software\\Policies\\Microsoft\\InputPersonalization" /v "RestrictImplicitTextCollection" /t REG_DWORD /d 1 /f',
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\InputPersonalization" /v "RestrictImplicitTextCollection" /t REG_DWORD /d 1 /f',
-                'reg add "HKCU\\Software\\Policies\\Microsoft\\Windows\\HandwritingErrorReports" /v "PreventHandwritingErrorReports" /t REG_DWORD /d 1 /f',
-                'reg add "HKLM\\Software\\Policies\\Microsoft\\Windows\\HandwritingErrorReports" /v "PreventHandwritingErrorReports" /t REG_DWORD /d 1 /f',
-                'reg add "HKCU\\Software\\Policies\\Microsoft\\Windows\\TabletPC" /v "PreventHandwritingDataSharing" /t REG_DWORD /d 1 /f',
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\TabletPC" /v "PreventHandwritingDataSharing" /t REG_DWORD /d 1 /f',
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\InputPersonalization" /v "AllowInputPersonalization" /t REG_DWORD /d 0 /f',
-                'reg add "HKCU\\SOFTWARE\\Microsoft\\InputPersonalization\\TrainedDataStore" /v "HarvestContacts" /t REG_DWORD /d 0 /f'
-            ]
-            for cmd in commands:
-                self.log_and_run_command(logger, cmd)
-            logger.info("Disable Handwriting Data Collection: Applied registry changes.")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Disable Handwriting Data Collection failed (Registry error): {str(e)}")
-            raise
+            import ctypes
+            ctypes.windll.shell32.ShellExecuteW(
+                None, "runas", sys.executable, " ".join(sys.argv), None, 1
+            )
+            sys.exit(0)
         except Exception as e:
-            logger.error(f"Disable Handwriting Data Collection failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+            import logging
+            logging.error(f"Failed to elevate privileges: {e}")
+            load_gui_modules()
+            messagebox.showerror("Error", f"Cannot obtain admin rights: {e}")
+            sys.exit(1)
 
-    def disable_clipboard_data_collection(self, logger):
-        try:
-            key_path = r"SOFTWARE\Microsoft\Windows\CurrentVersion\CapabilityAccessManager\ConsentStore\clipboard"
-            with winreg.CreateKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
-                winreg.SetValueEx(key, "Value", 0, winreg.REG_SZ, "Deny")
-            logger.info("Disable Clipboard Data Collection: Set consent to Deny.")
-            logger.info(f"Command: reg add \"HKLM\\{key_path}\" /v \"Value\" /t REG_SZ /d \"Deny\" /f")
-        except Exception as e:
-            logger.error(f"Disable Clipboard Data Collection failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+def load_gui_modules():
+    global tk, ttk, messagebox, filedialog, Menu, BooleanVar
+    import tkinter as tk
+    from tkinter import ttk, messagebox, filedialog, Menu, BooleanVar
 
-    def opt_out_privacy_consent(self, logger):
-        try:
-            key_path = r'SOFTWARE\Microsoft\Personalization\Settings'
-            with winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path) as key:
-                winreg.SetValueEx(key, "AcceptedPrivacyPolicy", 0, winreg.REG_DWORD, 0)
-            logger.info("Opt out of Privacy Consent: Set AcceptedPrivacyPolicy to 0.")
-            logger.info(f"Command: reg add \"HKCU\\{key_path}\" /v \"AcceptedPrivacyPolicy\" /t REG_DWORD /d 0 /f")
-        except Exception as e:
-            logger.error(f"Opt out of Privacy Consent failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+if __name__ == "__main__" and len(sys.argv) == 1: # Plain GUI launch
+    request_admin_privileges()
 
-    def disable_3rd_party_telemetry(self, logger):
-        try:
-             # Adobe (from existing method, updated path)
-             key_path_adobe = r"SOFTWARE\Policies\Adobe\Acrobat Reader\DC\FeatureLockDown"
-             with winreg.CreateKey(winreg.HKEY_LOCAL_MACHINE, key_path_adobe) as key:
-                 winreg.SetValueEx(key, "bUsageMeasurement", 0, winreg.REG_DWORD, 0)
-             logger.info("Disable 3rd-party apps Telemetry (Adobe): Applied registry change.")
-             logger.info(f"Command: reg add \"HKLM\\{key_path_adobe}\" /v \"bUsageMeasurement\" /t REG_DWORD /d 0 /f")
-
-             # NVIDIA (from comenzi.txt)
-             nvidia_commands = [
-                 'reg add "HKLM\\SOFTWARE\\NVIDIA Corporation\\Global\\FTS" /v "EnableRID44231" /t REG_DWORD /d 0 /f',
-                 'reg add "HKLM\\SOFTWARE\\NVIDIA Corporation\\Global\\FTS" /v "EnableRID64640" /t REG_DWORD /d 0 /f',
-                 'reg add "HKLM\\SOFTWARE\\NVIDIA Corporation\\Global\\FTS" /v "EnableRID66610" /t REG_DWORD /d 0 /f',
-                 'reg add "HKLM\\SYSTEM\\CurrentControlSet\\Services\\nvlddmkm\\Global\\Startup" /v "SendTelemetryData" /t REG_DWORD /d 0 /f',
-                 'schtasks /change /TN "NvTmMon_{B2FE1952-0186-46C3-BAEC-A80AA35AC5B8}" /DISABLE',
-                 'schtasks /change /TN "NvTmRep_{B2FE1952-0186-46C3-BAEC-A80AA35AC5B8}" /DISABLE'
-             ]
-             for cmd in nvidia_commands:
-                 try:
-                     self.log_and_run_command(logger, cmd)
-                 except subprocess.CalledProcessError as e:
-                     logger.warning(f"Disable 3rd-party telemetry (NVIDIA): Command failed or task not found: {cmd}. Error: {e}")
-
-             # Visual Studio (from comenzi.txt)
-             vs_commands = [
-                 'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\VisualStudio\\IntelliCode" /v "DisableRemoteAnalysis" /t REG_DWORD /d 1 /f',
-                 'reg add "HKCU\\SOFTWARE\\Microsoft\\VSCommon\\16.0\\IntelliCode" /v "DisableRemoteAnalysis" /t REG_DWORD /d 1 /f',
-                 'reg add "HKCU\\SOFTWARE\\Microsoft\\VSCommon\\17.0\\IntelliCode" /v "DisableRemoteAnalysis" /t REG_DWORD /d 1 /f',
-                 'reg add "HKCU\\Software\\Microsoft\\VisualStudio\\Telemetry" /v "TurnOffSwitch" /t REG_DWORD /d 1 /f',
-                 'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\VisualStudio\\Feedback" /v "DisableFeedbackDialog" /t REG_DWORD /d 1 /f',
-                 'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\VisualStudio\\Feedback" /v "DisableEmailInput" /t REG_DWORD /d 1 /f',
-                 'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\VisualStudio\\Feedback" /v "DisableScreenshotCapture" /t REG_DWORD /d 1 /f'
-             ]
-             for cmd in vs_commands:
-                 self.log_and_run_command(logger, cmd)
-
-             logger.info("Disable 3rd-party apps Telemetry (Adobe/NVIDIA/VS): Applied registry changes and task disables.")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Disable 3rd-party apps Telemetry failed (Registry/Task error): {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"Disable 3rd-party apps Telemetry failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+import subprocess
+import threading
+import logging
+import traceback
+import base64
+import itertools
+import re
+import json
+from datetime import datetime
+import queue
+from collections import namedtuple, deque
 
-    def disable_lockscreen_camera(self, logger):
-        try:
-            key_path = r"SOFTWARE\Policies\Microsoft\Windows\Personalization"
-            with winreg.CreateKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
-                winreg.SetValueEx(key, "NoLockScreenCamera", 0, winreg.REG_DWORD, 1)
-            logger.info("Disable Lockscreen Camera Access: Applied registry change.")
-            logger.info(f"Command: reg add \"HKLM\\{key_path}\" /v \"NoLockScreenCamera\" /t REG_DWORD /d 1 /f")
-        except Exception as e:
-            logger.error(f"Disable Lockscreen Camera Access failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+try:
+    import winreg
+except ImportError: # Not on Windows: only the in-memory registry backend is available
+    winreg = None
 
-    def disable_biometrics(self, logger):
-        try:
-            commands = [
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Biometrics" /v "Enabled" /t REG_DWORD /d 0 /f',
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Biometrics\\Credential Provider" /v "Enabled" /t REG_DWORD /d 0 /f'
-            ]
-            for cmd in commands:
-                self.log_and_run_command(logger, cmd)
-            logger.info("Disable Biometrics: Applied registry changes.")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Disable Biometrics failed (Registry error): {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"Disable Biometrics failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+# --- Configuration ---
+LOG_FILENAME = "win11optimizator.log"
+CONFIG_FILENAME = "win11optimizator.ini"
+SERVICE_PROFILE_FILENAME = "win11optimizator_services.ini" # Optional user-edited service list (see read_service_profile)
+RUNS_DIR = "win11optimizator_runs" # Per-run rollback journals
+APP_NAME = "Win11Optimizator"
+APP_VERSION = "1.0.1"
 
-    def disable_cortana_bing_search(self, logger):
-        try:
-            commands = [
-                'reg add "HKCU\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Search" /v "DisableSearchBoxSuggestions" /t REG_DWORD /d 1 /f',
-                'reg add "HKLM\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Search" /v "CortanaInAmbientMode" /t REG_DWORD /d 0 /f',
-                'reg add "HKCU\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Search" /v "BingSearchEnabled" /t REG_DWORD /d 0 /f',
-                'reg add "HKCU\\Software\\Microsoft\\Windows\\CurrentVersion\\Explorer\\Advanced" /v "ShowCortanaButton" /t REG_DWORD /d 0 /f',
-                'reg add "HKCU\\Software\\Microsoft\\Windows\\CurrentVersion\\Search" /v "CanCortanaBeEnabled" /t REG_DWORD /d 0 /f',
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\Windows Search" /v "ConnectedSearchUseWebOverMeteredConnections" /t REG_DWORD /d 0 /f',
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\Windows Search" /v "AllowCortanaAboveLock" /t REG_DWORD /d 0 /f',
-                'reg add "HKCU\\Software\\Microsoft\\Windows\\CurrentVersion\\SearchSettings" /v "IsDynamicSearchBoxEnabled" /t REG_DWORD /d 0 /f',
-                'reg add "HKLM\\SOFTWARE\\Microsoft\\PolicyManager\\default\\Experience\\AllowCortana" /v "value" /t REG_DWORD /d 0 /f',
-                'reg add "HKCU\\Software\\Microsoft\\Windows\\CurrentVersion\\Search" /v "CortanaEnabled" /t REG_DWORD /d 0 /f',
-                'reg add "HKLM\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Search" /v "CortanaEnabled" /t REG_DWORD /d 0 /f',
-                'reg add "HKCU\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\SearchSettings" /v "IsMSACloudSearchEnabled" /t REG_DWORD /d 0 /f',
-                'reg add "HKCU\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\SearchSettings" /v "IsAADCloudSearchEnabled" /t REG_DWORD /d 0 /f',
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\Windows Search" /v "AllowCloudSearch" /t REG_DWORD /d 0 /f'
-            ]
-            for cmd in commands:
-                self.log_and_run_command(logger, cmd)
-            logger.info("Disable Cortana & Bing Search: Applied registry changes.")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Disable Cortana & Bing Search failed (Registry error): {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"Disable Cortana & Bing Search failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+# --- Logging Setup ---
+def setup_logging():
+    """Configure the log file. Called from main(), so importing the module writes nothing."""
+    logging.basicConfig(
+        filename=LOG_FILENAME,
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S'
+    )
+    logging.info(f"--- Starting {APP_NAME} v{APP_VERSION} ---")
 
-    def disable_feedback_notifications(self, logger):
-        try:
-            commands = [
-                'reg add "HKCU\\SOFTWARE\\Microsoft\\Siuf\\Rules" /v "NumberOfSIUFInPeriod" /t REG_DWORD /d 0 /f',
-                'reg delete "HKCU\\SOFTWARE\\Microsoft\\Siuf\\Rules" /v "PeriodInNanoSeconds" /f 2>nul',
-                'reg add "HKLM\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\Policies\\DataCollection" /v "DoNotShowFeedbackNotifications" /t REG_DWORD /d 1 /f',
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\DataCollection" /v "DoNotShowFeedbackNotifications" /t REG_DWORD /d 1 /f'
-            ]
-            for cmd in commands:
-                self.log_and_run_command(logger, cmd)
-            logger.info("Disable Feedback Notifications: Applied registry changes.")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Disable Feedback Notifications failed (Registry error): {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"Disable Feedback Notifications failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+# --- Utility Functions ---
+def resource_path(relative_path):
+    try:
+        base_path = sys._MEIPASS
+    except Exception:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
 
-    def disable_verbose_logon(self, logger):
+# --- Registry Write Engine ---
+# Tweaks describe registry changes as RegistryOp tuples and hand them to a
+# RegistryEngine, which applies them in-process through a pluggable backend
+# instead of spawning one cmd.exe + reg.exe pair per value.
+REG_SZ = "REG_SZ"
+REG_EXPAND_SZ = "REG_EXPAND_SZ"
+REG_DWORD = "REG_DWORD"
+REG_QWORD = "REG_QWORD"
+REG_BINARY = "REG_BINARY"
+REG_MULTI_SZ = "REG_MULTI_SZ"
+REG_DELETE = "REG_DELETE" # Pseudo-type: remove the value if it exists
+
+RegistryOp = namedtuple("RegistryOp", ["hive", "key", "name", "type", "data"])
+
+def reg_dword(hive, key, name, data):
+    return RegistryOp(hive, key, name, REG_DWORD, int(data))
+
+def reg_sz(hive, key, name, data):
+    return RegistryOp(hive, key, name, REG_SZ, str(data))
+
+def reg_delete(hive, key, name):
+    return RegistryOp(hive, key, name, REG_DELETE, None)
+
+def describe_registry_op(op):
+    """Render an operation as the equivalent reg.exe command line (used for logging)."""
+    value = "/ve" if op.name == "" else f'/v "{op.name}"'
+    if op.type == REG_DELETE:
+        return f'reg delete "{op.hive}\\{op.key}" {value} /f'
+    data = f'"{op.data}"' if op.type in (REG_SZ, REG_EXPAND_SZ) else op.data
+    return f'reg add "{op.hive}\\{op.key}" {value} /t {op.type} /d {data} /f'
+
+def registry_key_id(hive, key):
+    """Case-insensitive identity of a registry key, like the real registry."""
+    return (hive.upper(), key.strip("\\").lower())
+
+REGISTRY_VALUE_TYPES = (REG_SZ, REG_EXPAND_SZ, REG_DWORD, REG_QWORD, REG_BINARY, REG_MULTI_SZ)
+REGISTRY_TYPE_NAMES = {getattr(winreg, name): name for name in REGISTRY_VALUE_TYPES} if winreg else {}
+
+def registry_op_satisfied(op, current):
+    """True if the current (type, data) of a value (None when missing) already matches the operation."""
+    if op.type == REG_DELETE:
+        return current is None
+    return current == (op.type, op.data)
+
+class WinregBackend:
+    """Registry backend writing to the real Windows registry through winreg."""
+    def __init__(self):
+        self.hives = {
+            "HKLM": winreg.HKEY_LOCAL_MACHINE,
+            "HKCU": winreg.HKEY_CURRENT_USER,
+            "HKCR": winreg.HKEY_CLASSES_ROOT,
+            "HKU": winreg.HKEY_USERS,
+        }
+
+    def open_key(self, hive, key):
+        return winreg.CreateKey(self.hives[hive], key)
+
+    def read_values(self, hive, key, names):
+        """Return {name (lower): (type, data)} for the values that exist. Opens the key read-only."""
         try:
-             key_path = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Policies\System"
-             with winreg.CreateKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
-                 winreg.SetValueEx(key, "verbosestatus", 0, winreg.REG_DWORD, 1)
-             logger.info("Disable Verbose Logon: Applied registry change (Set verbosestatus=1)")
-             logger.info(f"Command: reg add \"HKLM\\{key_path}\" /v \"verbosestatus\" /t REG_DWORD /d 1 /f")
-        except Exception as e:
-             logger.error(f"Disable Verbose Logon failed: {str(e)}\n{traceback.format_exc()}")
-             raise
-
-    def disable_sticky_keys(self, logger):
+            handle = winreg.OpenKey(self.hives[hive], key, 0, winreg.KEY_READ)
+        except FileNotFoundError:
+            return {}
+        current = {}
         try:
-            key_path = r"Control Panel\Accessibility\StickyKeys"
-            with winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path) as key:
-                winreg.SetValueEx(key, "Flags", 0, winreg.REG_SZ, "58")
-            logger.info("Disable Sticky Keys: Applied registry change.")
-            logger.info(f"Command: reg add \"HKCU\\{key_path}\" /v \"Flags\" /t REG_SZ /d \"58\" /f")
-        except Exception as e:
-            logger.error(f"Disable Sticky Keys failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def disable_numlock_startup(self, logger):
+            for name in names:
+                try:
+                    data, type_id = winreg.QueryValueEx(handle, name)
+                except FileNotFoundError:
+                    continue
+                current[name.lower()] = (REGISTRY_TYPE_NAMES.get(type_id, type_id), data)
+        finally:
+            handle.Close()
+        return current
+
+    def read_subkeys(self, hive, key, names):
+        """Return {subkey name: read_values(...)} for every direct subkey of a key, in one pass."""
         try:
-            key_path = r"Control Panel\Keyboard"
-            with winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path) as key:
-                winreg.SetValueEx(key, "InitialKeyboardIndicators", 0, winreg.REG_SZ, "0")
-            logger.info("Disable Numlock on startup: Applied registry change.")
-            logger.info(f"Command: reg add \"HKCU\\{key_path}\" /v \"InitialKeyboardIndicators\" /t REG_SZ /d \"0\" /f")
-        except Exception as e:
-            logger.error(f"Disable Numlock on startup failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def disable_snap_flyout(self, logger):
+            handle = winreg.OpenKey(self.hives[hive], key, 0, winreg.KEY_READ)
+        except FileNotFoundError:
+            return {}
+        subkeys = []
         try:
-            key_path = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Explorer\Advanced"
-            with winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path) as key:
-                winreg.SetValueEx(key, "EnableSnapAssistFlyout", 0, winreg.REG_DWORD, 0)
-            logger.info("Disable Snap Flyout: Applied registry change.")
-            logger.info(f"Command: reg add \"HKCU\\{key_path}\" /v \"EnableSnapAssistFlyout\" /t REG_DWORD /d 0 /f")
-        except Exception as e:
-            logger.error(f"Disable Snap Flyout failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+            for index in itertools.count():
+                try:
+                    subkeys.append(winreg.EnumKey(handle, index))
+                except OSError: # ERROR_NO_MORE_ITEMS
+                    break
+        finally:
+            handle.Close()
+        return {subkey: self.read_values(hive, f"{key}\\{subkey}", names) for subkey in subkeys}
 
-    def set_classic_right_click(self, logger):
-        try:
-            commands = [
-                'reg add "HKCU\\Software\\Classes\\CLSID\\{86ca1aa0-34aa-4e8b-a509-50c905bae2a2}\\InprocServer32" /f /ve',
-                'reg add "HKCU\\Software\\Classes\\CLSID\\{86ca1aa0-34aa-4e8b-a509-50c905bae2a2}\\InprocServer32" /ve /t REG_SZ /d "" /f'
-            ]
-            for cmd in commands:
-                self.log_and_run_command(logger, cmd)
-            logger.info("Set Classic Right Click Menu: Applied registry changes.")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Set Classic Right Click Menu failed (Registry error): {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"Set Classic Right Click Menu failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+    def set_value(self, handle, name, value_type, data):
+        winreg.SetValueEx(handle, name, 0, getattr(winreg, value_type), data)
 
-    def show_file_extensions(self, logger):
+    def delete_value(self, handle, name):
         try:
-            key_path = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Explorer\Advanced"
-            with winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path) as key:
-                winreg.SetValueEx(key, "HideFileExt", 0, winreg.REG_DWORD, 0)
-            logger.info("Show File Extensions: Applied registry change.")
-            logger.info(f"Command: reg add \"HKCU\\{key_path}\" /v \"HideFileExt\" /t REG_DWORD /d 0 /f")
-        except Exception as e:
-            logger.error(f"Show File Extensions failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+            winreg.DeleteValue(handle, name)
+        except FileNotFoundError:
+            pass # Already absent, same outcome as 'reg delete ... 2>nul'
+
+    def close_key(self, handle):
+        handle.Close()
+
+class MemoryRegistryBackend:
+    """Dictionary-backed registry used off Windows and in tests.
+
+    Key paths and value names are case-insensitive, like the real registry.
+    """
+    def __init__(self):
+        self.keys = {}
+        self.lock = threading.Lock()
+        self.open_count = 0
+        self.read_count = 0
+
+    def open_key(self, hive, key):
+        with self.lock:
+            self.open_count += 1
+            return self.keys.setdefault(registry_key_id(hive, key), {"path": key, "values": {}})
+
+    def set_value(self, handle, name, value_type, data):
+        with self.lock:
+            handle["values"][name.lower()] = (name, value_type, data)
+
+    def delete_value(self, handle, name):
+        with self.lock:
+            handle["values"].pop(name.lower(), None)
+
+    def close_key(self, handle):
+        pass
+
+    def read_values(self, hive, key, names):
+        with self.lock:
+            self.read_count += 1
+            entry = self.keys.get(registry_key_id(hive, key))
+            if entry is None:
+                return {}
+            return {name.lower(): entry["values"][name.lower()][1:] for name in names if name.lower() in entry["values"]}
+
+    def read_subkeys(self, hive, key, names):
+        hive_id, prefix = registry_key_id(hive, key)
+        prefix += "\\"
+        with self.lock:
+            self.read_count += 1
+            return {entry["path"].rstrip("\\").rsplit("\\", 1)[-1]:
+                        {name.lower(): entry["values"][name.lower()][1:] for name in names if name.lower() in entry["values"]}
+                    for (entry_hive, entry_key), entry in self.keys.items()
+                    if entry_hive == hive_id and entry_key.startswith(prefix) and "\\" not in entry_key[len(prefix):]}
+
+    def get_value(self, hive, key, name):
+        """Return (type, data) for a value, or None if the key or value is missing."""
+        with self.lock:
+            entry = self.keys.get(registry_key_id(hive, key))
+            if entry is None or name.lower() not in entry["values"]:
+                return None
+            _, value_type, data = entry["values"][name.lower()]
+            return (value_type, data)
+
+def default_registry_backend():
+    if winreg is not None:
+        return WinregBackend()
+    logging.warning("winreg is not available on this platform; using the in-memory registry backend.")
+    return MemoryRegistryBackend()
+
+class RegistryBatch:
+    """Pending registry writes from one or more tweaks, grouped by (hive, key).
+
+    Each key is opened once when the batch is applied. Identical writes requested
+    by several tweaks are applied once and credited to every owner.
+    """
+    def __init__(self):
+        self.groups = {} # registry_key_id -> {"hive", "key", "values": {name (lower): [op, owners]}}
+        self.requested = 0
+
+    def add(self, op, owner=None):
+        self.requested += 1
+        group = self.groups.setdefault(registry_key_id(op.hive, op.key), {"hive": op.hive, "key": op.key, "values": {}})
+        entry = group["values"].get(op.name.lower())
+        if entry is None:
+            group["values"][op.name.lower()] = [op, [owner]]
+            return
+        if (entry[0].type, entry[0].data) != (op.type, op.data):
+            logging.warning(f"Registry batch: '{describe_registry_op(op)}' overrides '{describe_registry_op(entry[0])}'")
+            entry[0] = op
+        entry[1].append(owner)
+
+    def __len__(self):
+        return sum(len(group["values"]) for group in self.groups.values())
+
+class RegistryEngine:
+    """Applies registry operations in-process through a registry backend."""
+    def __init__(self, backend=None, skip_applied=True):
+        self.backend = backend if backend is not None else default_registry_backend()
+        self.skip_applied = skip_applied
+
+    def apply(self, ops, logger=None, journal=None):
+        """Apply the operations as one key-grouped batch. Raises the first failure."""
+        batch = RegistryBatch()
+        for op in ops:
+            batch.add(op)
+        result = self.apply_batch(batch, logger, journal)
+        if result["failed"]:
+            raise next(iter(result["failed"].values()))
+        return result
+
+    def read_batch(self, batch, logger=None):
+        """Read the current state of every value in the batch, one read-only key open per key.
+
+        Returns {registry_key_id: {name (lower): (type, data)}}; keys that cannot be read map to None.
+        """
+        current = {}
+        for key_id, group in batch.groups.items():
+            names = [op.name for op, _ in group["values"].values()]
+            try:
+                current[key_id] = self.backend.read_values(group["hive"], group["key"], names)
+            except Exception as e:
+                if logger:
+                    logger.warning(f"Registry: Cannot read {group['hive']}\\{group['key']}: {e}")
+                current[key_id] = None
+        return current
+
+    def pending_values(self, batch, logger=None, current=None):
+        """Split the batch per key into values that still need writing and the count already in place."""
+        if current is None:
+            current = self.read_batch(batch, logger)
+        pending = {}
+        already_applied = 0
+        for key_id, group in batch.groups.items():
+            values = current.get(key_id)
+            todo = []
+            for name, (op, owners) in group["values"].items():
+                if values is not None and registry_op_satisfied(op, values.get(name)):
+                    already_applied += 1
+                    if logger:
+                        logger.info(f"Registry: Already applied: {describe_registry_op(op)}")
+                else:
+                    todo.append((op, owners))
+            pending[key_id] = todo
+        return pending, already_applied
+
+    def apply_batch(self, batch, logger=None, journal=None):
+        """Apply a RegistryBatch, opening every key once.
+
+        Values are read first and the ones already in the desired state are skipped;
+        keys with nothing left to write are never opened for writing. With a journal,
+        the prior state of every value is recorded before its key is written. Failures
+        do not stop the batch; they are returned per owner in result["failed"]. Owners
+        that had at least one value to write are listed in result["changed"].
+        """
+        result = {"requested": batch.requested, "writes": 0, "key_opens": 0, "already_applied": 0,
+                  "failed": {}, "changed": set()}
+        current = self.read_batch(batch, logger) if self.skip_applied or journal is not None else {}
+        if self.skip_applied:
+            pending, result["already_applied"] = self.pending_values(batch, logger, current)
+        else:
+            pending = {key_id: list(group["values"].values()) for key_id, group in batch.groups.items()}
+        for key_id, group in batch.groups.items():
+            if not pending[key_id]:
+                continue
+            for _, owners in pending[key_id]:
+                result["changed"].update(owners)
+            if journal is not None:
+                values = current.get(key_id) or {}
+                journal.record_many(journal.registry_entry(op, values.get(op.name.lower())) for op, _ in pending[key_id])
+            try:
+                handle = self.backend.open_key(group["hive"], group["key"])
+            except Exception as e:
+                if logger:
+                    logger.error(f"Registry: Cannot open {group['hive']}\\{group['key']}: {e}")
+                for _, owners in pending[key_id]:
+                    for owner in owners:
+                        result["failed"].setdefault(owner, e)
+                continue
+            result["key_opens"] += 1
+            started = time.perf_counter()
+            failures = 0
+            try:
+                for op, owners in pending[key_id]:
+                    if logger:
+                        logger.info(f"Registry: {describe_registry_op(op)}")
+                    try:
+                        if op.type == REG_DELETE:
+                            self.backend.delete_value(handle, op.name)
+                        else:
+                            self.backend.set_value(handle, op.name, op.type, op.data)
+                        result["writes"] += 1
+                    except Exception as e:
+                        if logger:
+                            logger.error(f"Registry: Failed {describe_registry_op(op)}: {e}")
+                        failures += 1
+                        for owner in owners:
+                            result["failed"].setdefault(owner, e)
+            finally:
+                self.backend.close_key(handle)
+                record_event(logger, "operation", kind="registry", target=f"{group['hive']}\\{group['key']}",
+                             values=len(pending[key_id]), duration=round(time.perf_counter() - started, 6),
+                             outcome="failed" if failures else "ok")
+        return result
+
+# --- Tweak Catalog ---
+# Every selectable option is described once here. The UI builds its checkboxes
+# from SECTIONS and the execute engine dispatches through the TWEAKS dict, so
+# adding an entry costs nothing at runtime.
+COST_INSTANT = "instant" # In-process registry writes or log-only placeholders
+COST_FAST = "fast" # Short external commands (powercfg, sc, schtasks)
+COST_SLOW = "slow" # DISM, winget, restore points, app removal, cleanup
+
+Tweak = namedtuple(
+    "Tweak",
+    ["id", "label", "operations", "handler", "args", "cost", "reversible", "category", "barrier", "depends", "resources", "conflicts",
+     "timeout"],
+    defaults=((), None, (), COST_INSTANT, True, None, False, (), (), (), None)
+)
+# barrier=True: the tweak must finish before any other selected tweak touches the system
+# depends: ids of tweaks that must finish first when both are selected
+# resources: what the handler touches besides its registry operations; tweaks sharing
+#            a resource never run at the same time (see TweakScheduler)
+# conflicts: ids of tweaks with the opposite effect that the registry cannot reveal
+#            (conflicting registry writes are detected by compile_plan)
+# timeout: seconds allowed per command of the handler; None uses COMMAND_TIMEOUTS[cost]
+
+TWEAK_CATALOG = [
+    Tweak("create_restore_point", "Create Restore Point",
+          handler="create_restore_point",
+          cost=COST_SLOW, reversible=False, barrier=True, resources=("powershell",), timeout=600),
+    Tweak("delete_temp_files", "Delete Temporary Files",
+          handler="delete_temp_files",
+          cost=COST_SLOW, reversible=False, resources=("temp", "powershell")),
+    Tweak("disable_consumer_features", "Disable ConsumerFeatures",
+          operations=(
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\CloudContent", "DisableWindowsConsumerFeatures", 1),
+          )),
+    Tweak("disable_telemetry", "Disable Telemetry",
+          operations=(
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\DataCollection", "AllowTelemetry", 0),
+          )),
+    Tweak("disable_activity_history", "Disable Activity History",
+          operations=(
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\System", "EnableActivityFeed", 0),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\System", "PublishUserActivities", 0),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\System", "UploadUserActivities", 0),
+          )),
+    Tweak("disable_folder_discovery", "Disable Explorer Automatic Folder Discovery",
+          operations=(
+              reg_dword("HKCU", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Explorer\Advanced", "Start_SearchFiles", 0),
+          )),
+    Tweak("disable_gamedvr", "Disable GameDVR",
+          operations=(
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\GameDVR", "AllowGameDVR", 0),
+          )),
+    Tweak("disable_hibernation", "Disable Hibernation",
+          handler="disable_hibernation",
+          cost=COST_FAST, resources=("powercfg",)),
+    Tweak("disable_homegroup", "Disable Homegroup",
+          handler="disable_homegroup",
+          cost=COST_FAST, resources=("services",)),
+    Tweak("disable_location_tracking", "Disable Location Tracking",
+          operations=(
+              reg_sz("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\CapabilityAccessManager\ConsentStore\location", "Value", "Deny"),
+          )),
+    Tweak("disable_storage_sense", "Disable Storage Sense",
+          operations=(
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\StorageSense", "AllowStorageSenseGlobal", 0),
+          )),
+    Tweak("disable_wifi_sense", "Disable Wifi-Sense",
+          operations=(
+              reg_dword("HKLM", r"SOFTWARE\Microsoft\WcmSvc\wifinetworkmanager\config", "AutoConnectAllowedOEM", 0),
+          )),
+    Tweak("enable_end_task", "Enable End Task With Right Click",
+          operations=(
+              reg_dword("HKCU", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Explorer\Advanced\TaskbarDeveloperSettings", "TaskbarEndTask", 1),
+          )),
+    Tweak("run_disk_cleanup", "Run Disk Cleanup",
+          handler="run_disk_cleanup",
+          cost=COST_SLOW, reversible=False, depends=("delete_temp_files",), resources=("temp",)),
+    Tweak("set_powershell7_default", "Change Windows Terminal default: PowerShell 5 -> PowerShell 7",
+          handler="set_powershell7_default"),
+    Tweak("disable_powershell7_telemetry", "Disable Powershell 7 Telemetry",
+          handler="disable_powershell7_telemetry"),
+    Tweak("disable_recall", "Disable Recall",
+          handler="disable_recall",
+          cost=COST_SLOW, reversible=False, resources=("dism",)),
+    Tweak("set_hibernation_default", "Set Hibernation as default (good for laptops)",
+          handler="set_hibernation_default",
+          cost=COST_FAST, resources=("powercfg",), conflicts=("disable_hibernation",)),
+    Tweak("set_services_manual", "Set Services to Manual",
+          handler="set_services_manual",
+          cost=COST_FAST, resources=("services",)),
+    Tweak("debloat_brave", "Debloat Brave",
+          handler="debloat_brave"),
+    Tweak("debloat_edge", "Debloat Edge",
+          handler="debloat_edge"),
+    Tweak("disable_windows_setting_sync", "Disable Windows Setting Sync",
+          operations=(
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\SettingSync", "DisableWindowsSettingSync", 2),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\SettingSync", "DisableWindowsSettingSyncUserOverride", 1),
+              reg_dword("HKCU", r"SOFTWARE\Microsoft\Windows\CurrentVersion\SettingSync", "SyncPolicy", 5),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\SettingSync", "DisableSettingSync", 2),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\SettingSync", "DisableSettingSyncUserOverride", 1),
+          )),
+    Tweak("disable_handwriting_data_collection", "Disable Handwriting Data Collection",
+          operations=(
+              reg_dword("HKCU", r"Software\Policies\Microsoft\InputPersonalization", "RestrictImplicitInkCollection", 1),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\InputPersonalization", "RestrictImplicitInkCollection", 1),
+              reg_dword("HKCU", r"Software\Policies\Microsoft\InputPersonalization", "RestrictImplicitTextCollection", 1),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\InputPersonalization", "RestrictImplicitTextCollection", 1),
+              reg_dword("HKCU", r"Software\Policies\Microsoft\Windows\HandwritingErrorReports", "PreventHandwritingErrorReports", 1),
+              reg_dword("HKLM", r"Software\Policies\Microsoft\Windows\HandwritingErrorReports", "PreventHandwritingErrorReports", 1),
+              reg_dword("HKCU", r"Software\Policies\Microsoft\Windows\TabletPC", "PreventHandwritingDataSharing", 1),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\TabletPC", "PreventHandwritingDataSharing", 1),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\InputPersonalization", "AllowInputPersonalization", 0),
+              reg_dword("HKCU", r"SOFTWARE\Microsoft\InputPersonalization\TrainedDataStore", "HarvestContacts", 0),
+          )),
+    Tweak("disable_clipboard_data_collection", "Disable Clipboard Data Collection",
+          operations=(
+              reg_sz("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\CapabilityAccessManager\ConsentStore\clipboard", "Value", "Deny"),
+          )),
+    Tweak("opt_out_privacy_consent", "Opt out of Privacy Consent",
+          operations=(
+              reg_dword("HKCU", r"SOFTWARE\Microsoft\Personalization\Settings", "AcceptedPrivacyPolicy", 0),
+          )),
+    Tweak("disable_3rd_party_telemetry", "Disable 3rd-party apps Telemetry (Adobe/NVIDIA/VS)",
+          operations=(
+              reg_dword("HKLM", r"SOFTWARE\Policies\Adobe\Acrobat Reader\DC\FeatureLockDown", "bUsageMeasurement", 0),
+              reg_dword("HKLM", r"SOFTWARE\NVIDIA Corporation\Global\FTS", "EnableRID44231", 0),
+              reg_dword("HKLM", r"SOFTWARE\NVIDIA Corporation\Global\FTS", "EnableRID64640", 0),
+              reg_dword("HKLM", r"SOFTWARE\NVIDIA Corporation\Global\FTS", "EnableRID66610", 0),
+              reg_dword("HKLM", r"SYSTEM\CurrentControlSet\Services\nvlddmkm\Global\Startup", "SendTelemetryData", 0),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\VisualStudio\IntelliCode", "DisableRemoteAnalysis", 1),
+              reg_dword("HKCU", r"SOFTWARE\Microsoft\VSCommon\16.0\IntelliCode", "DisableRemoteAnalysis", 1),
+              reg_dword("HKCU", r"SOFTWARE\Microsoft\VSCommon\17.0\IntelliCode", "DisableRemoteAnalysis", 1),
+              reg_dword("HKCU", r"Software\Microsoft\VisualStudio\Telemetry", "TurnOffSwitch", 1),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\VisualStudio\Feedback", "DisableFeedbackDialog", 1),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\VisualStudio\Feedback", "DisableEmailInput", 1),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\VisualStudio\Feedback", "DisableScreenshotCapture", 1),
+          ),
+          handler="disable_nvidia_telemetry_tasks",
+          cost=COST_FAST, resources=("scheduled_tasks",)),
+    Tweak("disable_lockscreen_camera", "Disable Lockscreen Camera Access",
+          operations=(
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\Personalization", "NoLockScreenCamera", 1),
+          )),
+    Tweak("disable_biometrics", "Disable Biometrics",
+          operations=(
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Biometrics", "Enabled", 0),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Biometrics\Credential Provider", "Enabled", 0),
+          )),
+    Tweak("disable_cortana_bing_search", "Disable Cortana & Bing Search",
+          operations=(
+              reg_dword("HKCU", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Search", "DisableSearchBoxSuggestions", 1),
+              reg_dword("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Search", "CortanaInAmbientMode", 0),
+              reg_dword("HKCU", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Search", "BingSearchEnabled", 0),
+              reg_dword("HKCU", r"Software\Microsoft\Windows\CurrentVersion\Explorer\Advanced", "ShowCortanaButton", 0),
+              reg_dword("HKCU", r"Software\Microsoft\Windows\CurrentVersion\Search", "CanCortanaBeEnabled", 0),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\Windows Search", "ConnectedSearchUseWebOverMeteredConnections", 0),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\Windows Search", "AllowCortanaAboveLock", 0),
+              reg_dword("HKCU", r"Software\Microsoft\Windows\CurrentVersion\SearchSettings", "IsDynamicSearchBoxEnabled", 0),
+              reg_dword("HKLM", r"SOFTWARE\Microsoft\PolicyManager\default\Experience\AllowCortana", "value", 0),
+              reg_dword("HKCU", r"Software\Microsoft\Windows\CurrentVersion\Search", "CortanaEnabled", 0),
+              reg_dword("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Search", "CortanaEnabled", 0),
+              reg_dword("HKCU", r"SOFTWARE\Microsoft\Windows\CurrentVersion\SearchSettings", "IsMSACloudSearchEnabled", 0),
+              reg_dword("HKCU", r"SOFTWARE\Microsoft\Windows\CurrentVersion\SearchSettings", "IsAADCloudSearchEnabled", 0),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\Windows Search", "AllowCloudSearch", 0),
+          )),
+    Tweak("disable_feedback_notifications", "Disable Feedback Notifications",
+          operations=(
+              reg_dword("HKCU", r"SOFTWARE\Microsoft\Siuf\Rules", "NumberOfSIUFInPeriod", 0),
+              reg_delete("HKCU", r"SOFTWARE\Microsoft\Siuf\Rules", "PeriodInNanoSeconds"),
+              reg_dword("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Policies\DataCollection", "DoNotShowFeedbackNotifications", 1),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\DataCollection", "DoNotShowFeedbackNotifications", 1),
+          )),
+    Tweak("disable_verbose_logon", "Disable Verbose Logon",
+          operations=(
+              reg_dword("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Policies\System", "verbosestatus", 1),
+          )),
+    Tweak("disable_sticky_keys", "Disable Sticky Keys",
+          operations=(
+              reg_sz("HKCU", r"Control Panel\Accessibility\StickyKeys", "Flags", "58"),
+          )),
+    Tweak("disable_numlock_startup", "Disable Numlock on startup",
+          operations=(
+              reg_sz("HKCU", r"Control Panel\Keyboard", "InitialKeyboardIndicators", "0"),
+          )),
+    Tweak("disable_snap_flyout", "Disable Snap Flyout",
+          operations=(
+              reg_dword("HKCU", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Explorer\Advanced", "EnableSnapAssistFlyout", 0),
+          )),
+    Tweak("set_classic_right_click", "Set Classic Right Click Menu",
+          operations=(
+              reg_sz("HKCU", r"Software\Classes\CLSID\{86ca1aa0-34aa-4e8b-a509-50c905bae2a2}\InprocServer32", "", ""),
+          )),
+    Tweak("show_file_extensions", "Show File Extensions",
+          operations=(
+              reg_dword("HKCU", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Explorer\Advanced", "HideFileExt", 0),
+          )),
+    Tweak("disable_mouse_acceleration", "Disable Mouse Acceleration",
+          operations=(
+              reg_sz("HKCU", r"Control Panel\Mouse", "MouseSpeed", "0"),
+              reg_sz("HKCU", r"Control Panel\Mouse", "MouseThreshold1", "0"),
+              reg_sz("HKCU", r"Control Panel\Mouse", "MouseThreshold2", "0"),
+          )),
+    Tweak("disable_fullscreen_optimizations", "Disable Fullscreen Optimizations",
+          operations=(
+              reg_dword("HKCU", r"System\GameConfigStore", "GameDVR_DXGIHonorFSEWindowsCompatible", 1),
+              reg_dword("HKCU", r"System\GameConfigStore", "GameDVR_Enabled", 0),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\GameDVR", "AllowGameDVR", 0),
+          )),
+    Tweak("disable_copilot", "Disable Copilot",
+          operations=(
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\WindowsCopilot", "TurnOffWindowsCopilot", 1),
+              reg_dword("HKCU", r"Software\Policies\Microsoft\Windows\WindowsCopilot", "TurnOffWindowsCopilot", 1),
+              reg_dword("HKCU", r"Software\Microsoft\Windows\CurrentVersion\Notifications\Settings", "AutoOpenCopilotLargeScreens", 0),
+              reg_dword("HKCU", r"Software\Microsoft\Windows\CurrentVersion\Explorer\Advanced", "ShowCopilotButton", 0),
+          )),
+    Tweak("disable_intellicode_remote_analysis", "Disable IntelliCode Remote Analysis",
+          handler="disable_intellicode_remote_analysis"),
+    Tweak("disable_media_player_telemetry", "Disable Media Player Telemetry",
+          operations=(
+              reg_dword("HKCU", r"SOFTWARE\Microsoft\MediaPlayer\Preferences", "UsageTracking", 0),
+          )),
+    Tweak("disable_system_file_access_consent", "Disable System File Access Consent",
+          operations=(
+              reg_sz("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\CapabilityAccessManager\ConsentStore\documentsLibrary", "Value", "Deny"),
+              reg_sz("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\CapabilityAccessManager\ConsentStore\picturesLibrary", "Value", "Deny"),
+              reg_sz("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\CapabilityAccessManager\ConsentStore\videosLibrary", "Value", "Deny"),
+              reg_sz("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\CapabilityAccessManager\ConsentStore\broadFileSystemAccess", "Value", "Deny"),
+          )),
+    Tweak("disable_account_info_access_consent", "Disable Account Info Access Consent",
+          operations=(
+              reg_sz("HKLM", r"SOFTWARE\Microsoft\Windows\CurrentVersion\CapabilityAccessManager\ConsentStore\userAccountInformation", "Value", "Deny"),
+          )),
+    Tweak("disable_language_sync", "Disable Language Sync",
+          operations=(
+              reg_dword("HKCU", r"SOFTWARE\Microsoft\Windows\CurrentVersion\SettingSync\Groups\Language", "Enabled", 0),
+          )),
+    Tweak("disable_credentials_sync", "Disable Credentials Sync",
+          operations=(
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\SettingSync", "DisableCredentialsSettingSync", 2),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\SettingSync", "DisableCredentialsSettingSyncUserOverride", 1),
+              reg_dword("HKCU", r"SOFTWARE\Microsoft\Windows\CurrentVersion\SettingSync\Groups\Credentials", "Enabled", 0),
+          )),
+    Tweak("disable_desktop_theme_sync", "Disable Desktop Theme Sync",
+          operations=(
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\SettingSync", "DisableDesktopThemeSettingSync", 2),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\SettingSync", "DisableDesktopThemeSettingSyncUserOverride", 1),
+          )),
+    Tweak("disable_personalization_sync", "Disable Personalization Sync",
+          operations=(
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\SettingSync", "DisablePersonalizationSettingSync", 2),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\SettingSync", "DisablePersonalizationSettingSyncUserOverride", 1),
+          )),
+    Tweak("disable_start_layout_sync", "Disable Start Layout Sync",
+          operations=(
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\SettingSync", "DisableStartLayoutSettingSync", 2),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\SettingSync", "DisableStartLayoutSettingSyncUserOverride", 1),
+          )),
+    Tweak("disable_application_sync", "Disable Application Sync",
+          operations=(
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\SettingSync", "DisableApplicationSettingSync", 2),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\SettingSync", "DisableApplicationSettingSyncUserOverride", 1),
+          )),
+    Tweak("disable_app_sync_setting_sync", "Disable App Sync Setting Sync",
+          operations=(
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\SettingSync", "DisableAppSyncSettingSync", 2),
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\SettingSync", "DisableAppSyncSettingSyncUserOverride", 1),
+          )),
+    Tweak("disable_sync_on_paid_network", "Disable Sync on Paid Network",
+          operations=(
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\SettingSync", "DisableSyncOnPaidNetwork", 1),
+          )),
+    Tweak("adobe_network_block", "Block Adobe Network",
+          operations=(
+              reg_dword("HKLM", r"SOFTWARE\Policies\Adobe\Acrobat Reader\DC\FeatureLockDown\cCloud", "bAdobeSendPluginToggle", 1),
+          )),
+    Tweak("remove_edge", "Remove Edge",
+          handler="remove_edge",
+          cost=COST_SLOW, reversible=False, resources=("winget",)),
+    Tweak("remove_microsoft_apps", "Remove Microsoft Apps",
+          handler="remove_microsoft_apps",
+          cost=COST_SLOW, reversible=False, resources=("appx", "powershell")),
+    Tweak("install_chrome", "Install Chrome",
+          handler="install_software", args=("Google Chrome", "Google.Chrome"),
+          cost=COST_SLOW, reversible=False, resources=("winget",)),
+    Tweak("install_firefox", "Install Firefox",
+          handler="install_software", args=("Mozilla Firefox", "Mozilla.Firefox"),
+          cost=COST_SLOW, reversible=False, resources=("winget",)),
+    Tweak("disable_background_apps", "Disable Background Apps",
+          operations=(
+              reg_dword("HKLM", r"SOFTWARE\Policies\Microsoft\Windows\AppPrivacy", "LetAppsRunInBackground", 2),
+          )),
+    Tweak("disable_intel_mm", "Disable Intel MM",
+          handler="disable_intel_mm"),
+    Tweak("set_display_performance", "Set Display for Performance",
+          operations=(
+              reg_dword("HKCU", r"Control Panel\Desktop", "VisualFXSetting", 2),
+          )),
+    Tweak("hide_search_button", "Hide Search Button",
+          operations=(
+              reg_dword("HKCU", r"Software\Microsoft\Windows\CurrentVersion\Search", "SearchboxTaskbarMode", 0),
+          )),
+    Tweak("hide_task_view_button", "Hide Task View Button",
+          operations=(
+              reg_dword("HKCU", r"Software\Microsoft\Windows\CurrentVersion\Explorer\Advanced", "ShowTaskViewButton", 0),
+          )),
+    Tweak("enable_snap_window", "Enable Snap Window",
+          operations=(
+              reg_dword("HKCU", r"Software\Microsoft\Windows\CurrentVersion\Explorer\Advanced", "EnableSnapBar", 1),
+          )),
+    Tweak("enable_snap_assist_flyout", "Enable Snap Assist Flyout",
+          operations=(
+              reg_dword("HKCU", r"Software\Microsoft\Windows\CurrentVersion\Explorer\Advanced", "EnableSnapAssistFlyout", 1),
+          )),
+    Tweak("enable_snap_assist_suggestion", "Enable Snap Assist Suggestion",
+          operations=(
+              reg_dword("HKCU", r"Software\Microsoft\Windows\CurrentVersion\Explorer\Advanced", "EnableSnapAssistSuggestion", 1),
+          )),
+    Tweak("enable_mouse_acceleration", "Enable Mouse Acceleration",
+          operations=(
+              reg_sz("HKCU", r"Control Panel\Mouse", "MouseSpeed", "1"),
+              reg_sz("HKCU", r"Control Panel\Mouse", "MouseThreshold1", "6"),
+              reg_sz("HKCU", r"Control Panel\Mouse", "MouseThreshold2", "10"),
+          )),
+    Tweak("enable_sticky_keys", "Enable Sticky Keys",
+          operations=(
+              reg_sz("HKCU", r"Control Panel\Accessibility\StickyKeys", "Flags", "506"),
+          )),
+    Tweak("show_hidden_files", "Show Hidden Files",
+          operations=(
+              reg_dword("HKCU", r"SOFTWARE\Microsoft\Windows\CurrentVersion\Explorer\Advanced", "Hidden", 1),
+          )),
+    Tweak("enable_s3_sleep", "Enable S3 Sleep",
+          handler="enable_s3_sleep",
+          cost=COST_FAST, resources=("powercfg",)),
+]
+
+# Appx packages removed by the "Remove Microsoft Apps" tweak
+MICROSOFT_APPS_TO_REMOVE = [
+    "MicrosoftCorporationII.MicrosoftFamily",
+    "Microsoft.OutlookForWindows",
+    "Clipchamp.Clipchamp",
+    "Microsoft.3DBuilder",
+    "Microsoft.Microsoft3DViewer",
+    "Microsoft.BingWeather",
+    "Microsoft.BingSports",
+    "Microsoft.BingFinance",
+    "Microsoft.MicrosoftOfficeHub",
+    "Microsoft.BingNews",
+    "Microsoft.Office.OneNote",
+    "Microsoft.Office.Sway",
+    "Microsoft.WindowsPhone",
+    "Microsoft.CommsPhone",
+    "Microsoft.YourPhone",
+    "Microsoft.Getstarted",
+    "Microsoft.549981C3F5F10", # Cortana
+    "Microsoft.Messaging",
+    "Microsoft.WindowsSoundRecorder",
+    "Microsoft.MixedReality.Portal",
+    "Microsoft.WindowsFeedbackHub",
+    "Microsoft.WindowsAlarms",
+    "Microsoft.WindowsCamera",
+    "Microsoft.MSPaint",
+    "Microsoft.WindowsMaps",
+    "Microsoft.MinecraftUWP",
+    "Microsoft.People",
+    "Microsoft.Wallet",
+    "Microsoft.Print3D",
+    # --- More from comenzi.txt ---
+    "king.com.CandyCrushSodaSaga",
+    "ShazamEntertainmentLtd.Shazam",
+    "Flipboard.Flipboard",
+    "9E2F88E3.Twitter", # Old Twitter package
+    "ClearChannelRadioDigital.iHeartRadio",
+    "D5EA27B7.Duolingo-LearnLanguagesforFree",
+    "AdobeSystemsIncorporated.AdobePhotoshopExpress",
+    "PandoraMediaInc.29680B314EFC2",
+    "46928bounde.EclipseManager",
+    "ActiproSoftwareLLC.562882FEEB491",
+    "SpotifyAB.Spotify", # If removing Spotify app
+    # --- Media Extensions ---
+    "Microsoft.WebpImageExtension",
+    "Microsoft.HEVCVideoExtension",
+    "Microsoft.RawImageExtension",
+    "Microsoft.WebMediaExtensions"
+]
+
+# Services set to Manual (demand start) by the "Set Services to Manual" tweak
+MANUAL_SERVICES = [
+    "diagnosticshub.standardcollector.service", # Microsoft (R) Diagnostics Hub Standard Collector Service
+    "dmwappushservice", # WAP Push Message Routing Service
+    "lfsvc", # Geolocation Service
+    "MapsBroker", # Downloaded Maps Manager
+    "NetTcpPortSharing", # Net.Tcp Port Sharing Service
+    "RemoteAccess", # Routing and Remote Access
+    "RemoteRegistry", # Remote Registry
+    "SharedAccess", # Internet Connection Sharing (ICS)
+    "TrkWks", # Distributed Link Tracking Client
+    "WbioSrvc", # Windows Biometric Service
+    "WlanSvc", # WLAN AutoConfig (if not needed)
+    "WMPNetworkSvc", # Windows Media Player Network Sharing Service
+    "XblAuthManager", # Xbox Live Auth Manager
+    "XblGameSave", # Xbox Live Game Save Service
+    "XboxNetApiSvc", # Xbox Live Networking Service
+]
+
+# Services disabled by the "Disable Homegroup" tweak (gone since Windows 10 1803, skipped where missing)
+HOMEGROUP_SERVICES = ["HomeGroupListener", "HomeGroupProvider"]
+
+# Scheduled tasks disabled by the "Disable 3rd-party apps Telemetry (NVIDIA)" tweak.
+# Exact task names or glob patterns, matched against the full task path and the bare name.
+NVIDIA_TELEMETRY_TASKS = [
+    "NvTmMon_*", # NvTmMon_{B2FE1952-0186-46C3-BAEC-A80AA35AC5B8}, suffix varies by driver
+    "NvTmRep_*",
+    "NvTmRepOnLogon_*",
+]
+
+# --- Section 4 software (installed through winget) ---
+SOFTWARE_CATEGORIES = {
+    "Browsers": [
+        ("Google Chrome", "Google.Chrome"),
+        ("Mozilla Firefox", "Mozilla.Firefox"),
+        ("Brave Browser", "Brave.Brave")
+    ],
+    "Development": [
+        ("Git", "Git.Git"),
+        ("Node.js LTS", "OpenJS.NodeJS.LTS"),
+        ("Python 3", "Python.Python.3"),
+        ("Visual Studio Code", "Microsoft.VisualStudioCode")
+    ],
+    "Documents": [
+        ("Adobe Acrobat Reader", "Adobe.Acrobat.Reader.64-bit"),
+        ("LibreOffice", "TheDocumentFoundation.LibreOffice"),
+        ("Notepad++", "Notepad++.Notepad++"),
+        ("OnlyOffice", "ONLYOFFICE.DesktopEditors")
+    ],
+    "Multimedia": [
+        ("GIMP (Image Editor)", "GIMP.GIMP"),
+        ("OBS Studio", "OBSProject.OBSStudio"),
+        ("Paint.NET", "dotPDN.PaintDotNet"),
+        ("VLC (Video Player)", "VideoLAN.VLC")
+    ],
+    "Utilities": [
+        ("7-Zip", "7zip.7zip"),
+        ("AnyDesk", "AnyDeskSoftwareGmbH.AnyDesk"),
+        ("Bitwarden", "Bitwarden.Bitwarden"),
+        ("Malwarebytes", "Malwarebytes.Malwarebytes"),
+        ("TeamViewer", "TeamViewer.TeamViewer"),
+        ("qBittorrent", "qBittorrent.qBittorrent")
+    ]
+}
+
+for _category, _apps in SOFTWARE_CATEGORIES.items():
+    for _name, _package_id in _apps:
+        TWEAK_CATALOG.append(Tweak(f"winget:{_package_id}", _name, handler="install_software",
+                                   args=(_name, _package_id), cost=COST_SLOW, reversible=False,
+                                   category=_category, resources=("winget",)))
+
+TWEAKS = {tweak.id: tweak for tweak in TWEAK_CATALOG}
+
+# --- Section layout (order of the checkboxes on each page) ---
+SECTIONS = [
+    {
+        "title": "Essential Tweaks",
+        "tweaks": [
+            "create_restore_point",
+            "delete_temp_files",
+            "disable_consumer_features",
+            "disable_telemetry",
+            "disable_activity_history",
+            "disable_folder_discovery",
+            "disable_gamedvr",
+            "disable_hibernation",
+            "disable_homegroup",
+            "disable_location_tracking",
+            "disable_storage_sense",
+            "disable_wifi_sense",
+            "enable_end_task",
+            "run_disk_cleanup",
+            "set_powershell7_default",
+            "disable_powershell7_telemetry",
+            "disable_recall",
+            "set_hibernation_default",
+            "set_services_manual",
+            "debloat_brave",
+            "debloat_edge",
+            "disable_windows_setting_sync",
+            "disable_handwriting_data_collection",
+            "disable_clipboard_data_collection",
+            "opt_out_privacy_consent",
+            "disable_3rd_party_telemetry",
+            "disable_lockscreen_camera",
+            "disable_biometrics",
+            "disable_cortana_bing_search",
+            "disable_feedback_notifications",
+            "disable_verbose_logon",
+            "disable_sticky_keys",
+            "disable_numlock_startup",
+            "disable_snap_flyout",
+            "set_classic_right_click",
+            "show_file_extensions",
+            "disable_mouse_acceleration",
+            "disable_fullscreen_optimizations",
+            "disable_copilot",
+            "disable_intellicode_remote_analysis",
+            "disable_media_player_telemetry",
+            "disable_system_file_access_consent",
+            "disable_account_info_access_consent",
+            "disable_language_sync",
+            "disable_credentials_sync",
+            "disable_desktop_theme_sync",
+            "disable_personalization_sync",
+            "disable_start_layout_sync",
+            "disable_application_sync",
+            "disable_app_sync_setting_sync",
+            "disable_sync_on_paid_network",
+        ],
+    },
+    {
+        "title": "Advanced Tweaks",
+        "tweaks": [
+            "adobe_network_block",
+            "remove_edge",
+            "debloat_edge",
+            "remove_microsoft_apps",
+            "install_chrome",
+            "install_firefox",
+        ],
+    },
+    {
+        "title": "Customize Preferences",
+        "tweaks": [
+            "disable_background_apps",
+            "disable_fullscreen_optimizations",
+            "disable_copilot",
+            "disable_intel_mm",
+            "set_display_performance",
+            "set_classic_right_click",
+            "enable_end_task",
+            "hide_search_button",
+            "hide_task_view_button",
+            "enable_snap_window",
+            "enable_snap_assist_flyout",
+            "enable_snap_assist_suggestion",
+            "enable_mouse_acceleration",
+            "enable_sticky_keys",
+            "show_hidden_files",
+            "show_file_extensions",
+            "enable_s3_sleep",
+        ],
+    },
+    {
+        "title": "Install Software",
+        "tweaks": [tweak.id for tweak in TWEAK_CATALOG if tweak.category],
+        "output_label": "Installation Output:",
+        "execute_text": "Install Selected",
+    },
+]
+
+# --- Rollback Journal ---
+# Before a mutation is made, its prior value is appended to a per-run JSONL file.
+# Reverting a run replays the journal backwards as one batch, which is much faster
+# than a System Restore checkpoint and is not throttled by Windows.
+class RunJournal:
+    """Append-only journal of prior values for one run (one JSON object per line)."""
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.file = None
+        self.count = 0
+
+    @classmethod
+    def for_new_run(cls, run_id=None, directory=RUNS_DIR):
+        run_id = run_id or datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        return cls(os.path.join(directory, f"{run_id}.journal.jsonl"))
+
+    @staticmethod
+    def registry_entry(op, prior):
+        """Entry for a registry value; prior is (type, data) or None if the value did not exist."""
+        if prior is not None:
+            value_type, data = prior
+            if isinstance(data, bytes):
+                data = data.hex()
+            prior = [value_type, data]
+        return {"kind": "registry", "target": [op.hive, op.key, op.name], "prior": prior}
+
+    def record(self, kind, target, prior):
+        self.record_many([{"kind": kind, "target": target, "prior": prior}])
+
+    def record_many(self, entries):
+        lines = "".join(json.dumps(entry) + "\n" for entry in entries)
+        if not lines:
+            return
+        with self.lock:
+            if self.file is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self.file = open(self.path, "a", encoding="utf-8")
+            self.file.write(lines)
+            self.file.flush() # The journal must survive a crash mid-run
+            self.count += lines.count("\n")
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+    @staticmethod
+    def load(path):
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    @staticmethod
+    def original_states(entries):
+        """Reduce journal entries to the state each target had before the run.
+
+        Replaying the journal in reverse leaves every target at its first recorded
+        prior value, so only that entry is kept. Order is the reverse of recording.
+        """
+        originals = {}
+        for entry in entries:
+            target = entry["target"]
+            identity = (entry["kind"],) + (registry_key_id(*target[:2]) + (target[2].lower(),) if entry["kind"] == "registry" else (target.lower(),))
+            originals.setdefault(identity, entry)
+        return list(reversed(list(originals.values())))
+
+def registry_restore_op(entry):
+    """The RegistryOp that restores a journaled registry value."""
+    hive, key, name = entry["target"]
+    if entry["prior"] is None:
+        return reg_delete(hive, key, name)
+    value_type, data = entry["prior"]
+    if value_type == REG_BINARY:
+        data = bytes.fromhex(data)
+    return RegistryOp(hive, key, name, value_type, data)
+
+# --- Run Event Log ---
+# Each run writes one structured record: typed events (run, tweak, operation, log)
+# with timestamps, durations and outcomes, appended once to a JSON Lines file and
+# fanned out live to sinks such as an output pane. Nothing is kept in memory.
+class RunLog:
+    """Structured event stream of one run. Also usable as the engine's logger (info/warning/error)."""
+    def __init__(self, run_id=None, directory=RUNS_DIR, sinks=()):
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        self.path = os.path.join(directory, f"{self.run_id}.events.jsonl") if directory else None
+        self.sinks = list(sinks)
+        self.lock = threading.Lock()
+        self.file = None
+        self.seq = 0
+
+    def emit(self, event_type, **fields):
+        event = {"run": self.run_id, "seq": 0, "ts": round(time.time(), 6), "type": event_type,
+                 "thread": threading.current_thread().name}
+        event.update(fields)
+        with self.lock:
+            self.seq += 1
+            event["seq"] = self.seq
+            if self.path:
+                if self.file is None:
+                    os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                    self.file = open(self.path, "a", encoding="utf-8")
+                self.file.write(json.dumps(event, default=str) + "\n")
+        for sink in self.sinks:
+            sink(event)
+
+    def log(self, level, message):
+        self.emit("log", level=level, message=message)
+
+    def info(self, message):
+        self.log("INFO", message)
+
+    def warning(self, message):
+        self.log("WARNING", message)
+
+    def error(self, message):
+        self.log("ERROR", message)
+
+    def flush(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.flush()
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+def record_event(logger, event_type, **fields):
+    """Emit a structured event if logger is a RunLog; plain loggers ignore it."""
+    emit = getattr(logger, "emit", None)
+    if emit is not None:
+        emit(event_type, **fields)
+
+def format_log_event(event):
+    return f"[{datetime.fromtimestamp(event['ts']):%H:%M:%S}] {event['level']}: {event['message']}"
+
+def pane_sink(events):
+    """Sink that forwards log and output progress events to a section through an EventChannel."""
+    def sink(event):
+        if event["type"] == "log":
+            events.publish(EVENT_LOG, line=format_log_event(event), level=event["level"])
+        elif event["type"] == "output_progress":
+            events.publish(EVENT_SUBPROGRESS, item=event["item"], percent=event["percent"], detail=event["detail"])
+    return sink
+
+def stream_sink(stream, min_level="INFO"):
+    """Sink that prints log events at or above min_level (headless front-end)."""
+    threshold = logging.getLevelName(min_level)
+    def sink(event):
+        if event["type"] == "log" and logging.getLevelName(event["level"]) >= threshold:
+            stream.write(f"{format_log_event(event)}\n") # One write per line: worker threads print concurrently
+            stream.flush()
+    return sink
+
+def file_log_sink(event):
+    """Sink for the application log: only run boundaries and errors, the details live in the JSONL."""
+    if event["type"] == "run_started":
+        logging.info(f"Run {event['run']} started: {event['tweaks']} tweak(s)")
+    elif event["type"] == "run_finished":
+        logging.info(f"Run {event['run']} finished in {event['duration']:.2f}s: {event['summary']}")
+    elif event["type"] == "log" and event["level"] == "ERROR":
+        logging.error(f"Run {event['run']}: {event['message']}")
+
+# --- Run Metrics ---
+# Aggregates the events of a run into latency histograms (per tweak and per
+# operation kind) plus process and output-byte counts. Plugged into a RunLog as a
+# sink; exported as JSON and as a Prometheus textfile (node_exporter format).
+METRIC_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+METRIC_PREFIX = "win11optimizator"
+
+class Histogram:
+    """Cumulative-bucket latency histogram, in seconds."""
+    def __init__(self, buckets=METRIC_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1) # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        index = next((i for i, bound in enumerate(self.buckets) if seconds <= bound), len(self.buckets))
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def cumulative(self):
+        return list(zip(self.buckets + (float("inf"),), itertools.accumulate(self.counts)))
+
+    def to_dict(self):
+        return {"count": self.count, "sum": round(self.sum, 6), "max": round(self.max, 6),
+                "buckets": {("+Inf" if bound == float("inf") else str(bound)): total for bound, total in self.cumulative()}}
+
+class RunMetrics:
+    """Sink collecting the timing of one run. Operations are attributed to the tweak
+    running on the emitting thread; batched registry writes shared by several tweaks
+    only count toward the run totals."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.run_id = None
+        self.duration = None
+        self.tweaks = {} # tweak id -> {"label", "outcome", "duration", "operations", "processes", "output_bytes"}
+        self.tweak_latency = Histogram()
+        self.operation_latency = {} # operation kind -> Histogram
+        self.operation_outcomes = {} # (kind, outcome) -> count
+        self.processes = 0
+        self.output_bytes = 0
+        self.active = {} # thread ident -> ids of the tweaks started and not finished on it
+
+    def __call__(self, event):
+        with self.lock:
+            handler = getattr(self, f"_on_{event['type']}", None)
+            if handler is not None:
+                handler(event)
+
+    def _on_run_started(self, event):
+        self.run_id = event["run"]
+
+    def _on_run_finished(self, event):
+        self.duration = event["duration"]
+
+    def _on_tweak_started(self, event):
+        self.tweaks[event["tweak"]] = {"label": event["label"], "outcome": None, "duration": None,
+                                       "operations": 0, "processes": 0, "output_bytes": 0}
+        self.active.setdefault(threading.get_ident(), set()).add(event["tweak"])
+
+    def _on_tweak_finished(self, event):
+        stats = self.tweaks.setdefault(event["tweak"], {"label": event["tweak"], "operations": 0, "processes": 0, "output_bytes": 0})
+        stats["outcome"] = event["outcome"]
+        stats["duration"] = event["duration"]
+        self.tweak_latency.observe(event["duration"])
+        self.active.get(threading.get_ident(), set()).discard(event["tweak"])
+
+    def _on_operation(self, event):
+        kind = event["kind"]
+        self.operation_latency.setdefault(kind, Histogram()).observe(event["duration"])
+        outcome_key = (kind, event["outcome"])
+        self.operation_outcomes[outcome_key] = self.operation_outcomes.get(outcome_key, 0) + 1
+        spawned = event.get("spawned", 0)
+        output_bytes = event.get("output_bytes", 0)
+        self.processes += spawned
+        self.output_bytes += output_bytes
+        active = self.active.get(threading.get_ident())
+        if active and len(active) == 1:
+            stats = self.tweaks[next(iter(active))]
+            stats["operations"] += 1
+            stats["processes"] += spawned
+            stats["output_bytes"] += output_bytes
+
+    def slowest(self, count=10):
+        """The finished tweaks with the longest durations, as (tweak id, stats) pairs."""
+        with self.lock:
+            finished = [(tweak_id, dict(stats)) for tweak_id, stats in self.tweaks.items() if stats["duration"] is not None]
+        return sorted(finished, key=lambda item: item[1]["duration"], reverse=True)[:count]
+
+    def summary(self):
+        with self.lock:
+            return {
+                "run": self.run_id,
+                "duration": self.duration,
+                "processes": self.processes,
+                "output_bytes": self.output_bytes,
+                "tweak_latency": self.tweak_latency.to_dict(),
+                "operation_latency": {kind: histogram.to_dict() for kind, histogram in sorted(self.operation_latency.items())},
+                "operation_outcomes": [{"kind": kind, "outcome": outcome, "count": count}
+                                       for (kind, outcome), count in sorted(self.operation_outcomes.items())],
+                "tweaks": {tweak_id: dict(stats) for tweak_id, stats in self.tweaks.items()},
+            }
 
-    def disable_mouse_acceleration(self, logger):
+    def prometheus(self):
+        """The run's metrics in the Prometheus text exposition format."""
+        def label_value(value):
+            return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        def histogram_lines(name, histogram, labels=""):
+            lines = []
+            for bound, total in histogram.cumulative():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{name}_bucket{{{labels}le="{le}"}} {total}')
+            suffix = f"{{{labels.rstrip(',')}}}" if labels else ""
+            lines.append(f"{name}_sum{suffix} {histogram.sum:.6f}")
+            lines.append(f"{name}_count{suffix} {histogram.count}")
+            return lines
+
+        p = METRIC_PREFIX
+        with self.lock:
+            lines = [f"# HELP {p}_run_duration_seconds Wall time of the last run.",
+                     f"# TYPE {p}_run_duration_seconds gauge",
+                     f"{p}_run_duration_seconds {self.duration or 0:.6f}",
+                     f"# HELP {p}_processes_spawned Processes started during the last run.",
+                     f"# TYPE {p}_processes_spawned gauge",
+                     f"{p}_processes_spawned {self.processes}",
+                     f"# HELP {p}_output_bytes Output captured from spawned processes during the last run.",
+                     f"# TYPE {p}_output_bytes gauge",
+                     f"{p}_output_bytes {self.output_bytes}",
+                     f"# HELP {p}_tweak_duration_seconds Tweak latency in the last run.",
+                     f"# TYPE {p}_tweak_duration_seconds histogram"]
+            lines += histogram_lines(f"{p}_tweak_duration_seconds", self.tweak_latency)
+            lines += [f"# HELP {p}_operation_duration_seconds Operation latency in the last run, by kind.",
+                      f"# TYPE {p}_operation_duration_seconds histogram"]
+            for kind, histogram in sorted(self.operation_latency.items()):
+                lines += histogram_lines(f"{p}_operation_duration_seconds", histogram, f'kind="{label_value(kind)}",')
+            lines += [f"# HELP {p}_operations Operations in the last run, by kind and outcome.",
+                      f"# TYPE {p}_operations gauge"]
+            for (kind, outcome), count in sorted(self.operation_outcomes.items()):
+                lines.append(f'{p}_operations{{kind="{label_value(kind)}",outcome="{label_value(outcome)}"}} {count}')
+            lines += [f"# HELP {p}_tweak_last_duration_seconds Duration of each tweak in the last run.",
+                      f"# TYPE {p}_tweak_last_duration_seconds gauge"]
+            for tweak_id, stats in sorted(self.tweaks.items()):
+                if stats["duration"] is not None:
+                    lines.append(f'{p}_tweak_last_duration_seconds{{tweak="{label_value(tweak_id)}",'
+                                 f'outcome="{label_value(stats["outcome"])}"}} {stats["duration"]:.6f}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory=RUNS_DIR, textfile=None):
+        """Write <run>.metrics.json and <run>.prom (plus textfile, if given). Returns the paths written.
+
+        Files are replaced atomically so a textfile collector never reads a partial file.
+        """
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, self.run_id or datetime.now().strftime("%Y%m%d-%H%M%S-%f"))
+        outputs = [(f"{base}.metrics.json", json.dumps(self.summary(), indent=2)),
+                   (f"{base}.prom", self.prometheus())]
+        if textfile:
+            outputs.append((textfile, outputs[1][1]))
+        for path, content in outputs:
+            temporary = f"{path}.tmp"
+            with open(temporary, "w", encoding="utf-8", newline="\n") as f:
+                f.write(content)
+            os.replace(temporary, path)
+        return [path for path, _ in outputs]
+
+def output_size(*streams):
+    """Bytes of captured process output (text streams are measured as UTF-8)."""
+    return sum(len(s.encode("utf-8", "replace") if isinstance(s, str) else s) for s in streams if s)
+
+# --- Run Trace ---
+# Timeline of a run in the Trace Event format (chrome://tracing, Perfetto): one
+# span per tweak with its registry, process and PowerShell operations nested
+# inside, one track per thread. Built from the run's event log after the fact.
+TRACE_NAME_LENGTH = 80
+
+def trace_events(events):
+    """Convert run events (dicts as written to <run>.events.jsonl) to a Trace Event document.
+
+    Tweaks whose registry values went out in the shared batch are drawn as one
+    "Registry batch" span, since their writes cannot be told apart.
+    """
+    events = list(events)
+    if not events:
+        return {"traceEvents": [], "displayTimeUnit": "ms"}
+    origin = min(event["ts"] - event.get("duration", 0) if event["type"] == "operation" else event["ts"] for event in events)
+    end = max(event["ts"] for event in events)
+    tids = {}
+    trace = []
+
+    def tid(event):
+        return tids.setdefault(event.get("thread", "main"), len(tids) + 1)
+
+    def micros(seconds):
+        return round((seconds - origin) * 1e6, 1)
+
+    def span(name, category, thread, start, stop, args):
+        trace.append({"name": name[:TRACE_NAME_LENGTH], "cat": category, "ph": "X", "pid": 1, "tid": thread,
+                      "ts": micros(start), "dur": round(max(stop - start, 0) * 1e6, 1), "args": args})
+
+    run_start = None
+    open_tweaks = {} # tweak id -> tweak_started event
+    batches = {} # tid -> {"start", "stop", "tweaks"}
+    for event in events:
+        kind = event["type"]
+        if kind == "run_started":
+            run_start = event
+        elif kind == "run_finished" and run_start is not None:
+            span(f"Run {event['run']}", "run", tid(run_start), run_start["ts"], event["ts"],
+                 {"summary": event.get("summary"), "tweaks": run_start.get("tweaks")})
+            run_start = None
+        elif kind == "tweak_started":
+            open_tweaks[event["tweak"]] = event
+        elif kind == "tweak_finished":
+            start = open_tweaks.pop(event["tweak"], None)
+            args = {"tweak": event["tweak"], "outcome": event["outcome"], "error": event.get("error")}
+            if start is None: # Never started: skipped because a dependency failed
+                trace.append({"name": event["tweak"], "cat": "tweak", "ph": "i", "s": "t", "pid": 1, "tid": tid(event),
+                              "ts": micros(event["ts"]), "args": args})
+            elif start.get("batched"):
+                batch = batches.setdefault(tid(start), {"start": start["ts"], "stop": event["ts"], "tweaks": {}})
+                batch["start"] = min(batch["start"], start["ts"])
+                batch["stop"] = max(batch["stop"], event["ts"])
+                batch["tweaks"][event["tweak"]] = event["outcome"]
+            else:
+                span(start["label"], "tweak", tid(start), start["ts"], event["ts"], args)
+        elif kind == "operation":
+            args = {key: value for key, value in event.items() if key not in ("run", "seq", "ts", "type", "thread", "duration")}
+            span(f"{event['kind']}: {event['target']}", f"operation,{event['kind']}", tid(event),
+                 event["ts"] - event["duration"], event["ts"], args)
+        elif kind == "log" and event["level"] in ("WARNING", "ERROR"):
+            trace.append({"name": event["message"][:TRACE_NAME_LENGTH], "cat": f"log,{event['level'].lower()}", "ph": "i",
+                          "s": "t", "pid": 1, "tid": tid(event), "ts": micros(event["ts"]), "args": {"message": event["message"]}})
+    for start in open_tweaks.values(): # Still running when the log ends (the run was interrupted)
+        span(start["label"], "tweak", tid(start), start["ts"], end, {"tweak": start["tweak"], "outcome": "unfinished"})
+    for thread, batch in batches.items():
+        span(f"Registry batch ({len(batch['tweaks'])} tweaks)", "tweak,batch", thread, batch["start"], batch["stop"],
+             {"tweaks": batch["tweaks"]})
+
+    run_id = events[0].get("run")
+    metadata = [{"name": "process_name", "ph": "M", "pid": 1, "args": {"name": f"{APP_NAME} run {run_id}"}}]
+    for name, thread in tids.items():
+        metadata.append({"name": "thread_name", "ph": "M", "pid": 1, "tid": thread, "args": {"name": name}})
+        metadata.append({"name": "thread_sort_index", "ph": "M", "pid": 1, "tid": thread, "args": {"sort_index": thread}})
+    return {"traceEvents": metadata + sorted(trace, key=lambda item: (item["ts"], -item.get("dur", 0))),
+            "displayTimeUnit": "ms", "otherData": {"run": run_id, "version": APP_VERSION}}
+
+def write_trace(events_path, trace_path=None):
+    """Write the trace of a run's event log; by default next to it as <run>.trace.json. Returns the path."""
+    if trace_path is None:
+        base = events_path[:-len(".events.jsonl")] if events_path.endswith(".events.jsonl") else events_path
+        trace_path = f"{base}.trace.json"
+    with open(events_path, "r", encoding="utf-8") as f:
+        document = trace_events(json.loads(line) for line in f if line.strip())
+    with open(trace_path, "w", encoding="utf-8") as f:
+        json.dump(document, f)
+    return trace_path
+
+# --- Profiling ---
+# Opt-in cProfile capture for slow machines, without a special build: set
+# W11O_PROFILE (or pass --profile) to "run", "startup" or "all". Each thread taking
+# part in a run gets its own profiler; the profiles are merged into one .pstats
+# file next to the log, and the top entries by cumulative time go to the run log.
+PROFILE_ENV = "W11O_PROFILE"
+PROFILE_TARGETS = ("run", "startup")
+PROFILE_TOP = 15
+
+def profile_targets(value):
+    """Parse a W11O_PROFILE/--profile value into a set of PROFILE_TARGETS."""
+    targets = set()
+    for item in (value or "").lower().replace(";", ",").split(","):
+        item = item.strip()
+        if item in ("all", "1", "true", "yes"):
+            targets.update(PROFILE_TARGETS)
+        elif item in PROFILE_TARGETS:
+            targets.add(item)
+        elif item and item not in ("0", "false", "no"):
+            logging.warning(f"Profiling: ignoring unknown target '{item}' (use {', '.join(PROFILE_TARGETS)} or all)")
+    return targets
+
+class RunProfiler:
+    """Collects cProfile data from every thread that calls profile(). name should be
+    timestamped (a run id, say); it names the .pstats file."""
+    def __init__(self, name):
+        self.name = name
+        self.profiles = []
+        self.lock = threading.Lock()
+
+    def profile(self, func, *args):
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
         try:
-            commands = [
-                'reg add "HKCU\\Control Panel\\Mouse" /v "MouseSpeed" /t REG_SZ /d "0" /f',
-                'reg add "HKCU\\Control Panel\\Mouse" /v "MouseThreshold1" /t REG_SZ /d "0" /f',
-                'reg add "HKCU\\Control Panel\\Mouse" /v "MouseThreshold2" /t REG_SZ /d "0" /f'
-            ]
-            for cmd in commands:
-                self.log_and_run_command(logger, cmd)
-            logger.info("Disable Mouse Acceleration: Applied registry changes.")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Disable Mouse Acceleration failed (Registry error): {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"Disable Mouse Acceleration failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def disable_fullscreen_optimizations(self, logger):
+            return func(*args)
+        finally:
+            profiler.disable()
+            with self.lock:
+                self.profiles.append(profiler)
+
+    def write(self, top=PROFILE_TOP):
+        """Dump the merged profile next to the log. Returns (path, summary lines)."""
+        import pstats
+        with self.lock:
+            profiles = list(self.profiles)
+        if not profiles:
+            return None, []
+        stats = pstats.Stats(profiles[0])
+        for profiler in profiles[1:]:
+            stats.add(profiler)
+        directory = os.path.dirname(os.path.abspath(LOG_FILENAME))
+        path = os.path.join(directory, f"win11optimizator_profile_{self.name}.pstats")
+        stats.dump_stats(path)
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+        summary = [f"{'cumulative':>10} {'own':>9} {'calls':>8}  function"]
+        for (filename, line, function), (_, calls, own, cumulative, _) in rows:
+            where = f"{os.path.basename(filename)}:{line}({function})" if line else function
+            summary.append(f"{cumulative:>9.3f}s {own:>8.3f}s {calls:>8}  {where}")
+        return path, summary
+
+def requested_profile(args=None):
+    """Profiling targets from --profile, falling back to the W11O_PROFILE environment variable."""
+    value = getattr(args, "profile", None)
+    return profile_targets(value if value is not None else os.environ.get(PROFILE_ENV))
+
+def log_profile(profiler, logger):
+    """Write a RunProfiler's data and log where it went with the top entries. Returns the path."""
+    path, summary = profiler.write()
+    if path:
+        logger.info(f"Profile: {path} (top {PROFILE_TOP} by cumulative time)")
+        for line in summary:
+            logger.info(f"Profile: {line}")
+    return path
+
+# --- Process Backend ---
+# Handlers start processes through a backend object, like registry writes, so the
+# engine can be driven by a simulated machine (benchmarks, Linux CI). Commands are
+# argv lists from the Command Builders below and start without a cmd.exe in between.
+# Every command has a timeout budget and can be cancelled; either way the command's
+# whole process tree is killed, so a hung DISM or winget cannot outlive the run.
+COMMAND_TIMEOUTS = {COST_INSTANT: 60, COST_FAST: 300, COST_SLOW: 1800} # Seconds per command, by the tweak's cost class
+DEFAULT_COMMAND_TIMEOUT = COMMAND_TIMEOUTS[COST_SLOW] # Commands run outside a tweak (revert, inventory)
+CANCEL_POLL_SECONDS = 0.1 # How often a waiting command checks for cancellation
+OUTPUT_TAIL_LINES = 200 # Lines of a streamed command's output kept for its result; the rest only reached the log
+OUTPUT_CHUNK_BYTES = 4096
+OUTPUT_SEGMENT_LIMIT = 4096 # Characters buffered before an unterminated line is passed on anyway
+OUTPUT_DRAIN_SECONDS = 5 # How long to wait for the pipe to close after the command exited
+OUTPUT_BREAKS = re.compile(r"\r\n|\r|\n") # winget and DISM redraw their progress bars with a bare \r
+
+class RunCancelled(Exception):
+    """The run was cancelled; raised by the command that was interrupted or for work never started."""
+
+def exit_code(returncode):
+    """A process exit status as the unsigned DWORD Windows reports (HRESULT-style codes such
+    as winget's 0x8A15002B), whatever sign the platform or a backend gave it."""
+    return returncode & 0xFFFFFFFF
+
+def tweak_timeout(tweak):
+    return tweak.timeout if tweak.timeout is not None else COMMAND_TIMEOUTS.get(tweak.cost, DEFAULT_COMMAND_TIMEOUT)
+
+def process_group_options():
+    """Popen options that make a child the root of its own process tree."""
+    if os.name == "nt":
+        return {}
+    return {"start_new_session": True} # The child leads a new process group that killpg reaches
+
+def kill_process_tree(process):
+    """Kill a Popen child and everything it started, even if the child itself already exited."""
+    try:
+        if os.name != "nt":
+            import signal
+            os.killpg(process.pid, signal.SIGKILL) # The group outlives its leader while grandchildren remain
+        elif process.poll() is None: # taskkill finds the tree through a live root only (and a dead one's PID may be reused)
+            subprocess.run(["taskkill", "/T", "/F", "/PID", str(process.pid)], capture_output=True,
+                           creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0))
+    except ProcessLookupError:
+        pass # No process of the group is left
+    except OSError:
+        pass
+    if process.poll() is None:
         try:
-            commands = [
-                'reg add "HKCU\\System\\GameConfigStore" /v "GameDVR_DXGIHonorFSEWindowsCompatible" /t REG_DWORD /d 1 /f',
-                'reg add "HKCU\\System\\GameConfigStore" /v "GameDVR_Enabled" /t REG_DWORD /d 0 /f',
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\GameDVR" /v "AllowGameDVR" /t REG_DWORD /d 0 /f'
-            ]
-            for cmd in commands:
-                self.log_and_run_command(logger, cmd)
-            logger.info("Disable Fullscreen Optimizations & Game Bar: Applied registry changes.")
-        except Exception as e:
-            logger.error(f"Disable Fullscreen Optimizations failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+            process.kill()
+        except OSError:
+            pass
 
-    def disable_copilot(self, logger):
+def wait_for(process, command, timeout=None, cancel=None, streamed=False):
+    """communicate() with a timeout and a cancellation Event. On either, the process tree is
+    killed and subprocess.TimeoutExpired or RunCancelled is raised. With `streamed`, another
+    thread drains the pipes and this only waits for the exit code."""
+    finish = process.wait if streamed else process.communicate
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+        wait = remaining if cancel is None else min(CANCEL_POLL_SECONDS, CANCEL_POLL_SECONDS if remaining is None else remaining)
         try:
-            commands = [
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\WindowsCopilot" /v "TurnOffWindowsCopilot" /t REG_DWORD /d 1 /f',
-                'reg add "HKCU\\Software\\Policies\\Microsoft\\Windows\\WindowsCopilot" /v "TurnOffWindowsCopilot" /t REG_DWORD /d 1 /f',
-                'reg add "HKCU\\Software\\Microsoft\\Windows\\CurrentVersion\\Notifications\\Settings" /v "AutoOpenCopilotLargeScreens" /t REG_DWORD /d 0 /f',
-                'reg add "HKCU\\Software\\Microsoft\\Windows\\CurrentVersion\\Explorer\\Advanced" /v "ShowCopilotButton" /t REG_DWORD /d 0 /f'
-            ]
-            for cmd in commands:
-                self.log_and_run_command(logger, cmd)
-            logger.info("Disable Copilot: Applied registry changes.")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Disable Copilot failed (Registry error): {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"Disable Copilot failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def disable_intellicode_remote_analysis(self, logger):
+            return finish(timeout=wait)
+        except subprocess.TimeoutExpired:
+            if cancel is not None and cancel.is_set():
+                kill_process_tree(process)
+                finish()
+                raise RunCancelled(f"Cancelled: {command_line(command)}")
+            if deadline is not None and time.monotonic() >= deadline:
+                kill_process_tree(process)
+                output = finish()
+                stdout, stderr = (None, None) if streamed else output
+                raise subprocess.TimeoutExpired(command, timeout, stdout, stderr)
+
+def stream_lines(pipe, on_output, tail):
+    """Read a binary pipe to EOF, passing every line and every carriage-return redraw (one
+    progress bar frame) to on_output. Only the last lines are kept, in the `tail` deque, so
+    memory stays flat however much a command prints. Returns the number of bytes read."""
+    import codecs
+    import locale
+    decoder = codecs.getincrementaldecoder(locale.getpreferredencoding(False))(errors="replace")
+    pending = ""
+    total = 0
+
+    def emit(segment):
+        nonlocal on_output
+        if not segment.strip():
+            return
+        tail.append(segment)
+        if on_output is not None:
+            try:
+                on_output(segment)
+            except Exception as e: # Keep draining, or the child blocks on a full pipe
+                logging.error(f"Output callback failed, output no longer streamed: {str(e)}\n{traceback.format_exc()}")
+                on_output = None
+
+    while True:
+        chunk = pipe.read1(OUTPUT_CHUNK_BYTES)
+        if not chunk:
+            break
+        total += len(chunk)
+        *segments, pending = OUTPUT_BREAKS.split(pending + decoder.decode(chunk))
+        for segment in segments:
+            emit(segment)
+        if len(pending) > OUTPUT_SEGMENT_LIMIT: # A runaway line without breaks is passed on in pieces
+            emit(pending)
+            pending = ""
+    emit(pending + decoder.decode(b"", final=True))
+    return total
+
+class SubprocessBackend:
+    """Runs argv commands directly, without a shell."""
+    def run(self, command, timeout=None, cancel=None, on_output=None):
+        """Run to completion, returning a CompletedProcess with text stdout/stderr.
+
+        Raises subprocess.TimeoutExpired after `timeout` seconds and RunCancelled once
+        the `cancel` Event is set, after killing the command's process tree. With
+        `on_output`, stdout and stderr are merged and streamed to it line by line (see
+        stream_lines); the result then only holds the last OUTPUT_TAIL_LINES lines and
+        carries the full size as `output_bytes`.
+        """
+        if on_output is not None:
+            return self.stream(command, timeout, cancel, on_output)
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                                   creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0), **process_group_options())
+        stdout, stderr = wait_for(process, command, timeout, cancel)
+        return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+    def stream(self, command, timeout, cancel, on_output):
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0), **process_group_options())
+        tail = deque(maxlen=OUTPUT_TAIL_LINES)
+        read = {}
+        reader = threading.Thread(target=lambda: read.setdefault("bytes", stream_lines(process.stdout, on_output, tail)),
+                                  name=f"{threading.current_thread().name}-output", daemon=True)
+        reader.start()
         try:
-            logger.info("Disable IntelliCode Remote Analysis: Already handled in 3rd-party telemetry disable.")
-        except Exception as e:
-            logger.error(f"Disable IntelliCode Remote Analysis failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    def disable_media_player_telemetry(self, logger):
+            wait_for(process, command, timeout, cancel, streamed=True)
+        finally:
+            reader.join(OUTPUT_DRAIN_SECONDS) # A leftover grandchild may hold the pipe open; do not wait on it
+        result = subprocess.CompletedProcess(command, process.returncode, "\n".join(tail), "")
+        result.output_bytes = read.get("bytes", 0)
+        return result
+
+    def launch(self, command):
+        """Start without waiting (interactive tools such as cleanmgr)."""
+        subprocess.Popen(command)
+
+# --- Command Builders ---
+# Every external command is built here as an argv list, so arguments are never
+# pasted into a shell string and need no quoting. command_line() renders one for
+# logs and events, powershell_command() for a line of a PowerShell script.
+SC_START_TYPES = ("boot", "system", "auto", "demand", "disabled", "delayed-auto")
+POWER_SCHEME_ALIASES = ("SCHEME_MIN", "SCHEME_MAX", "SCHEME_BALANCED", "SCHEME_CURRENT")
+
+def command_line(command):
+    """Display form of an argv command (also what Windows passes to the child)."""
+    return command if isinstance(command, str) else subprocess.list2cmdline(command)
+
+def powershell_command(command):
+    """An argv command as a PowerShell statement: the call operator and single-quoted arguments."""
+    return "& " + " ".join(powershell_quote(arg) for arg in command)
+
+def powershell_quote(value):
+    return "'" + str(value).replace("'", "''") + "'"
+
+def temp_directory():
+    """The user's %TEMP%, expanded here rather than by cmd.exe."""
+    import tempfile
+    return (os.environ.get("TEMP") or os.environ.get("TMP") or tempfile.gettempdir()).rstrip("\\/")
+
+def sc_config_start(service, start_type):
+    if start_type not in SC_START_TYPES:
+        raise ValueError(f"Unknown service start type: {start_type!r}")
+    return ["sc.exe", "config", service, "start=", start_type] # sc wants "start=" and its value as two arguments
+
+def powercfg_hibernate(enabled):
+    return ["powercfg", "/h", "on" if enabled else "off"]
+
+def powercfg_set_active(scheme):
+    if scheme not in POWER_SCHEME_ALIASES and not re.fullmatch(r"[0-9a-fA-F]{8}(-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12}", scheme):
+        raise ValueError(f"Not a power scheme alias or GUID: {scheme!r}")
+    return ["powercfg", "/setactive", scheme]
+
+def dism_set_feature(feature, enabled):
+    return ["DISM", "/Online", "/Enable-Feature" if enabled else "/Disable-Feature", f"/FeatureName:{feature}"]
+
+def winget_install(package_id):
+    return ["winget", "install", "--id", package_id, "-e", "--accept-source-agreements", "--accept-package-agreements"]
+
+def winget_uninstall(query):
+    return ["winget", "uninstall", query]
+
+def cleanmgr_sagerun(profile):
+    return ["cleanmgr", f"/sagerun:{int(profile)}"]
+
+def delete_directory_contents(directory):
+    """`del` is built into cmd.exe, so this is the one command that needs it; /d skips AutoRun
+    and the path is already expanded, leaving cmd nothing to interpret."""
+    return ["cmd.exe", "/d", "/c", "del", "/q", "/f", "/s", f"{directory}\\*"]
+
+# --- Progress Parsers ---
+# winget and DISM draw progress bars by rewriting one console line. Streamed
+# through SubprocessBackend, each redraw arrives as its own segment; a parser
+# turns the frames it recognises into Progress values for the item's progress bar.
+Progress = namedtuple("Progress", ["percent", "done", "total", "speed"]) # done/total in bytes, speed in bytes/s; None when not shown
+PROGRESS_EVENT_INTERVAL = 0.25 # Seconds between output_progress events of one command (first and last frames always go)
+PROGRESS_SPEED_SAMPLES = 8 # Frames the download speed is averaged over
+PROGRESS_SPEED_MIN_SECONDS = 0.5 # Shortest span of frames a speed is computed from
+SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+SPINNER_FRAMES = {"-", "\\", "|", "/"} # winget's busy indicator, not worth a log line
+
+class ProgressParser:
+    """Incremental parser for one command's output: feed() takes a segment and returns a
+    Progress for a progress bar frame, None for anything else."""
+    pattern = None
+
+    def feed(self, segment, now=None):
+        match = self.pattern.search(segment)
+        if match is None:
+            return None
+        return self.progress(match, time.monotonic() if now is None else now)
+
+    def progress(self, match, now):
+        return Progress(min(float(match.group("percent")), 100.0), None, None, None)
+
+class WingetProgressParser(ProgressParser):
+    """winget download frames ("████▒▒▒▒  12.5 MB / 80.0 MB") and install frames ("████▒▒▒▒  40%")."""
+    pattern = re.compile(r"(?P<done>\d+(?:\.\d+)?)\s*(?P<done_unit>[KMG]?B)\s*/\s*(?P<total>\d+(?:\.\d+)?)\s*(?P<total_unit>[KMG]?B)"
+                         r"|(?<![\d.])(?P<percent>\d{1,3})\s*%")
+
+    def __init__(self):
+        self.samples = deque(maxlen=PROGRESS_SPEED_SAMPLES) # (time, bytes done)
+
+    def progress(self, match, now):
+        if match.group("percent") is not None:
+            return super().progress(match, now)
+        done = float(match.group("done")) * SIZE_UNITS[match.group("done_unit")]
+        total = float(match.group("total")) * SIZE_UNITS[match.group("total_unit")]
+        if self.samples and done < self.samples[-1][1]: # A second download started
+            self.samples.clear()
+        self.samples.append((now, done))
+        first_time, first_done = self.samples[0]
+        speed = (done - first_done) / (now - first_time) if now - first_time >= PROGRESS_SPEED_MIN_SECONDS else None
+        percent = min(done / total * 100, 100.0) if total else None
+        return Progress(percent, int(done), int(total), speed)
+
+class DismProgressParser(ProgressParser):
+    """DISM frames: "[==========                 17.0%                          ]"."""
+    pattern = re.compile(r"\[[=\s]*(?P<percent>\d{1,3}(?:\.\d+)?)%[=\s]*\]")
+
+PROGRESS_PARSERS = {"winget": WingetProgressParser, "dism": DismProgressParser}
+
+def progress_parser(command):
+    """A fresh parser for the program an argv command runs, or None if its output has no progress bars."""
+    program = command[0].replace("\\", "/").rsplit("/", 1)[-1].lower() if command else ""
+    if program.endswith(".exe"):
+        program = program[:-4]
+    parser = PROGRESS_PARSERS.get(program)
+    return parser() if parser is not None else None
+
+def format_size(size):
+    for unit in ("GB", "MB", "KB"):
+        if size >= SIZE_UNITS[unit]:
+            return f"{size / SIZE_UNITS[unit]:.1f} {unit}"
+    return f"{size:.0f} B"
+
+def format_progress(progress):
+    """One-line description of a Progress: "42% (12.5 MB of 80.0 MB, 3.1 MB/s)"."""
+    text = f"{progress.percent:.0f}%" if progress.percent is not None else ""
+    details = []
+    if progress.total is not None:
+        details.append(f"{format_size(progress.done)} of {format_size(progress.total)}")
+    if progress.speed:
+        details.append(f"{format_size(progress.speed)}/s")
+    if details:
+        text = f"{text} ({', '.join(details)})" if text else ", ".join(details)
+    return text
+
+# --- Persistent PowerShell Session ---
+# One long-lived host process runs every PowerShell script of a run. Requests are
+# written to the host's stdin as single framed lines; the host answers with the
+# script's output followed by an end marker carrying the exit status.
+CommandResult = namedtuple("CommandResult", ["returncode", "stdout"])
+
+POWERSHELL_ARGV = ["powershell", "-NoLogo", "-NoProfile", "-NonInteractive", "-ExecutionPolicy", "Unrestricted", "-Command", "-"]
+
+class PowerShellFramer:
+    """Frames a script for a PowerShell host reading commands from stdin."""
+    startup = "$ProgressPreference = 'SilentlyContinue'; [Console]::OutputEncoding = [Text.Encoding]::UTF8"
+
+    def wrap(self, script, marker):
+        # The script travels base64-encoded, so no quoting or multi-line issues on the wire
+        encoded = base64.b64encode(script.encode("utf-8")).decode("ascii")
+        return (
+            "$global:LASTEXITCODE = 0; $Error.Clear(); $w11o_rc = 0; "
+            f"try {{ & ([ScriptBlock]::Create([Text.Encoding]::UTF8.GetString([Convert]::FromBase64String('{encoded}')))) 2>&1 | Out-String -Stream -Width 4096 }} "
+            "catch { $_ | Out-String -Stream; $w11o_rc = 1 }; "
+            "if ($w11o_rc -eq 0) { if ($LASTEXITCODE) { $w11o_rc = $LASTEXITCODE } elseif ($Error.Count -gt 0) { $w11o_rc = 1 } }; "
+            f"[Console]::Out.WriteLine('{marker}' + $w11o_rc + '>>'); [Console]::Out.Flush()"
+        )
+
+class PosixShellFramer:
+    """Frames a script for a POSIX sh host. Stand-in used to exercise ShellSession off Windows."""
+    startup = ""
+
+    def wrap(self, script, marker):
+        encoded = base64.b64encode(script.encode("utf-8")).decode("ascii")
+        return f"eval \"$(printf '%s' '{encoded}' | base64 -d)\" 2>&1; printf '%s%s>>\\n' '{marker}' \"$?\""
+
+class ShellSession:
+    """Long-lived shell host (PowerShell by default) executing framed scripts over stdin.
+
+    Requests are serialized. If the host dies it is restarted on the next request;
+    the request that was in flight when it died returns a non-zero result.
+    """
+    def __init__(self, argv=None, framer=None):
+        self.argv = argv if argv is not None else POWERSHELL_ARGV
+        self.framer = framer if framer is not None else PowerShellFramer()
+        self.process = None
+        self.lines = None
+        self.lock = threading.Lock()
+        self.request_ids = itertools.count(1)
+        self.starts = 0
+
+    def _start(self):
+        self.process = subprocess.Popen(
+            self.argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, encoding="utf-8", errors="replace", bufsize=1,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0), **process_group_options()
+        )
+        self.lines = queue.Queue()
+        threading.Thread(target=self._pump, args=(self.process, self.lines), daemon=True).start()
+        self.starts += 1
+        if self.starts > 1:
+            logging.warning(f"Shell session: host restarted ({self.starts - 1} restart(s) so far)")
+        if self.framer.startup:
+            self.process.stdin.write(self.framer.startup + "\n")
+            self.process.stdin.flush()
+
+    @staticmethod
+    def _pump(process, lines):
+        for line in process.stdout:
+            lines.put(line)
+        lines.put(None) # EOF: the host exited
+
+    def _discard(self):
+        if self.process is not None:
+            kill_process_tree(self.process) # Also whatever the script started
+            self.process.wait()
+        self.process = None
+
+    def run(self, script, timeout=None, cancel=None):
+        """Run a script in the host and return CommandResult(returncode, stdout).
+
+        After `timeout` seconds, or once the `cancel` Event is set, the host and everything
+        it started are killed (the next request starts a new host) and
+        subprocess.TimeoutExpired or RunCancelled is raised.
+        """
+        with self.lock:
+            marker = f"<<W11O-END:{next(self.request_ids)}:"
+            for attempt in range(2):
+                if self.process is None or self.process.poll() is not None:
+                    self._discard()
+                    self._start()
+                try:
+                    self.process.stdin.write(self.framer.wrap(script, marker) + "\n")
+                    self.process.stdin.flush()
+                    break
+                except OSError:
+                    # The host died between requests; nothing ran yet, so resend once
+                    self._discard()
+                    if attempt:
+                        raise
+            return self._read_response(marker, script, timeout, cancel)
+
+    def _read_response(self, marker, script, timeout=None, cancel=None):
+        pattern = re.compile(re.escape(marker) + r"(-?\d+)>>")
+        output = []
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                line = self.lines.get(timeout=CANCEL_POLL_SECONDS if cancel is not None or deadline is not None else None)
+            except queue.Empty:
+                if cancel is not None and cancel.is_set():
+                    self._discard()
+                    raise RunCancelled(f"Cancelled: {script}")
+                if deadline is not None and time.monotonic() >= deadline:
+                    self._discard()
+                    raise subprocess.TimeoutExpired(script, timeout, "".join(output))
+                continue
+            if line is None:
+                self._discard()
+                output.append("[shell host exited unexpectedly]\n")
+                return CommandResult(-1, "".join(output))
+            match = pattern.search(line)
+            if match:
+                output.append(line[:match.start()])
+                return CommandResult(int(match.group(1)), "".join(output))
+            output.append(line)
+
+    def close(self):
+        with self.lock:
+            if self.process is None:
+                return
+            try:
+                self.process.stdin.write("exit\n")
+                self.process.stdin.flush()
+                self.process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+            self._discard()
+
+# --- Plan Compiler ---
+# Selections from every section are compiled into one plan before anything runs:
+# tweaks picked in several sections run once, identical registry writes collapse,
+# and tweaks with opposite effects are reported instead of silently racing.
+PlanConflict = namedtuple("PlanConflict", ["first", "second", "reason"])
+
+class PlanConflictError(Exception):
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+        super().__init__("Conflicting tweaks selected: " + "; ".join(
+            f"'{TWEAKS[c.first].label}' vs '{TWEAKS[c.second].label}' ({c.reason})" for c in conflicts))
+
+class ExecutionPlan:
+    """Deduplicated tweaks to run, with their registry operations pre-grouped into one batch."""
+    def __init__(self, tweaks, duplicates, conflicts, batch):
+        self.tweaks = tweaks
+        self.duplicates = duplicates # ids selected more than once, or doing the same work as a selected tweak
+        self.conflicts = conflicts
+        self.batch = batch # Registry operations of the non-barrier tweaks
+
+    @property
+    def barriers(self):
+        return [tweak for tweak in self.tweaks if tweak.barrier]
+
+    @property
+    def others(self):
+        return [tweak for tweak in self.tweaks if not tweak.barrier]
+
+    def describe(self):
+        lines = [f"Plan: {len(self.tweaks)} tweak(s), {len(self.batch)} registry value(s) in {len(self.batch.groups)} key(s)"]
+        if self.duplicates:
+            lines.append(f"Plan: Selected more than once (will run once): {', '.join(TWEAKS[i].label for i in self.duplicates)}")
+        for conflict in self.conflicts:
+            lines.append(f"Plan: Conflict: '{TWEAKS[conflict.first].label}' vs '{TWEAKS[conflict.second].label}' ({conflict.reason})")
+        return lines
+
+def compile_plan(tweaks):
+    """Compile selected tweaks (in selection order, possibly from several sections) into an ExecutionPlan.
+
+    A tweak with handler arguments is also a duplicate when one already selected under
+    another id calls the same handler with the same arguments and operations, e.g.
+    Section 2's "Install Chrome" and Section 4's "Google Chrome": the first one
+    selected runs. Handlers without arguments are never merged this way.
+    """
+    unique = {}
+    duplicates = []
+    work = set() # (handler, args, operations) of the selected tweaks with handler arguments
+    for tweak in tweaks:
+        key = (tweak.handler, tweak.args, tweak.operations)
+        if tweak.id in unique or (tweak.args and key in work):
+            if tweak.id not in duplicates:
+                duplicates.append(tweak.id)
+        else:
+            unique[tweak.id] = tweak
+            if tweak.args:
+                work.add(key)
+    selected = list(unique.values())
+
+    conflicts = []
+    for tweak in selected:
+        for other in tweak.conflicts:
+            if other in unique:
+                conflicts.append(PlanConflict(other, tweak.id, "opposite effects"))
+
+    writers = {} # (key id, value name) -> (op, tweak id) of the first writer
+    batch = RegistryBatch()
+    seen_pairs = set()
+    for tweak in selected:
+        for op in tweak.operations:
+            target = registry_key_id(op.hive, op.key) + (op.name.lower(),)
+            first = writers.setdefault(target, (op, tweak.id))
+            if first[1] != tweak.id and (first[0].type, first[0].data) != (op.type, op.data) and (first[1], tweak.id) not in seen_pairs:
+                seen_pairs.add((first[1], tweak.id))
+                conflicts.append(PlanConflict(first[1], tweak.id, f"both set {op.hive}\\{op.key}\\{op.name}"))
+            if not tweak.barrier:
+                batch.add(op, tweak.id)
+    return ExecutionPlan(selected, duplicates, conflicts, batch)
+
+# --- Profiles ---
+# A profile is the INI written by Export: one [SectionN] per page, keyed by the
+# checkbox label. Tweak ids are accepted as keys too, since labels may change.
+def write_profile(path, selections):
+    """Write per-section selections ({tweak id: bool} per section) as a profile INI."""
+    import configparser
+    config = configparser.ConfigParser(delimiters=("=",)) # Some labels contain ':'
+    for index, selection in enumerate(selections):
+        config[f"Section{index + 1}"] = {TWEAKS[tweak_id].label: str(enabled) for tweak_id, enabled in selection.items()}
+    with open(path, 'w') as configfile:
+        config.write(configfile)
+
+def read_profile(path):
+    """Return per-section selections ({tweak id: bool}) from a profile INI, in section order."""
+    import configparser
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Profile not found: {path}")
+    config = configparser.ConfigParser(delimiters=("=",))
+    config.optionxform = str # Keep label case for the lookup below
+    config.read(path)
+    selections = []
+    for index, layout in enumerate(SECTIONS):
+        section_name = f"Section{index + 1}"
+        selection = {}
+        if section_name in config:
+            by_key = {}
+            for tweak_id in layout["tweaks"]:
+                by_key[TWEAKS[tweak_id].label.lower()] = tweak_id
+                by_key[tweak_id.lower()] = tweak_id
+            for key in config[section_name]:
+                tweak_id = by_key.get(key.lower())
+                if tweak_id is None:
+                    logging.warning(f"Profile {path}: Unknown option '{key}' in [{section_name}], ignored.")
+                    continue
+                selection[tweak_id] = config.getboolean(section_name, key, fallback=False)
+        selections.append(selection)
+    return selections
+
+# A service profile is an INI with one [Services] section mapping service names to
+# sc.exe start types. It replaces MANUAL_SERVICES for the "Set Services to Manual"
+# tweak, so users can trim or extend the list without editing the program.
+SERVICE_PROFILE_SECTION = "Services"
+SERVICE_START_ALIASES = {"manual": "demand", "automatic": "auto", "delayed": "delayed-auto"} # Services.msc names
+
+def default_service_profile():
+    return {service: "demand" for service in MANUAL_SERVICES}
+
+def write_service_profile(path, services):
+    """Write {service name: start type} as a service profile INI."""
+    import configparser
+    config = configparser.ConfigParser(delimiters=("=",))
+    config.optionxform = str # Service names keep their case
+    config[SERVICE_PROFILE_SECTION] = services
+    with open(path, 'w') as profile_file:
+        profile_file.write(f"# Start types: {', '.join(SERVICE_STARTUP_TYPES)} (or {', '.join(SERVICE_START_ALIASES)})\n")
+        config.write(profile_file)
+
+def read_service_profile(path):
+    """Return {service name: sc.exe start type} from a service profile INI. Raises ValueError on unknown start types."""
+    import configparser
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"Service profile not found: {path}")
+    config = configparser.ConfigParser(delimiters=("=",))
+    config.optionxform = str
+    config.read(path)
+    if SERVICE_PROFILE_SECTION not in config:
+        raise ValueError(f"Service profile {path}: No [{SERVICE_PROFILE_SECTION}] section")
+    services = {}
+    for service, start_type in config[SERVICE_PROFILE_SECTION].items():
+        start_type = SERVICE_START_ALIASES.get(start_type.strip().lower(), start_type.strip().lower())
+        if start_type not in SERVICE_STARTUP_TYPES:
+            raise ValueError(f"Service profile {path}: Unknown start type '{start_type}' for {service}")
+        services[service] = start_type
+    return services
+
+def load_service_profile(path=None):
+    """The service list to apply: `path` if given, else SERVICE_PROFILE_FILENAME if present, else MANUAL_SERVICES."""
+    if path is None and os.path.isfile(SERVICE_PROFILE_FILENAME):
+        path = SERVICE_PROFILE_FILENAME
+    return read_service_profile(path) if path is not None else default_service_profile()
+
+def selected_tweaks(selections):
+    """Tweaks enabled in per-section selections, in section and checkbox order."""
+    return [TWEAKS[tweak_id] for selection in selections for tweak_id, enabled in selection.items() if enabled]
+
+# --- Tweak Scheduler ---
+MAX_PARALLEL_TWEAKS = 4 # Worker threads for handler tweaks
+
+def tweak_resources(tweak):
+    """Everything a tweak touches: its declared resources plus the registry keys it writes."""
+    keys = {"registry:%s\\%s" % registry_key_id(op.hive, op.key) for op in tweak.operations}
+    return set(tweak.resources) | keys
+
+class TweakScheduler:
+    """Runs tweaks on a bounded worker pool in dependency order.
+
+    A tweak waits for the selected tweaks it declares in `depends` and for every
+    earlier selected tweak that shares one of its resources, so conflicting work
+    keeps selection order while independent work (a DISM call and a winget install,
+    say) runs side by side. If a declared dependency fails, its dependents are not run.
+    """
+    def __init__(self, max_workers=MAX_PARALLEL_TWEAKS):
+        self.max_workers = max_workers
+
+    @staticmethod
+    def build(tweaks):
+        """Return {tweak id: set of prerequisite ids} for the given tweaks."""
+        selected = {tweak.id for tweak in tweaks}
+        prerequisites = {}
+        owners = {} # resource -> ids of earlier tweaks using it
+        for tweak in tweaks:
+            before = {dep for dep in tweak.depends if dep in selected}
+            for resource in tweak_resources(tweak):
+                before.update(owners.get(resource, ()))
+                owners.setdefault(resource, []).append(tweak.id)
+            before.discard(tweak.id)
+            prerequisites[tweak.id] = before
+        return prerequisites
+
+    def run(self, tweaks, run_one, skip=None, failed=(), cancel=None):
+        """Call run_one(tweak) for every tweak, returning {tweak id: error or None}.
+
+        run_one returns None on success or the exception. skip(tweak, error) is called
+        for tweaks not run because a declared dependency failed, or because the `cancel`
+        Event was set; `failed` lists ids that already failed before scheduling.
+        """
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+        by_id = {tweak.id: tweak for tweak in tweaks}
+        tweaks = list(by_id.values()) # A tweak selected twice runs once
+        prerequisites = self.build(tweaks)
+        # Dependencies outside this run (e.g. barriers that already ran) count as done
+        waiting = {tweak_id: {dep for dep in deps if dep in by_id} for tweak_id, deps in prerequisites.items()}
+        dependents = {tweak_id: [] for tweak_id in by_id}
+        for tweak_id, deps in waiting.items():
+            for dep in deps:
+                dependents[dep].append(tweak_id)
+        outcome = {}
+        failed = set(failed)
+
+        def settle(tweak_id, error):
+            outcome[tweak_id] = error
+            if error is not None:
+                failed.add(tweak_id)
+            ready = []
+            for dependent in dependents[tweak_id]:
+                waiting[dependent].discard(tweak_id)
+                if not waiting[dependent] and dependent not in outcome:
+                    ready.append(dependent)
+            return ready
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tweak") as pool:
+            running = {}
+
+            def start(tweak_id):
+                tweak = by_id[tweak_id]
+                broken = [dep for dep in tweak.depends if dep in failed]
+                if cancel is not None and cancel.is_set():
+                    error = RunCancelled("Run cancelled before this tweak started")
+                elif broken:
+                    error = RuntimeError(f"Skipped: dependency {', '.join(broken)} failed")
+                else:
+                    error = None
+                if error is not None:
+                    if skip:
+                        skip(tweak, error)
+                    for ready in settle(tweak_id, error):
+                        start(ready)
+                    return
+                running[pool.submit(run_one, tweak)] = tweak_id
+
+            for tweak in tweaks:
+                if not waiting[tweak.id]:
+                    start(tweak.id)
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    tweak_id = running.pop(future)
+                    try:
+                        error = future.result()
+                    except Exception as e:
+                        error = e
+                    for ready in settle(tweak_id, error):
+                        start(ready)
+        return outcome
+
+# --- Event Bus ---
+# Runs report what happens as events instead of touching widgets. The Tk loop
+# drains the bus in batches on its own thread; a headless front-end subscribes a
+# callback instead.
+EVENT_STARTED = "started" # total
+EVENT_PROGRESS = "progress" # done, total, tweak_id, error
+EVENT_COMPLETED = "completed" # summary, failed
+EVENT_FAILED = "failed" # error (the run itself failed)
+EVENT_LOG = "log" # line, level
+EVENT_METRICS = "metrics" # slowest: [(tweak id, stats)] of the finished run
+EVENT_SUBPROGRESS = "subprogress" # item, percent (None once the item's command ended), detail
+
+UIEvent = namedtuple("UIEvent", ["kind", "target", "data"])
+
+class EventBus:
+    """Thread-safe event stream from worker threads to front-ends.
+
+    With queued=True events are kept until drain() is called (the Tk loop does this
+    on a timer). Subscribers are called synchronously on the publishing thread.
+    """
+    def __init__(self, queued=True):
+        self.queued = queued
+        self.pending = deque()
+        self.subscribers = []
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+
+    def publish(self, kind, target=None, **data):
+        event = UIEvent(kind, target, data)
+        for callback in self.subscribers:
+            callback(event)
+        if self.queued:
+            self.pending.append(event)
+
+    def drain(self):
+        events = []
+        while self.pending:
+            events.append(self.pending.popleft())
+        return events
+
+    def channel(self, target):
+        """A publisher bound to one target (e.g. the output pane of a section)."""
+        return EventChannel(self, target)
+
+class EventChannel:
+    def __init__(self, bus, target):
+        self.bus = bus
+        self.target = target
+
+    def publish(self, kind, **data):
+        self.bus.publish(kind, self.target, **data)
+
+# --- Tweak Engine ---
+SERVICES_KEY = r"SYSTEM\CurrentControlSet\Services"
+SERVICE_START_TYPES = {0: "boot", 1: "system", 2: "auto", 3: "demand", 4: "disabled"} # Start value -> sc.exe start= name
+SERVICE_STARTUP_TYPES = {"auto": "Automatic", "demand": "Manual", "disabled": "Disabled", # Start types a profile can set -> Set-Service -StartupType
+                         "delayed-auto": "AutomaticDelayedStart"}
+SC_CONFIG_START_TYPES = ("auto", "delayed-auto") # Set with sc.exe: Set-Service Automatic keeps DelayedAutostart, and 5.1 lacks AutomaticDelayedStart
+WINGET_ALREADY_INSTALLED = 0x8A15002B # `winget install` exit code (compare with exit_code(), not the raw returncode)
+TASK_STATE_DISABLED = 1 # MSFT_ScheduledTask State: 0 Unknown, 1 Disabled, 2 Queued, 3 Ready, 4 Running
+
+def parse_task_states(output):
+    """{path (lower): (path, enabled)} from "path|state" lines, the state being the
+    MSFT_ScheduledTask State enum as a number, so the listing reads the same in every
+    display language (schtasks prints a localized Status column)."""
+    tasks = {}
+    for line in output.splitlines():
+        path, _, state = line.strip().rpartition("|")
+        if path.startswith("\\") and state.isdigit():
+            tasks[path.lower()] = (path, int(state) != TASK_STATE_DISABLED)
+    return tasks
+
+def task_matches(path, pattern):
+    """True if a task path matches an exact name or a glob pattern (*, ?, [...]), compared
+    case-insensitively with the full path and with the bare task name; a leading backslash is optional."""
+    import fnmatch
+    path = path.lstrip("\\").lower()
+    pattern = pattern.lstrip("\\").lower()
+    name = path.rsplit("\\", 1)[-1]
+    if any(char in pattern for char in "*?["):
+        return fnmatch.fnmatchcase(path, pattern) or fnmatch.fnmatchcase(name, pattern)
+    return pattern in (path, name)
+
+class RunReport:
+    """Outcome of one execution run, printed at the end of the output pane."""
+    def __init__(self):
+        self.completed = []
+        self.already_applied = [] # tweak ids that needed no change (also listed in completed)
+        self.failed = {} # tweak id -> exception
+        self.cancelled = [] # tweak ids interrupted or never started because the run was cancelled
+        self.registry_requested = 0
+        self.registry_writes = 0
+        self.registry_skipped = 0
+        self.key_opens = 0
+
+    def add_registry_result(self, result):
+        self.registry_requested += result["requested"]
+        self.registry_writes += result["writes"]
+        self.registry_skipped += result["already_applied"]
+        self.key_opens += result["key_opens"]
+
+    @property
+    def key_opens_saved(self):
+        # Without grouping every requested operation opened (and created) its key
+        return self.registry_requested - self.key_opens
+
+    def summary(self):
+        cancelled = f", {len(self.cancelled)} cancelled" if self.cancelled else ""
+        return (f"Run report: {len(self.completed)} completed ({len(self.already_applied)} already applied), {len(self.failed)} failed{cancelled}; "
+                f"{self.registry_writes} registry write(s) for {self.registry_requested} requested operation(s) "
+                f"in {self.key_opens} key open(s) ({self.key_opens_saved} key opens saved, {self.registry_skipped} value(s) already set)")
+
+class TweakEngine:
+    """Executes catalog entries: registry operations in-process, then the tweak's handler (if any)."""
+    def __init__(self, registry=None, shell_factory=ShellSession, scheduler=None, processes=None):
+        self.registry = registry if registry is not None else RegistryEngine()
+        self.processes = processes if processes is not None else SubprocessBackend()
+        self.shell_factory = shell_factory
+        self.shell = None # Started on the first PowerShell command
+        self.shell_lock = threading.Lock()
+        self.run_lock = threading.Lock() # Runs mutate the same machine, so they are serialized
+        self.journal = None # RunJournal of the run in progress, if any
+        self.service_profile = None # Service profile path for set_services_manual (None: see load_service_profile)
+        self.tasks = None # Cached task_inventory(); None until the task library is first listed
+        self.task_lock = threading.Lock()
+        self.profiler = None # RunProfiler of the run in progress, if any
+        self.cancel_event = threading.Event() # Set by cancel(); cleared when a run starts
+        self.context = threading.local() # Per thread: timeout of the tweak whose handler is running
+        self.scheduler = scheduler if scheduler is not None else TweakScheduler()
+
+    def close(self):
+        if self.shell is not None:
+            self.shell.close()
+
+    def cancel(self):
+        """Stop the run in progress: nothing new is started and running commands are killed.
+        Returns False if no run is in progress. Safe to call from any thread."""
+        self.cancel_event.set()
+        return self.run_lock.locked()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def command_timeout(self):
+        return getattr(self.context, "timeout", None) or DEFAULT_COMMAND_TIMEOUT
+
+    def call_handler(self, tweak, logger):
+        """Run a tweak's handler with the tweak's command timeout in effect on this thread."""
+        self.context.timeout = tweak_timeout(tweak)
         try:
-            key_path = r"SOFTWARE\Microsoft\MediaPlayer\Preferences"
-            with winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path) as key:
-                winreg.SetValueEx(key, "UsageTracking", 0, winreg.REG_DWORD, 0)
-            logger.info("Disable Media Player Telemetry: Set UsageTracking to 0.")
-            logger.info(f"Command: reg add \"HKCU\\{key_path}\" /v \"UsageTracking\" /t REG_DWORD /d 0 /f")
-        except Exception as e:
-            logger.error(f"Disable Media Player Telemetry failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+            getattr(self, tweak.handler)(logger, *tweak.args)
+        finally:
+            self.context.timeout = None
+
+    def run_tweak(self, tweak, logger):
+        if tweak.operations:
+            result = self.registry.apply(tweak.operations, logger, self.journal)
+            if result["writes"]:
+                logger.info(f"{tweak.label}: Applied {result['writes']} registry change(s).")
+            else:
+                logger.info(f"{tweak.label}: Already applied.")
+        if tweak.handler:
+            self.call_handler(tweak, logger)
+
+    def run_tweaks(self, tweaks, logger, on_tweak_done=None, journal=None):
+        """Compile the selected tweaks into a plan and run it. Raises PlanConflictError on conflicts."""
+        plan = compile_plan(tweaks)
+        for line in plan.describe():
+            logger.info(line)
+        if plan.conflicts:
+            raise PlanConflictError(plan.conflicts)
+        return self.run_plan(plan, logger, on_tweak_done, journal)
+
+    def run_plan(self, plan, logger, on_tweak_done=None, journal=None, events=None, profiler=None):
+        """Run a compiled ExecutionPlan and return a RunReport.
+
+        Barrier tweaks run first. The registry operations of all other tweaks are
+        then applied as a single key-grouped batch, and finally the handlers run on
+        the TweakScheduler's worker pool. on_tweak_done(tweak, error) is called once
+        per tweak, possibly from a worker thread.
+        Prior values of every mutation are recorded in the journal, if given, and
+        started/progress/completed/failed events are published to events, if given.
+        With a RunProfiler, the run and every handler thread are profiled.
+        After cancel(), tweaks not yet started are reported as cancelled.
+        """
+        with self.run_lock:
+            self.cancel_event.clear()
+            self.invalidate_task_inventory() # The task library may have changed since the last run
+            self.journal = journal
+            self.profiler = profiler
+            run_started = time.perf_counter()
+            try:
+                if events is not None:
+                    events.publish(EVENT_STARTED, total=len(plan.tweaks))
+                record_event(logger, "run_started", tweaks=len(plan.tweaks), plan=[tweak.id for tweak in plan.tweaks])
+                if profiler is not None:
+                    report = profiler.profile(self._run_plan, plan, logger, on_tweak_done, events)
+                else:
+                    report = self._run_plan(plan, logger, on_tweak_done, events)
+                record_event(logger, "run_finished", duration=round(time.perf_counter() - run_started, 6),
+                             summary=report.summary(), completed=len(report.completed), failed=len(report.failed),
+                             cancelled=len(report.cancelled))
+                if events is not None:
+                    events.publish(EVENT_COMPLETED, summary=report.summary(), failed=len(report.failed),
+                                   cancelled=len(report.cancelled))
+                return report
+            except Exception as e:
+                record_event(logger, "run_finished", duration=round(time.perf_counter() - run_started, 6),
+                             summary=f"Run failed: {e}", completed=0, failed=len(plan.tweaks))
+                if events is not None:
+                    events.publish(EVENT_FAILED, error=str(e))
+                raise
+            finally:
+                self.journal = None
+                self.profiler = None
+                if journal is not None:
+                    journal.close()
+
+    def _run_plan(self, plan, logger, on_tweak_done, events):
+        report = RunReport()
+        report_lock = threading.Lock() # finish() is called from the scheduler's worker threads
+        total = len(plan.tweaks)
+        started = {} # tweak id -> perf_counter at start
+
+        def begin(tweak, batched=False):
+            started[tweak.id] = time.perf_counter()
+            record_event(logger, "tweak_started", tweak=tweak.id, label=tweak.label, batched=batched)
+            if not batched:
+                logger.info(f"Starting: {tweak.label}")
+
+        def finish(tweak, error=None, already_applied=False):
+            with report_lock:
+                record(tweak, error, already_applied)
+                done = len(report.completed) + len(report.failed) + len(report.cancelled)
+            if error is None:
+                outcome = "already_applied" if already_applied else "completed"
+            else:
+                outcome = "cancelled" if isinstance(error, RunCancelled) else "failed"
+            duration = time.perf_counter() - started.get(tweak.id, time.perf_counter())
+            record_event(logger, "tweak_finished", tweak=tweak.id, outcome=outcome, duration=round(duration, 6),
+                         error=None if error is None else str(error))
+            if events is not None:
+                events.publish(EVENT_PROGRESS, done=done, total=total, tweak_id=tweak.id,
+                               error=None if error is None else str(error))
+            if on_tweak_done:
+                on_tweak_done(tweak, error)
+
+        def record(tweak, error, already_applied):
+            if error is None:
+                report.completed.append(tweak.id)
+                if already_applied:
+                    report.already_applied.append(tweak.id)
+                    logger.info(f"Already applied: {tweak.label}")
+                else:
+                    logger.info(f"Completed: {tweak.label}")
+            elif isinstance(error, RunCancelled):
+                report.cancelled.append(tweak.id)
+                logger.warning(f"Cancelled: {tweak.label}")
+            else:
+                report.failed[tweak.id] = error
+                logger.error(f"Failed: {tweak.label} - {str(error)}")
+
+        def not_started():
+            return RunCancelled("Run cancelled before this tweak started")
+
+        for tweak in plan.barriers:
+            if self.cancelled:
+                finish(tweak, not_started())
+                continue
+            begin(tweak)
+            try:
+                self.run_tweak(tweak, logger)
+                finish(tweak)
+            except Exception as e:
+                finish(tweak, e)
+
+        others = plan.others
+        batch = plan.batch
+        failed_writes = {}
+        changed = set()
+        if self.cancelled:
+            for tweak in others:
+                finish(tweak, not_started())
+            logger.info(report.summary())
+            return report
+        for tweak in others:
+            if tweak.operations:
+                begin(tweak, batched=True) # Registry writes of all tweaks go out in one batch
+        if batch.requested:
+            logger.info(f"Applying {batch.requested} registry operation(s) grouped into {len(batch.groups)} key(s)")
+            result = self.registry.apply_batch(batch, logger, self.journal)
+            report.add_registry_result(result)
+            failed_writes = result["failed"]
+            changed = result["changed"]
+
+        for tweak in others:
+            if not tweak.handler:
+                finish(tweak, failed_writes.get(tweak.id), already_applied=tweak.id not in changed)
+        handler_tweaks = []
+        for tweak in others:
+            if not tweak.handler:
+                continue
+            if tweak.id in failed_writes:
+                finish(tweak, failed_writes[tweak.id])
+            else:
+                handler_tweaks.append(tweak)
+
+        def run_handler(tweak):
+            if self.cancelled:
+                error = not_started()
+                finish(tweak, error)
+                return error
+            begin(tweak)
+            try:
+                if self.profiler is not None:
+                    self.profiler.profile(self.call_handler, tweak, logger)
+                else:
+                    self.call_handler(tweak, logger)
+                error = None
+            except Exception as e:
+                error = e
+            finish(tweak, error)
+            return error
+
+        if handler_tweaks:
+            self.scheduler.run(handler_tweaks, run_handler, skip=finish, failed=failed_writes, cancel=self.cancel_event)
+
+        logger.info(report.summary())
+        return report
+
+    def check_tweaks(self, tweaks, logger=None):
+        """Read-only status of each tweak: "applied", "pending", or "unknown" for handler tweaks.
+
+        Only reads the registry, so it needs no write access and changes nothing.
+        """
+        batch = RegistryBatch()
+        for tweak in tweaks:
+            for op in tweak.operations:
+                batch.add(op, tweak.id)
+        pending, _ = self.registry.pending_values(batch, logger)
+        pending_owners = {owner for todo in pending.values() for _, owners in todo for owner in owners}
+        status = {}
+        for tweak in tweaks:
+            if tweak.handler:
+                status[tweak.id] = "unknown"
+            else:
+                status[tweak.id] = "pending" if tweak.id in pending_owners else "applied"
+        return status
+
+    def revert_journal(self, path, logger):
+        """Restore everything recorded in a run journal: registry values as one batch,
+        services in one PowerShell script, and scheduled tasks through set_tasks_enabled,
+        the same batch that changed them."""
+        with self.run_lock:
+            self.cancel_event.clear()
+            self.journal = None # Restoring is not journaled
+            entries = RunJournal.original_states(RunJournal.load(path))
+            logger.info(f"Revert: {len(entries)} change(s) recorded in {path}")
+            batch = RegistryBatch()
+            commands = []
+            tasks = {True: [], False: []} # prior state -> task paths
+            for entry in entries:
+                if entry["kind"] == "registry":
+                    batch.add(registry_restore_op(entry), "registry")
+                elif entry["kind"] == "service":
+                    commands.append(powershell_command(sc_config_start(entry["target"], entry["prior"])))
+                elif entry["kind"] == "task":
+                    tasks[bool(entry["prior"])].append(entry["target"])
+            result = {"registry": 0, "commands": len(commands), "tasks": 0, "failed": []}
+            if batch.requested:
+                registry_result = self.registry.apply_batch(batch, logger)
+                result["registry"] = registry_result["writes"] + registry_result["already_applied"]
+                if registry_result["failed"]:
+                    result["failed"].append("registry")
+            if commands:
+                # Every command runs even if an earlier one fails; the script fails if any did
+                script = "; ".join(f"{command}; if ($LASTEXITCODE) {{ $w11o_failed = $true }}" for command in commands)
+                script = f"$w11o_failed = $false; {script}; if ($w11o_failed) {{ $global:LASTEXITCODE = 1 }}"
+                try:
+                    self.run_powershell(logger, script, "Restore services")
+                except subprocess.CalledProcessError:
+                    result["failed"].append("services")
+            if tasks[True] or tasks[False]:
+                self.invalidate_task_inventory() # The task library may have changed since the run
+                for enabled, paths in tasks.items():
+                    if not paths:
+                        continue
+                    try:
+                        outcome = self.set_tasks_enabled(logger, paths, enabled, "Revert")
+                    except subprocess.CalledProcessError:
+                        outcome = {"changed": [], "already": [], "unmatched": paths, "failed": {}}
+                    result["tasks"] += len(outcome["changed"]) + len(outcome["already"])
+                    if (outcome["failed"] or outcome["unmatched"]) and "tasks" not in result["failed"]:
+                        result["failed"].append("tasks")
+            logger.info(f"Revert: Restored {result['registry']} registry value(s) and {result['tasks']} scheduled task(s), "
+                        f"ran {result['commands']} service command(s)"
+                        + (f"; failures in: {', '.join(result['failed'])}" if result["failed"] else ""))
+            return result
+
+    def service_inventory(self, logger=None):
+        """Snapshot of every installed service from one pass over the Services key:
+        {service name (lower): (name, start type)}. No process is spawned."""
+        started = time.perf_counter()
+        subkeys = self.registry.backend.read_subkeys("HKLM", SERVICES_KEY, ["Start", "DelayedAutostart"])
+        inventory = {}
+        for name, values in subkeys.items():
+            if "start" not in values: # Not a service (e.g. a leftover parameters key)
+                continue
+            start_type = SERVICE_START_TYPES.get(values["start"][1])
+            if start_type == "auto" and values.get("delayedautostart", (None, 0))[1] == 1:
+                start_type = "delayed-auto"
+            inventory[name.lower()] = (name, start_type)
+        record_event(logger, "operation", kind="registry", target=f"HKLM\\{SERVICES_KEY} (inventory)",
+                     duration=round(time.perf_counter() - started, 6), outcome="ok", services=len(inventory))
+        return inventory
+
+    def configure_services(self, logger, services, label="Configure services"):
+        """Bring services ({name: sc.exe start type}) to their start types in one batch.
+
+        One inventory snapshot decides what to do: missing services, services already
+        at their start type and drivers (boot or system start, which a profile never
+        changes) are skipped without spawning anything; the rest are changed by a single
+        PowerShell request, with their previous start types journaled first.
+        Returns {"changed": [...], "already": [...], "missing": [...], "skipped": [...], "failed": {name: error}}.
+        """
+        for start_type in services.values():
+            if start_type not in SERVICE_STARTUP_TYPES:
+                raise ValueError(f"Unsupported service start type: {start_type!r}")
+        inventory = self.service_inventory(logger)
+        result = {"changed": [], "already": [], "missing": [], "skipped": [], "failed": {}}
+        changes = {} # installed name -> (start type, prior)
+        for service, start_type in services.items():
+            entry = inventory.get(service.lower())
+            if entry is None:
+                result["missing"].append(service)
+            elif entry[1] == start_type:
+                result["already"].append(service)
+            elif entry[1] not in SERVICE_STARTUP_TYPES:
+                result["skipped"].append(service)
+            else:
+                changes[entry[0]] = (start_type, entry[1])
+        if changes:
+            if self.journal is not None:
+                self.journal.record_many({"kind": "service", "target": name, "prior": prior}
+                                         for name, (_, prior) in changes.items())
+            outcome = self.set_service_start_types(logger, {name: start_type for name, (start_type, _) in changes.items()})
+            for name, error in outcome.items():
+                if error:
+                    result["failed"][name] = error
+                else:
+                    result["changed"].append(name)
+        logger.info(f"{label}: {len(result['changed'])} changed, {len(result['already'])} already set, "
+                    f"{len(result['missing'])} not installed, {len(result['skipped'])} skipped, {len(result['failed'])} failed.")
+        if result["missing"]:
+            logger.info(f"{label}: Not installed: {', '.join(result['missing'])}")
+        if result["skipped"]:
+            logger.info(f"{label}: Left unchanged (boot or system start drivers): {', '.join(result['skipped'])}")
+        for name, error in result["failed"].items():
+            logger.warning(f"{label}: Failed to set {name} to {changes[name][0]}. Error: {error}")
+        return result
+
+    def set_service_start_types(self, logger, services):
+        """Sets start types ({name: sc.exe start type}) in one PowerShell request; auto and
+        delayed-auto go through sc.exe, which also sets or clears the delayed flag.
+        Returns {name: error message or None}."""
+        if not services:
+            return {}
+        entries = ", ".join(powershell_quote(f"{name}|{start_type}|{SERVICE_STARTUP_TYPES[start_type]}") for name, start_type in services.items())
+        sc_types = ", ".join(powershell_quote(start_type) for start_type in SC_CONFIG_START_TYPES)
+        script = (
+            f"foreach ($e in @({entries})) {{ $n, $s, $t = $e -split '\\|', 3; "
+            f"try {{ if ($s -in @({sc_types})) {{ $o = & sc.exe config $n start= $s; if ($LASTEXITCODE) {{ throw ($o -join ' ') }} }} "
+            "else { Set-Service -Name $n -StartupType $t -ErrorAction Stop }; Write-Output ('OK|' + $n) } "
+            "catch { Write-Output ('FAIL|' + $n + '|' + $_.Exception.Message) } }; $global:LASTEXITCODE = 0; $Error.Clear()"
+        )
+        result = self.run_powershell(logger, script, f"Set the start type of {len(services)} service(s)")
+        outcome = {}
+        for line in result.stdout.splitlines():
+            status, _, rest = line.strip().partition("|")
+            name, _, message = rest.partition("|")
+            if status == "OK":
+                outcome[name] = None
+            elif status == "FAIL":
+                outcome[name] = message or "unknown error"
+        for name in services:
+            outcome.setdefault(name, "no result reported")
+        return outcome
+
+    def task_inventory(self, logger, refresh=False):
+        """Every scheduled task and whether it is enabled, {path (lower): (path, enabled)},
+        from one Get-ScheduledTask listing of the whole task library. The result is cached
+        until invalidate_task_inventory() (called when a run starts) or refresh=True."""
+        with self.task_lock: # Handlers asking at the same time share one listing
+            if self.tasks is None or refresh:
+                script = "Get-ScheduledTask | ForEach-Object { $_.TaskPath + $_.TaskName + '|' + [int]$_.State }; $Error.Clear()"
+                result = self.run_powershell(logger, script, "List scheduled tasks")
+                self.tasks = parse_task_states(result.stdout)
+            return self.tasks
+
+    def invalidate_task_inventory(self):
+        with self.task_lock:
+            self.tasks = None
+
+    def set_tasks_enabled(self, logger, patterns, enabled, label="Scheduled tasks"):
+        """Enable or disable every task matching exact names or glob patterns (see task_matches) in one batch.
+
+        Tasks already in the wanted state and patterns matching nothing are skipped
+        without spawning anything; prior states of the changed tasks are journaled.
+        Returns {"changed": [...], "already": [...], "unmatched": [patterns], "failed": {path: error}}.
+        """
+        inventory = self.task_inventory(logger)
+        result = {"changed": [], "already": [], "unmatched": [], "failed": {}}
+        matched = {} # path (lower) -> (path, enabled), in pattern order
+        for pattern in patterns:
+            hits = [entry for entry in inventory.values() if task_matches(entry[0], pattern)]
+            if not hits:
+                result["unmatched"].append(pattern)
+            for path, state in hits:
+                matched.setdefault(path.lower(), (path, state))
+        changes = [path for path, state in matched.values() if state != enabled]
+        result["already"] = [path for path, state in matched.values() if state == enabled]
+        if changes:
+            if self.journal is not None:
+                self.journal.record_many({"kind": "task", "target": path, "prior": not enabled} for path in changes)
+            outcome = self.set_task_states(logger, changes, enabled)
+            with self.task_lock:
+                for path, error in outcome.items():
+                    if error:
+                        result["failed"][path] = error
+                        continue
+                    result["changed"].append(path)
+                    if self.tasks is not None:
+                        self.tasks[path.lower()] = (path, enabled)
+        state = "enabled" if enabled else "disabled"
+        logger.info(f"{label}: {len(result['changed'])} {state}, {len(result['already'])} already {state}, "
+                    f"{len(result['failed'])} failed; {len(result['unmatched'])} name(s) matched no task.")
+        if result["unmatched"]:
+            logger.info(f"{label}: No task matches: {', '.join(result['unmatched'])}")
+        for path, error in result["failed"].items():
+            logger.warning(f"{label}: Failed to change {path}. Error: {error}")
+        return result
+
+    def set_task_states(self, logger, paths, enabled):
+        """Enables or disables tasks (full paths) in one PowerShell request. Returns {path: error message or None}."""
+        if not paths:
+            return {}
+        quoted = ", ".join(powershell_quote(path) for path in paths)
+        script = (
+            f"foreach ($p in @({quoted})) {{ $i = $p.LastIndexOf('\\'); "
+            f"try {{ $null = {'Enable' if enabled else 'Disable'}-ScheduledTask -TaskPath $p.Substring(0, $i + 1) -TaskName $p.Substring($i + 1) -ErrorAction Stop; "
+            "Write-Output ('OK|' + $p) } "
+            "catch { Write-Output ('FAIL|' + $p + '|' + $_.Exception.Message) } }; $Error.Clear()"
+        )
+        result = self.run_powershell(logger, script, f"{'Enable' if enabled else 'Disable'} {len(paths)} scheduled task(s)")
+        outcome = {}
+        for line in result.stdout.splitlines():
+            status, _, rest = line.strip().partition("|")
+            path, _, message = rest.partition("|")
+            if status == "OK":
+                outcome[path] = None
+            elif status == "FAIL":
+                outcome[path] = message or "unknown error"
+        for path in paths:
+            outcome.setdefault(path, "no result reported")
+        return outcome
 
-    def disable_system_file_access_consent(self, logger):
+    # --- Utility for Logging Commands ---
+    def run_process(self, logger, command, kind="command", check=False, item=None):
+        """Runs an argv command and records an operation event with its latency, the
+        spawned process and the size of its captured output.
+
+        Passing `item` (what the command works on, e.g. "Google Chrome") streams the
+        output into the log while the command runs, with its progress bars turned into
+        output_progress events for that item.
+        """
+        line = command_line(command)
+        if self.cancelled:
+            raise RunCancelled(f"Cancelled: {line}")
+        timeout = self.command_timeout()
+        options = {} if item is None else {"on_output": self.output_streamer(logger, command, item)}
+        started = time.perf_counter()
         try:
-            paths = [
-                r"SOFTWARE\Microsoft\Windows\CurrentVersion\CapabilityAccessManager\ConsentStore\documentsLibrary",
-                r"SOFTWARE\Microsoft\Windows\CurrentVersion\CapabilityAccessManager\ConsentStore\picturesLibrary",
-                r"SOFTWARE\Microsoft\Windows\CurrentVersion\CapabilityAccessManager\ConsentStore\videosLibrary",
-                r"SOFTWARE\Microsoft\Windows\CurrentVersion\CapabilityAccessManager\ConsentStore\broadFileSystemAccess"
-            ]
-            for path in paths:
-                with winreg.CreateKey(winreg.HKEY_LOCAL_MACHINE, path) as key:
-                    winreg.SetValueEx(key, "Value", 0, winreg.REG_SZ, "Deny")
-                logger.info(f"Disable System File Access Consent: Set consent to Deny for {path.split('\\')[-1]}.")
-                logger.info(f"Command: reg add \"HKLM\\{path}\" /v \"Value\" /t REG_SZ /d \"Deny\" /f")
-            logger.info("Disable System File Access Consent: Applied registry changes for docs, pics, vids, broadFS.")
-        except Exception as e:
-            logger.error(f"Disable System File Access Consent failed: {str(e)}\n{traceback.format_exc()}")
+            result = self.processes.run(command, timeout=timeout, cancel=self.cancel_event, **options)
+        except subprocess.TimeoutExpired:
+            record_event(logger, "operation", kind=kind, target=line, duration=round(time.perf_counter() - started, 6),
+                         outcome="timeout", timeout=timeout, spawned=1)
             raise
-
-    def disable_account_info_access_consent(self, logger):
-        try:
-            key_path = r"SOFTWARE\Microsoft\Windows\CurrentVersion\CapabilityAccessManager\ConsentStore\userAccountInformation"
-            with winreg.CreateKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
-                winreg.SetValueEx(key, "Value", 0, winreg.REG_SZ, "Deny")
-            logger.info("Disable Account Info Access Consent: Set consent to Deny.")
-            logger.info(f"Command: reg add \"HKLM\\{key_path}\" /v \"Value\" /t REG_SZ /d \"Deny\" /f")
-        except Exception as e:
-            logger.error(f"Disable Account Info Access Consent failed: {str(e)}\n{traceback.format_exc()}")
+        except RunCancelled:
+            record_event(logger, "operation", kind=kind, target=line, duration=round(time.perf_counter() - started, 6),
+                         outcome="cancelled", spawned=1)
             raise
-
-    # --- Sync Settings (from comenzi.txt) ---
-    def disable_language_sync(self, logger):
-        try:
-            key_path = r"SOFTWARE\Microsoft\Windows\CurrentVersion\SettingSync\Groups\Language"
-            with winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path) as key:
-                 winreg.SetValueEx(key, "Enabled", 0, winreg.REG_DWORD, 0)
-            logger.info("Disable Language Sync: Applied registry change.")
-            logger.info(f"Command: reg add \"HKCU\\{key_path}\" /v \"Enabled\" /t REG_DWORD /d 0 /f")
         except Exception as e:
-            logger.error(f"Disable Language Sync failed: {str(e)}\n{traceback.format_exc()}")
+            record_event(logger, "operation", kind=kind, target=line, duration=round(time.perf_counter() - started, 6),
+                         outcome="error", error=str(e))
             raise
+        finally:
+            if item is not None:
+                record_event(logger, "output_progress", item=item, percent=None, detail="") # Clears the item's bar
+        output_bytes = getattr(result, "output_bytes", None)
+        record_event(logger, "operation", kind=kind, target=line, duration=round(time.perf_counter() - started, 6),
+                     outcome="ok" if result.returncode == 0 else "failed", returncode=result.returncode,
+                     spawned=1, output_bytes=output_size(result.stdout, result.stderr) if output_bytes is None else output_bytes)
+        if check and result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, command, output=result.stdout, stderr=result.stderr)
+        return result
+
+    def output_streamer(self, logger, command, item):
+        """on_output callback for a streamed command: plain lines go to the log as they
+        arrive, progress bar frames become output_progress events, throttled to one per
+        PROGRESS_EVENT_INTERVAL so a chatty installer cannot flood the panes."""
+        parser = progress_parser(command)
+        last = {"time": None, "percent": None}
+
+        def on_output(segment):
+            progress = parser.feed(segment) if parser is not None else None
+            if progress is None:
+                if segment.strip() not in SPINNER_FRAMES:
+                    logger.info(f"  {segment.strip()}")
+                return
+            now = time.monotonic()
+            finished = progress.percent is not None and progress.percent >= 100
+            if last["time"] is not None and now - last["time"] < PROGRESS_EVENT_INTERVAL and not (finished and last["percent"] != progress.percent):
+                return
+            last["time"], last["percent"] = now, progress.percent
+            record_event(logger, "output_progress", item=item, percent=progress.percent, detail=format_progress(progress))
+        return on_output
 
-    def disable_credentials_sync(self, logger):
+    def log_and_run_command(self, logger, command, description="", stream=False):
+        """Logs an argv command and then executes it. With `stream`, its output is logged while it runs."""
+        line = command_line(command)
+        if description:
+            logger.info(f"Executing: {description}")
+        logger.info(f"Command: {line}")
         try:
-            commands = [
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\SettingSync" /v "DisableCredentialsSettingSync" /t REG_DWORD /d 2 /f',
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\SettingSync" /v "DisableCredentialsSettingSyncUserOverride" /t REG_DWORD /d 1 /f',
-                'reg add "HKCU\\SOFTWARE\\Microsoft\\Windows\\CurrentVersion\\SettingSync\\Groups\\Credentials" /v "Enabled" /t REG_DWORD /d 0 /f'
-            ]
-            for cmd in commands:
-                self.log_and_run_command(logger, cmd)
-            logger.info("Disable Credentials Sync: Applied registry changes.")
+            result = self.run_process(logger, command, check=True, item=(description or line) if stream else None)
+            logger.info(f"Success: {description or line}")
+            # Optionally log stdout if needed for debugging specific commands
+            # if result.stdout.strip():
+            #     logger.debug(f"StdOut: {result.stdout.strip()}")
         except subprocess.CalledProcessError as e:
-            logger.error(f"Disable Credentials Sync failed (Registry error): {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"Disable Credentials Sync failed: {str(e)}\n{traceback.format_exc()}")
+            logger.error(f"Failed: {description or line}")
+            logger.error(f"Error: {e.stderr.strip() if e.stderr else str(e)}")
+            raise # Re-raise to be caught by the calling function
+        except subprocess.TimeoutExpired as e:
+            logger.error(f"Timed out after {e.timeout:g}s, process tree killed: {description or line}")
             raise
-
-    def disable_desktop_theme_sync(self, logger):
-        try:
-            commands = [
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\SettingSync" /v "DisableDesktopThemeSettingSync" /t REG_DWORD /d 2 /f',
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\SettingSync" /v "DisableDesktopThemeSettingSyncUserOverride" /t REG_DWORD /d 1 /f'
-            ]
-            for cmd in commands:
-                self.log_and_run_command(logger, cmd)
-            logger.info("Disable Desktop Theme Sync: Applied registry changes.")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Disable Desktop Theme Sync failed (Registry error): {str(e)}")
+        except RunCancelled:
+            logger.warning(f"Cancelled, process tree killed: {description or line}")
             raise
         except Exception as e:
-            logger.error(f"Disable Desktop Theme Sync failed: {str(e)}\n{traceback.format_exc()}")
+            logger.error(f"Unexpected error running command '{line}': {e}")
             raise
 
-    def disable_personalization_sync(self, logger):
+    def run_powershell(self, logger, script, description=""):
+        """Runs a script in the shared PowerShell session. Raises CalledProcessError on failure."""
+        if description:
+            logger.info(f"Executing: {description}")
+        logger.info(f"PowerShell: {script}")
+        with self.shell_lock:
+            if self.shell is None:
+                self.shell = self.shell_factory()
+        if self.cancelled:
+            raise RunCancelled(f"Cancelled: {description or script}")
+        starts = getattr(self.shell, "starts", 0)
+        timeout = self.command_timeout()
+        started = time.perf_counter()
         try:
-            commands = [
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\SettingSync" /v "DisablePersonalizationSettingSync" /t REG_DWORD /d 2 /f',
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\SettingSync" /v "DisablePersonalizationSettingSyncUserOverride" /t REG_DWORD /d 1 /f'
-            ]
-            for cmd in commands:
-                self.log_and_run_command(logger, cmd)
-            logger.info("Disable Personalization Sync: Applied registry changes.")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Disable Personalization Sync failed (Registry error): {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"Disable Personalization Sync failed: {str(e)}\n{traceback.format_exc()}")
+            result = self.shell.run(script, timeout=timeout, cancel=self.cancel_event)
+        except (subprocess.TimeoutExpired, RunCancelled) as e:
+            timed_out = isinstance(e, subprocess.TimeoutExpired)
+            record_event(logger, "operation", kind="powershell", target=description or script,
+                         duration=round(time.perf_counter() - started, 6), outcome="timeout" if timed_out else "cancelled")
+            if timed_out:
+                logger.error(f"Timed out after {timeout:g}s, PowerShell host killed: {description or script}")
+            else:
+                logger.warning(f"Cancelled, PowerShell host killed: {description or script}")
             raise
-
-    def disable_start_layout_sync(self, logger):
+        record_event(logger, "operation", kind="powershell", target=description or script,
+                     duration=round(time.perf_counter() - started, 6),
+                     outcome="ok" if result.returncode == 0 else "failed", returncode=result.returncode,
+                     spawned=getattr(self.shell, "starts", 0) - starts, output_bytes=output_size(result.stdout))
+        if result.returncode != 0:
+            logger.error(f"Failed: {description or script}")
+            logger.error(f"Error: {result.stdout.strip()}")
+            raise subprocess.CalledProcessError(result.returncode, script, output=result.stdout)
+        logger.info(f"Success: {description or script}")
+        return result
+
+    # --- Section 1 Handlers ---
+    def create_restore_point(self, logger):
         try:
-            commands = [
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\SettingSync" /v "DisableStartLayoutSettingSync" /t REG_DWORD /d 2 /f',
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\SettingSync" /v "DisableStartLayoutSettingSyncUserOverride" /t REG_DWORD /d 1 /f'
-            ]
-            for cmd in commands:
-                self.log_and_run_command(logger, cmd)
-            logger.info("Disable Start Layout Sync: Applied registry changes.")
+            self.run_powershell(logger, "Enable-ComputerRestore -Drive $env:SystemDrive", "Enable Computer Restore")
+            self.run_powershell(logger, "Checkpoint-Computer -Description 'Win11Optimizator Restore Point' -RestorePointType 'MODIFY_SETTINGS'", "Create Restore Point")
+            logger.info("Create Restore Point: Success")
         except subprocess.CalledProcessError as e:
-            logger.error(f"Disable Start Layout Sync failed (Registry error): {str(e)}")
+            logger.warning(f"Create Restore Point: Might have partially failed or requires manual check. Error: {e}")
+        except RunCancelled:
             raise
         except Exception as e:
-            logger.error(f"Disable Start Layout Sync failed: {str(e)}\n{traceback.format_exc()}")
+            logger.error(f"Create Restore Point failed: {str(e)}\n{traceback.format_exc()}")
             raise
 
-    def disable_application_sync(self, logger):
+    def delete_temp_files(self, logger):
         try:
-            commands = [
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\SettingSync" /v "DisableApplicationSettingSync" /t REG_DWORD /d 2 /f',
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\SettingSync" /v "DisableApplicationSettingSyncUserOverride" /t REG_DWORD /d 1 /f'
-            ]
-            for cmd in commands:
-                self.log_and_run_command(logger, cmd)
-            logger.info("Disable Application Sync: Applied registry changes.")
+            self.log_and_run_command(logger, delete_directory_contents(temp_directory()), "Delete Temporary Files")
+            script = '$bin = (New-Object -ComObject Shell.Application).NameSpace(10); $bin.items() | ForEach { Write-Output "Deleting $($_.Name) from Recycle Bin"; Remove-Item $_.Path -Recurse -Force }'
+            self.run_powershell(logger, script, "Empty Recycle Bin")
+            logger.info("Delete Temporary Files: Success")
         except subprocess.CalledProcessError as e:
-            logger.error(f"Disable Application Sync failed (Registry error): {str(e)}")
+            logger.warning(f"Delete Temporary Files: Some files might not have been deleted. Error: {e}")
+        except RunCancelled:
             raise
         except Exception as e:
-            logger.error(f"Disable Application Sync failed: {str(e)}\n{traceback.format_exc()}")
+            logger.error(f"Delete Temporary Files failed: {str(e)}\n{traceback.format_exc()}")
             raise
 
-    def disable_app_sync_setting_sync(self, logger):
+    def disable_hibernation(self, logger):
         try:
-            commands = [
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\SettingSync" /v "DisableAppSyncSettingSync" /t REG_DWORD /d 2 /f',
-                'reg add "HKLM\\SOFTWARE\\Policies\\Microsoft\\Windows\\SettingSync" /v "DisableAppSyncSettingSyncUserOverride" /t REG_DWORD /d 1 /f'
-            ]
-            for cmd in commands:
-                self.log_and_run_command(logger, cmd)
-            logger.info("Disable App Sync Setting Sync: Applied registry changes.")
+            self.log_and_run_command(logger, powercfg_hibernate(False), "Disable Hibernation")
+            logger.info("Disable Hibernation: Success")
         except subprocess.CalledProcessError as e:
-            logger.error(f"Disable App Sync Setting Sync failed (Registry error): {str(e)}")
+            logger.warning(f"Disable Hibernation: Command might have failed. Error: {e}")
+        except RunCancelled:
             raise
         except Exception as e:
-            logger.error(f"Disable App Sync Setting Sync failed: {str(e)}\n{traceback.format_exc()}")
+            logger.error(f"Disable Hibernation failed: {str(e)}\n{traceback.format_exc()}")
             raise
 
-    def disable_sync_on_paid_network(self, logger):
+    def disable_homegroup(self, logger):
         try:
-            key_path = r"SOFTWARE\Policies\Microsoft\Windows\SettingSync"
-            with winreg.CreateKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
-                winreg.SetValueEx(key, "DisableSyncOnPaidNetwork", 0, winreg.REG_DWORD, 1)
-            logger.info("Disable Sync on Paid Network: Applied registry change.")
-            logger.info(f"Command: reg add \"HKLM\\{key_path}\" /v \"DisableSyncOnPaidNetwork\" /t REG_DWORD /d 1 /f")
-        except Exception as e:
-            logger.error(f"Disable Sync on Paid Network failed: {str(e)}\n{traceback.format_exc()}")
-            raise
-
-    # --- Section 2: Advanced Tweaks ---
-    def create_section2(self):
-       try:
-            frame = ttk.Frame(self.section_container, style=f"{self.current_theme.capitalize()}.TFrame")
-            self.sections.append(frame)
-
-            tweaks = [
-                "Block Adobe Network",
-                "Remove Edge",
-                "Debloat Edge",
-                "Remove Microsoft Apps",
-                "Install Chrome",
-                "Install Firefox"
-            ]
-            self.section2_vars = {tweak: BooleanVar(value=False) for tweak in tweaks}
-
-            # --- Layout Split ---
-            left_frame = ttk.Frame(frame, style=f"{self.current_theme.capitalize()}.TFrame")
-            left_frame.pack(side="left", fill="both", expand=True, padx=(0, 5))
-
-            right_frame = ttk.Frame(frame, width=400, style=f"{self.current_theme.capitalize()}.TFrame")
-            right_frame.pack_propagate(False)
-            right_frame.pack(side="right", fill="y", padx=(5, 0))
-
-            # --- Left Column: Checkboxes ---
-            canvas = tk.Canvas(left_frame, bg=self.style.lookup(f"{self.current_theme.capitalize()}.TFrame", 'background'), highlightthickness=0)
-            scrollbar = ttk.Scrollbar(left_frame, orient="vertical", command=canvas.yview, style="Vertical.TScrollbar")
-            scrollable_frame = ttk.Frame(canvas, style=f"{self.current_theme.capitalize()}.TFrame")
-
-            scrollable_frame.bind(
-                "<Configure>",
-                lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-            )
-
-            canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-            canvas.configure(yscrollcommand=scrollbar.set)
-
-            # --- Bind Mousewheel to Scrollable Frame for Section 2 ---
-            scrollable_frame.bind("<MouseWheel>", lambda event: canvas.yview_scroll(int(-1*(event.delta/120)), "units"))
-            canvas.bind("<MouseWheel>", lambda event: canvas.yview_scroll(int(-1*(event.delta/120)), "units"))
-            # --- End Mousewheel Binding ---
-
-            for i, tweak in enumerate(tweaks):
-                chk = ttk.Checkbutton(
-                    scrollable_frame,
-                    text=tweak,
-                    variable=self.section2_vars[tweak],
-                    command=lambda t=tweak: logging.info(f"Section2 {t}: Toggled to {self.section2_vars[t].get()}"),
-                    style=f"{self.current_theme.capitalize()}.TCheckbutton"
-                )
-                chk.grid(row=i, column=0, sticky="w", padx=10, pady=5)
-
-            canvas.pack(side="left", fill="both", expand=True)
-            scrollbar.pack(side="right", fill="y")
-
-            # --- Right Column: Execution Output ---
-            output_label = ttk.Label(right_frame, text="Execution Output:", font=("Segoe UI", 10, "bold"), style=f"{self.current_theme.capitalize()}.TLabel")
-            output_label.pack(anchor="w", padx=5, pady=(5, 0))
-
-            self.output_text2 = tk.Text(right_frame, state='disabled', wrap='word',
-                                        bg='black' if self.current_theme == 'dark' else 'white',
-                                        fg='white' if self.current_theme == 'dark' else 'black')
-            output_scrollbar = ttk.Scrollbar(right_frame, orient="vertical", command=self.output_text2.yview, style="Vertical.TScrollbar")
-            self.output_text2.configure(yscrollcommand=output_scrollbar.set)
-
-            self.output_text2.pack(side="left", fill="both", expand=True, padx=(5, 0), pady=5)
-            output_scrollbar.pack(side="right", fill="y", pady=5, padx=(0, 5))
-
-            # --- Bottom Frame (MOVED to LEFT FRAME) ---
-            bottom_frame = ttk.Frame(left_frame, style=f"{self.current_theme.capitalize()}.TFrame") # Changed parent to left_frame
-            bottom_frame.pack(side="bottom", fill="x", padx=10, pady=10) # Adjusted padding if needed
-
-            self.progress2 = ttk.Progressbar(bottom_frame, orient="horizontal", mode="determinate", length=300)
-            self.progress2.pack(side="left", fill="x", expand=True, padx=(0, 10))
-
-            execute_btn = ttk.Button(
-                bottom_frame,
-                text="Execute",
-                command=lambda: threading.Thread(target=self.execute_section2, daemon=True).start(),
-                style='Green.TButton'
-            )
-            execute_btn.pack(side="right")
-
-            logging.info("Section 2 created successfully")
-       except Exception as e:
-            logging.error(f"Create section 2 failed: {str(e)}\n{traceback.format_exc()}")
+            self.configure_services(logger, {service: "disabled" for service in HOMEGROUP_SERVICES}, "Disable Homegroup")
+            logger.info("Disable Homegroup: Success")
+        except subprocess.CalledProcessError as e:
+            logger.warning(f"Disable Homegroup: Service config might have failed. Error: {e}")
+        except RunCancelled:
+            raise
+        except Exception as e:
+            logger.error(f"Disable Homegroup failed: {str(e)}\n{traceback.format_exc()}")
             raise
 
-    def execute_section2(self):
+    def run_disk_cleanup(self, logger):
         try:
-            if not hasattr(self, 'output_text2'):
-                logging.error("Output text widget for section 2 not found.")
-                return
+            cmd = cleanmgr_sagerun(1)
+            logger.info("Run Disk Cleanup: Initiated (command will open Disk Cleanup window)")
+            logger.info(f"Command: {command_line(cmd)}")
+            started = time.perf_counter()
+            self.processes.launch(cmd) # Do not block on the Disk Cleanup window
+            record_event(logger, "operation", kind="command", target=command_line(cmd), duration=round(time.perf_counter() - started, 6),
+                         outcome="launched", spawned=1)
+            logger.info("Run Disk Cleanup: Command sent.")
+        except Exception as e:
+            logger.error(f"Run Disk Cleanup failed: {str(e)}\n{traceback.format_exc()}")
+            raise
 
-            exec_logger = logging.getLogger(f"Section2_Exec_{threading.get_ident()}")
-            exec_logger.setLevel(logging.INFO)
-            exec_logger.handlers.clear()
-            text_handler = TextHandler(self.output_text2)
-            formatter = logging.Formatter("[%(asctime)s] %(levelname)s: %(message)s", datefmt='%H:%M:%S')
-            text_handler.setFormatter(formatter)
-            exec_logger.addHandler(text_handler)
+    def set_powershell7_default(self, logger):
+        try:
+            logger.warning("Change Windows Terminal default: PowerShell 5 -> PowerShell 7: Placeholder - Implementation depends on specific setup.")
+        except Exception as e:
+            logger.error(f"Set PowerShell 7 default failed: {str(e)}\n{traceback.format_exc()}")
+            raise
 
-            selected = [name for name, var in self.section2_vars.items() if var.get()]
-            if not selected:
-                exec_logger.info("No options selected for execution.")
-                logging.info("Section2: No options selected for execution.")
-                return
+    def disable_powershell7_telemetry(self, logger):
+        try:
+             logger.warning("Disable Powershell 7 Telemetry: Placeholder - Implementation depends on specific setup.")
+        except Exception as e:
+            logger.error(f"Disable Powershell 7 Telemetry failed: {str(e)}\n{traceback.format_exc()}")
+            raise
 
-            self.progress2["value"] = 0
-            self.progress2["maximum"] = len(selected)
+    def disable_recall(self, logger):
+        try:
+            self.log_and_run_command(logger, dism_set_feature("Recall", False), "Disable Recall Feature", stream=True)
+            logger.info("Disable Recall: Command executed.")
+        except subprocess.CalledProcessError as e:
+            logger.warning(f"Disable Recall: DISM command might have failed or feature not found. Error: {e}")
+        except RunCancelled:
+            raise
+        except Exception as e:
+            logger.error(f"Disable Recall failed: {str(e)}\n{traceback.format_exc()}")
+            raise
 
-            self.output_text2.configure(state='normal')
-            self.output_text2.delete(1.0, tk.END)
-            self.output_text2.configure(state='disabled')
+    def set_hibernation_default(self, logger):
+        try:
+            self.log_and_run_command(logger, powercfg_hibernate(True), "Enable Hibernation")
+            self.log_and_run_command(logger, powercfg_set_active("SCHEME_MIN"), "Set Power Scheme to High Performance (often uses hibernation)")
+            logger.info("Set Hibernation as default: Success (set to High Performance scheme)")
+        except subprocess.CalledProcessError as e:
+            logger.warning(f"Set Hibernation as default: Command might have failed. Error: {e}")
+        except RunCancelled:
+            raise
+        except Exception as e:
+            logger.error(f"Set Hibernation as default failed: {str(e)}\n{traceback.format_exc()}")
+            raise
 
-            for i, option in enumerate(selected):
-                try:
-                    exec_logger.info(f"Starting: {option}")
-                    if option == "Block Adobe Network":
-                        self.adobe_network_block(exec_logger)
-                    elif option == "Remove Edge":
-                        self.remove_edge(exec_logger) # Warning: Destructive
-                    elif option == "Debloat Edge":
-                        self.debloat_edge(exec_logger)
-                    elif option == "Remove Microsoft Apps":
-                        self.remove_microsoft_apps(exec_logger)
-                    elif option == "Install Chrome":
-                        self.install_software(exec_logger, "Google Chrome", "Google.Chrome")
-                    elif option == "Install Firefox":
-                        self.install_software(exec_logger, "Mozilla Firefox", "Mozilla.Firefox")
-                    exec_logger.info(f"Completed: {option}")
-                    logging.info(f"Section2 {option}: Enabled")
-                    self.progress2["value"] = i + 1
-                    self.progress2.update()
-                except Exception as e:
-                    error_msg = f"Failed: {option} - {str(e)}"
-                    exec_logger.error(error_msg)
-                    logging.error(f"Section2 {option}: Failed - {str(e)}\n{traceback.format_exc()}")
+    def set_services_manual(self, logger):
+        try:
+            services = load_service_profile(self.service_profile)
+            self.configure_services(logger, services, "Set Services to Manual")
+        except RunCancelled:
+            raise
+        except Exception as e:
+            logger.error(f"Set Services to Manual failed: {str(e)}\n{traceback.format_exc()}")
+            raise
 
-            for name, var in self.section2_vars.items():
-                var.set(False)
+    def debloat_brave(self, logger):
+        try:
+            logger.warning("Debloat Brave: Placeholder - Implementation depends on specific Brave components to remove.")
+        except Exception as e:
+            logger.error(f"Debloat Brave failed: {str(e)}\n{traceback.format_exc()}")
+            raise
 
-            exec_logger.info(f"Execution Complete: Applied {len(selected)} tweaks!")
-            logging.info(f"Section2: Finished applying {len(selected)} tweaks")
+    def debloat_edge(self, logger):
+        try:
+            logger.warning("Debloat Edge: Placeholder - Implementation depends on specific Edge components to remove.")
+        except Exception as e:
+            logger.error(f"Debloat Edge failed: {str(e)}\n{traceback.format_exc()}")
+            raise
 
+    def disable_nvidia_telemetry_tasks(self, logger):
+        try:
+            self.set_tasks_enabled(logger, NVIDIA_TELEMETRY_TASKS, False, "Disable 3rd-party apps Telemetry (NVIDIA)")
+        except RunCancelled:
+            raise
         except Exception as e:
-            logging.error(f"Execute section 2 failed: {str(e)}\n{traceback.format_exc()}")
-            if hasattr(self, 'output_text2'):
-                try:
-                    fatal_logger = logging.getLogger(f"Section2_Exec_{threading.get_ident()}")
-                    if not fatal_logger.handlers:
-                        fatal_logger.addHandler(TextHandler(self.output_text2))
-                        fatal_logger.setLevel(logging.ERROR)
-                    fatal_logger.error(f"Execution Failed: {str(e)}")
-                except:
-                    pass
+            logger.error(f"Disable 3rd-party apps Telemetry (NVIDIA tasks) failed: {str(e)}\n{traceback.format_exc()}")
             raise
 
-    # --- Section 2 Methods (Updated to accept logger) ---
-    def adobe_network_block(self, logger):
+    def disable_intellicode_remote_analysis(self, logger):
         try:
-            key_path = r"SOFTWARE\Policies\Adobe\Acrobat Reader\DC\FeatureLockDown\cCloud"
-            with winreg.CreateKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
-                winreg.SetValueEx(key, "bAdobeSendPluginToggle", 0, winreg.REG_DWORD, 1)
-            logger.info("Adobe Network Block: Applied registry change.")
-            logger.info(f"Command: reg add \"HKLM\\{key_path}\" /v \"bAdobeSendPluginToggle\" /t REG_DWORD /d 1 /f")
+            logger.info("Disable IntelliCode Remote Analysis: Already handled in 3rd-party telemetry disable.")
         except Exception as e:
-            logger.error(f"Adobe Network Block failed: {str(e)}\n{traceback.format_exc()}")
+            logger.error(f"Disable IntelliCode Remote Analysis failed: {str(e)}\n{traceback.format_exc()}")
             raise
 
+    # --- Section 2 Handlers ---
     def remove_edge(self, logger):
         try:
             logger.warning("Remove Edge: This is a complex and potentially unstable operation.")
             logger.warning("Remove Edge: Attempting removal via winget (may not fully succeed)...")
-            logger.info("Command: winget uninstall \"Microsoft Edge\"")
-            result = subprocess.run('winget uninstall "Microsoft Edge"', shell=True, capture_output=True, text=True)
+            cmd = winget_uninstall("Microsoft Edge")
+            logger.info(f"Command: {command_line(cmd)}")
+            result = self.run_process(logger, cmd, kind="winget", item="Microsoft Edge")
             if result.returncode == 0:
                 logger.info("Remove Edge: Winget command initiated.")
-                logging.info("Remove Edge: Winget command initiated.")
             else:
-                logger.error("Remove Edge: Winget command failed or Edge not found via winget.")
-                logging.error("Remove Edge: Winget command failed or Edge not found via winget.")
-                logging.error(f"Remove Edge: Winget output: {result.stdout}\nError: {result.stderr}")
+                logger.error("Remove Edge: Winget command failed or Edge not found via winget.") # Its output was streamed to the log
+        except RunCancelled:
+            raise
         except Exception as e:
             logger.error(f"Remove Edge failed: {str(e)}\n{traceback.format_exc()}")
             raise
 
-    def remove_microsoft_apps(self, logger):
+    def list_appx_packages(self, logger):
+        """One inventory pass over the package store. Returns {package name: [full names]}."""
+        result = self.run_powershell(logger, "Get-AppxPackage | ForEach-Object { $_.Name + '|' + $_.PackageFullName }", "List installed Appx packages")
+        installed = {}
+        for line in result.stdout.splitlines():
+            name, sep, full_name = line.strip().partition("|")
+            if sep:
+                installed.setdefault(name, []).append(full_name)
+        return installed
+
+    def remove_appx_packages(self, logger, full_names):
+        """Removes packages in one batched pipeline. Returns {full name: error message or None}."""
+        if not full_names:
+            return {}
+        quoted = ", ".join(powershell_quote(name) for name in full_names)
+        script = (
+            f"foreach ($p in @({quoted})) {{ "
+            "try { Remove-AppxPackage -Package $p -ErrorAction Stop; Write-Output ('OK|' + $p) } "
+            "catch { Write-Output ('FAIL|' + $p + '|' + $_.Exception.Message) } }; $Error.Clear()"
+        )
+        result = self.run_powershell(logger, script, f"Remove {len(full_names)} Appx package(s)")
+        outcome = {}
+        for line in result.stdout.splitlines():
+            status, _, rest = line.strip().partition("|")
+            full_name, _, message = rest.partition("|")
+            if status == "OK":
+                outcome[full_name] = None
+            elif status == "FAIL":
+                outcome[full_name] = message or "unknown error"
+        for full_name in full_names:
+            outcome.setdefault(full_name, "no result reported")
+        return outcome
+
+    def remove_microsoft_apps(self, logger, apps_to_remove=None):
         try:
-            apps_to_remove = [
-                "MicrosoftCorporationII.MicrosoftFamily",
-                "Microsoft.OutlookForWindows",
-                "Clipchamp.Clipchamp",
-                "Microsoft.3DBuilder",
-                "Microsoft.Microsoft3DViewer",
-                "Microsoft.BingWeather",
-                "Microsoft.BingSports",
-                "Microsoft.BingFinance",
-                "Microsoft.MicrosoftOfficeHub",
-                "Microsoft.BingNews",
-                "Microsoft.Office.OneNote",
-                "Microsoft.Office.Sway",
-                "Microsoft.WindowsPhone",
-                "Microsoft.CommsPhone",
-                "Microsoft.YourPhone",
-                "Microsoft.Getstarted",
-                "Microsoft.549981C3F5F10", # Cortana
-                "Microsoft.Messaging",
-                "Microsoft.WindowsSoundRecorder",
-                "Microsoft.MixedReality.Portal",
-                "Microsoft.WindowsFeedbackHub",
-                "Microsoft.WindowsAlarms",
-                "Microsoft.WindowsCamera",
-                "Microsoft.MSPaint",
-                "Microsoft.WindowsMaps",
-                "Microsoft.MinecraftUWP",
-                "Microsoft.People",
-                "Microsoft.Wallet",
-                "Microsoft.Print3D",
-                # --- More from comenzi.txt ---
-                "king.com.CandyCrushSodaSaga",
-                "ShazamEntertainmentLtd.Shazam",
-                "Flipboard.Flipboard",
-                "9E2F88E3.Twitter", # Old Twitter package
-                "ClearChannelRadioDigital.iHeartRadio",
-                "D5EA27B7.Duolingo-LearnLanguagesforFree",
-                "AdobeSystemsIncorporated.AdobePhotoshopExpress",
-                "PandoraMediaInc.29680B314EFC2",
-                "46928bounde.EclipseManager",
-                "ActiproSoftwareLLC.562882FEEB491",
-                "SpotifyAB.Spotify", # If removing Spotify app
-                # --- Media Extensions ---
-                "Microsoft.WebpImageExtension",
-                "Microsoft.HEVCVideoExtension",
-                "Microsoft.RawImageExtension",
-                "Microsoft.WebMediaExtensions"
-            ]
-
-            failed_apps = []
-            for app in apps_to_remove:
-                try:
-                    cmd = f'PowerShell -ExecutionPolicy Unrestricted -Command "Get-AppxPackage \\"{app}\\"| Remove-AppxPackage"'
-                    logger.info(f"Removing App: {app}")
-                    logger.info(f"Command: {cmd}")
-                    result = subprocess.run(cmd, shell=True, capture_output=True, text=True, check=True)
-                    logger.info(f"Remove Microsoft App '{app}': Success")
-                except subprocess.CalledProcessError as e:
-                    logger.warning(f"Remove Microsoft App '{app}': Might not be installed or failed. Error: {e}")
-                    logger.warning(f"Remove Microsoft App '{app}': Stdout: {e.stdout}, Stderr: {e.stderr}")
-                    failed_apps.append(app)
-                except Exception as e:
-                    logger.error(f"Remove Microsoft App '{app}' failed unexpectedly: {str(e)}")
-                    failed_apps.append(app)
-
+            apps_to_remove = apps_to_remove if apps_to_remove is not None else MICROSOFT_APPS_TO_REMOVE
+            installed = self.list_appx_packages(logger)
+            present = [app for app in apps_to_remove if app in installed]
+            absent = [app for app in apps_to_remove if app not in installed]
+
+            targets = {full_name: app for app in present for full_name in installed[app]}
+            outcome = self.remove_appx_packages(logger, list(targets))
+            failed_apps = sorted({targets[full_name] for full_name, error in outcome.items() if error})
+            removed_apps = [app for app in present if app not in failed_apps]
+            for full_name, error in outcome.items():
+                if error:
+                    logger.warning(f"Remove Microsoft App '{targets[full_name]}': Failed ({full_name}). Error: {error}")
+                else:
+                    logger.info(f"Remove Microsoft App '{targets[full_name]}': Success ({full_name})")
+
+            logger.info(f"Remove Microsoft Apps: {len(removed_apps)} removed, {len(absent)} already absent, {len(failed_apps)} failed.")
+            if absent:
+                logger.info(f"Remove Microsoft Apps: Already absent: {', '.join(absent)}")
             if failed_apps:
-                logger.info(f"Remove Microsoft Apps: Finished. Apps that might not have been removed or failed: {', '.join(failed_apps)}")
-            else:
-                logger.info("Remove Microsoft Apps: All targeted apps processed.")
+                logger.warning(f"Remove Microsoft Apps: Failed: {', '.join(failed_apps)}")
+            return {"removed": removed_apps, "absent": absent, "failed": failed_apps}
 
+        except RunCancelled:
+            raise
         except Exception as e:
             logger.error(f"Remove Microsoft Apps failed: {str(e)}\n{traceback.format_exc()}")
             raise
 
-
     def install_software(self, logger, name, package_id):
         try:
             if not package_id:
                 logger.warning(f"Install {name}: No package ID provided, skipping.")
                 return
-            cmd = f'winget install --id {package_id} -e --accept-source-agreements --accept-package-agreements'
+            cmd = winget_install(package_id)
             logger.info(f"Installing {name}...")
-            logger.info(f"Command: {cmd}")
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+            logger.info(f"Command: {command_line(cmd)}")
+            result = self.run_process(logger, cmd, kind="winget", item=name)
             if result.returncode == 0:
                 logger.info(f"Install {name}: Success")
+            elif exit_code(result.returncode) == WINGET_ALREADY_INSTALLED:
+                logger.info(f"Install {name}: Already installed")
             else:
-                logger.error(f"Install {name}: Failed - {result.stderr}")
+                logger.error(f"Install {name}: Failed (exit code {result.returncode}) - {result.stdout.splitlines()[-1] if result.stdout.strip() else 'no output'}")
                 raise Exception(f"Installation of {name} failed")
+        except RunCancelled:
+            raise
         except Exception as e:
             logger.error(f"Install {name} failed: {str(e)}\n{traceback.format_exc()}")
             raise
 
-    # --- Section 3: Customize Preferences ---
-    def create_section3(self):
+    # --- Section 3 Handlers ---
+    def disable_intel_mm(self, logger):
         try:
-            frame = ttk.Frame(self.section_container, style=f"{self.current_theme.capitalize()}.TFrame")
-            self.sections.append(frame)
-
-            tweaks = [
-                "Disable Background Apps",
-                "Disable Fullscreen Optimizations",
-                "Disable Copilot",
-                "Disable Intel MM",
-                "Set Display for Performance",
-                "Set Classic Right Click Menu",
-                "Enable End Task With Right Click",
-                "Hide Search Button",
-                "Hide Task View Button",
-                "Enable Snap Window",
-                "Enable Snap Assist Flyout",
-                "Enable Snap Assist Suggestion",
-                "Enable Mouse Acceleration",
-                "Enable Sticky Keys",
-                "Show Hidden Files",
-                "Show File Extensions",
-                "Enable S3 Sleep"
-            ]
-            self.section3_vars = {tweak: BooleanVar(value=False) for tweak in tweaks}
+            logger.warning("disable_intel_mm: Placeholder function, implementation needed (e.g., disable Intel ME service)")
+        except Exception as e:
+            logger.error(f"Disable Intel MM failed: {str(e)}\n{traceback.format_exc()}")
+            raise
 
-            # --- Layout Split ---
-            left_frame = ttk.Frame(frame, style=f"{self.current_theme.capitalize()}.TFrame")
-            left_frame.pack(side="left", fill="both", expand=True, padx=(0, 5))
+    def enable_s3_sleep(self, logger):
+        try:
+            logger.info("Enable S3 Sleep: Command 'powercfg /setactive SCHEME_CURRENT' executed. Ensure S3 is enabled in BIOS/UEFI and power plan settings.")
+            cmd = powercfg_set_active("SCHEME_CURRENT")
+            logger.info(f"Command: {command_line(cmd)}")
+            self.run_process(logger, cmd, kind="powercfg", check=True)
+        except subprocess.CalledProcessError as e:
+            logger.warning(f"Enable S3 Sleep: Command might have failed or S3 not supported. Error: {e}")
+        except RunCancelled:
+            raise
+        except Exception as e:
+            logger.error(f"Enable S3 sleep failed: {str(e)}\n{traceback.format_exc()}")
+            raise
 
-            right_frame = ttk.Frame(frame, width=400, style=f"{self.current_theme.capitalize()}.TFrame")
-            right_frame.pack_propagate(False)
-            right_frame.pack(side="right", fill="y", padx=(5, 0))
+# --- Output Panes ---
+# Worker threads only append to a queue; the Tk loop drains it on a fixed tick and
+# inserts everything pending in one call, so a burst of records costs one redraw.
+LOG_DRAIN_INTERVAL_MS = 50
+LOG_PANE_MAX_LINES = 5000 # Older lines are dropped from the top of the pane
 
-            # --- Left Column: Checkboxes ---
-            canvas = tk.Canvas(left_frame, bg=self.style.lookup(f"{self.current_theme.capitalize()}.TFrame", 'background'), highlightthickness=0)
-            scrollbar = ttk.Scrollbar(left_frame, orient="vertical", command=canvas.yview, style="Vertical.TScrollbar")
-            scrollable_frame = ttk.Frame(canvas, style=f"{self.current_theme.capitalize()}.TFrame")
+class LogPane:
+    """Thread-safe, coalescing writer for an output Text widget, bounded to max_lines."""
+    CLEAR = object() # Queued marker: empty the pane
 
-            scrollable_frame.bind(
-                "<Configure>",
-                lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-            )
+    def __init__(self, text_widget, max_lines=LOG_PANE_MAX_LINES, interval_ms=LOG_DRAIN_INTERVAL_MS):
+        self.text_widget = text_widget
+        self.max_lines = max_lines
+        self.interval_ms = interval_ms # None: the owner calls flush() from its own tick
+        self.pending = deque() # append/popleft are atomic, no lock needed
+        self.rendered = 0 # Lines inserted so far
+        if self.interval_ms is not None:
+            self.text_widget.after(self.interval_ms, self.drain)
 
-            canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-            canvas.configure(yscrollcommand=scrollbar.set)
+    def write(self, line):
+        self.pending.append(line)
 
-            # --- Bind Mousewheel to Scrollable Frame for Section 3 ---
-            scrollable_frame.bind("<MouseWheel>", lambda event: canvas.yview_scroll(int(-1*(event.delta/120)), "units"))
-            canvas.bind("<MouseWheel>", lambda event: canvas.yview_scroll(int(-1*(event.delta/120)), "units"))
-            # --- End Mousewheel Binding ---
+    def clear(self):
+        self.pending.append(LogPane.CLEAR)
 
-            for i, tweak in enumerate(tweaks):
-                chk = ttk.Checkbutton(
-                    scrollable_frame,
-                    text=tweak,
-                    variable=self.section3_vars[tweak],
-                    command=lambda t=tweak: logging.info(f"Section3 {t}: Toggled to {self.section3_vars[t].get()}"),
-                    style=f"{self.current_theme.capitalize()}.TCheckbutton"
-                )
-                chk.grid(row=i, column=0, sticky="w", padx=10, pady=5)
+    def drain(self):
+        try:
+            self.flush()
+        except tk.TclError:
+            return # Widget destroyed: stop ticking
+        self.text_widget.after(self.interval_ms, self.drain)
+
+    def flush(self):
+        """Insert every pending line in one call. Must run on the Tk thread."""
+        lines = []
+        clear = False
+        while self.pending:
+            item = self.pending.popleft()
+            if item is LogPane.CLEAR:
+                lines = []
+                clear = True
+            else:
+                lines.append(item)
+        if not lines and not clear:
+            return 0
+        lines = lines[-self.max_lines:]
+        widget = self.text_widget
+        widget.configure(state='normal')
+        if clear:
+            widget.delete(1.0, tk.END)
+        if lines:
+            widget.insert(tk.END, "\n".join(lines) + "\n")
+        excess = int(widget.index("end-1c").split(".")[0]) - 1 - self.max_lines
+        if excess > 0:
+            widget.delete(1.0, f"{excess + 1}.0")
+        widget.configure(state='disabled')
+        widget.see(tk.END)
+        self.rendered += len(lines)
+        return len(lines)
+
+def benchmark_log_rendering(records=5000):
+    """Records/second rendered by the previous per-record after(0) handler and by LogPane.
+
+    A worker thread emits the records while the Tk loop renders them; the clock stops
+    when the last line is in the widget. Needs a display.
+    """
+    load_gui_modules()
+    root = tk.Tk()
+    root.withdraw()
+    results = {}
+    try:
+        # The original TextHandler: one after(0) callback, state toggle, insert and see() per record
+        text = tk.Text(root)
+        rendered = [0]
+        def legacy_write(msg):
+            def append():
+                text.configure(state='normal')
+                text.insert(tk.END, msg + '\n')
+                text.configure(state='disabled')
+                text.see(tk.END)
+                rendered[0] += 1
+            text.after(0, append)
+        pane = LogPane(tk.Text(root))
+        for name, write, done in (("per-record after()", legacy_write, lambda: rendered[0]),
+                                  ("coalesced LogPane", pane.write, lambda: pane.rendered)):
+            start = time.perf_counter()
+            producer = threading.Thread(target=lambda: [write(f"[00:00:00] INFO: record {i}") for i in range(records)])
+            producer.start()
+            while done() < records:
+                root.update()
+            producer.join()
+            results[name] = records / (time.perf_counter() - start)
+    finally:
+        root.destroy()
+    return results
 
-            canvas.pack(side="left", fill="both", expand=True)
-            scrollbar.pack(side="right", fill="y")
+# --- Main Application Class ---
+UI_EVENT_INTERVAL_MS = 50 # Event bus drain period; progress bars redraw at most this often
+SLOWEST_TWEAKS_SHOWN = 8 # Rows of the per-section "slowest tweaks" table
+CLOSE_WAIT_SECONDS = 10 # How long closing the window waits for a cancelled run to stop
 
-            # --- Right Column: Execution Output ---
-            output_label = ttk.Label(right_frame, text="Execution Output:", font=("Segoe UI", 10, "bold"), style=f"{self.current_theme.capitalize()}.TLabel")
-            output_label.pack(anchor="w", padx=5, pady=(5, 0))
+class Win11Optimizator:
+    def __init__(self, root, profile=()):
+        self.root = root
+        self.profile = set(profile) # Profiling targets (see PROFILE_ENV)
+        self.root.title(f"{APP_NAME} v{APP_VERSION}")
+        # Setează fereastra să pornească maximizată, păstrând barele de titlu și butoanele
+        try:
+            self.root.state('zoomed')
+        except tk.TclError: # X11 has no 'zoomed' state
+            self.root.attributes('-zoomed', True)
 
-            self.output_text3 = tk.Text(right_frame, state='disabled', wrap='word',
-                                        bg='black' if self.current_theme == 'dark' else 'white',
-                                        fg='white' if self.current_theme == 'dark' else 'black')
-            output_scrollbar = ttk.Scrollbar(right_frame, orient="vertical", command=self.output_text3.yview, style="Vertical.TScrollbar")
-            self.output_text3.configure(yscrollcommand=output_scrollbar.set)
+        try:
+            # self.root.iconbitmap(resource_path("icon.ico"))
+            pass
+        except tk.TclError:
+            logging.warning("Icon file 'icon.ico' not found. Using default icon.")
 
-            self.output_text3.pack(side="left", fill="both", expand=True, padx=(5, 0), pady=5)
-            output_scrollbar.pack(side="right", fill="y", pady=5, padx=(0, 5))
+        # --- Style Configuration ---
+        self.style = ttk.Style()
+        self.current_theme = "light" # Default theme
+        self.configure_styles()
 
-            # --- Bottom Frame (MOVED to LEFT FRAME) ---
-            bottom_frame = ttk.Frame(left_frame, style=f"{self.current_theme.capitalize()}.TFrame") # Changed parent to left_frame
-            bottom_frame.pack(side="bottom", fill="x", padx=10, pady=10) # Adjusted padding if needed
+        # --- Menu Bar ---
+        #self.create_menu()
 
-            self.progress3 = ttk.Progressbar(bottom_frame, orient="horizontal", mode="determinate", length=300)
-            self.progress3.pack(side="left", fill="x", expand=True, padx=(0, 10))
+        # --- Tweak Engine (catalog dispatch, in-process registry writes) ---
+        self.engine = TweakEngine()
 
-            execute_btn = ttk.Button(
-                bottom_frame,
-                text="Execute",
-                command=lambda: threading.Thread(target=self.execute_section3, daemon=True).start(),
-                style='Green.TButton'
-            )
-            execute_btn.pack(side="right")
+        # --- Main Container ---
+        self.main_frame = ttk.Frame(root) # Main frame for overall theme application
+        self.main_frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
 
-            logging.info("Section 3 created successfully")
-        except Exception as e:
-            logging.error(f"Create section 3 failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+        # --- Section Navigation Buttons ---
+        self.nav_frame = ttk.Frame(self.main_frame) # Store nav_frame reference
+        self.nav_frame.pack(fill="x", pady=(0, 10))
 
-    def execute_section3(self):
-        try:
-            if not hasattr(self, 'output_text3'):
-                logging.error("Output text widget for section 3 not found.")
-                return
+        self.nav_buttons = []
+        for i, text in enumerate(section["title"] for section in SECTIONS):
+            # Create button with green style
+            btn = ttk.Button(self.nav_frame, text=text, command=lambda idx=i: self.show_section(idx), style='Green.TButton')
+            btn.pack(side="left", padx=5, pady=2) # Add small pady for spacing
+            self.nav_buttons.append(btn)
+
+        # --- Additional Buttons (Toggle Theme, Export, Import, About) ---
+        self.theme_toggle_btn = ttk.Button(self.nav_frame, text="Light/Dark Theme", command=self.toggle_theme, style='Green.TButton')
+        self.theme_toggle_btn.pack(side="left", padx=5, pady=2)
+
+        self.export_btn = ttk.Button(self.nav_frame, text="Export", command=self.export_config, style='Green.TButton')
+        self.export_btn.pack(side="left", padx=5, pady=2)
+
+        self.import_btn = ttk.Button(self.nav_frame, text="Import", command=self.import_config, style='Green.TButton')
+        self.import_btn.pack(side="left", padx=5, pady=2)
+
+        self.apply_all_btn = ttk.Button(self.nav_frame, text="Apply All Sections", command=self.execute_all_sections, style='Green.TButton')
+        self.apply_all_btn.pack(side="left", padx=5, pady=2)
+
+        self.revert_btn = ttk.Button(self.nav_frame, text="Revert Run", command=self.revert_run, style='Green.TButton')
+        self.revert_btn.pack(side="left", padx=5, pady=2)
+
+        self.cancel_btn = ttk.Button(self.nav_frame, text="Cancel Run", command=self.cancel_run, style='Green.TButton')
+        self.cancel_btn.pack(side="left", padx=5, pady=2)
+
+        self.about_btn = ttk.Button(self.nav_frame, text="About", command=self.show_about, style='Green.TButton')
+        self.about_btn.pack(side="left", padx=5, pady=2)
+
+        # --- Section Container ---
+        self.section_container = ttk.Frame(self.main_frame)
+        self.section_container.pack(fill="both", expand=True)
+
+        # --- Initialize Sections ---
+        # Selections exist up front (Import/Export and Apply All need them); the widgets
+        # of a section are only built the first time it is shown.
+        self.section_vars = [{tweak_id: BooleanVar(value=False) for tweak_id in layout["tweaks"]} for layout in SECTIONS]
+        self.sections = [None] * len(SECTIONS)
+        self.output_texts = [None] * len(SECTIONS)
+        self.log_panes = [None] * len(SECTIONS)
+        self.progress_bars = [None] * len(SECTIONS)
+        self.item_progress = [None] * len(SECTIONS) # (label, progress bar) for the command running in the section
+        self.slowest_tables = [None] * len(SECTIONS)
+        self.section_build_times = {} # index -> seconds spent building the section
+
+        # --- Event Bus (worker threads -> Tk loop) ---
+        self.events = EventBus()
+        self.active_runs = {} # section index -> BooleanVar dicts to clear when its run completes
+        self.root.after(UI_EVENT_INTERVAL_MS, self.process_events)
+
+        # Apply initial theme to ensure everything is styled correctly from the start
+        self.apply_theme(self.current_theme)
+
+        # --- Show First Section ---
+        self.show_section(0)
+
+        self.root.after_idle(self.log_startup_metrics)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        logging.info("Application initialized successfully.")
+
+    def log_startup_metrics(self):
+        """Log time to first paint and the sections built so far (runs once the window is idle)."""
+        first_paint = time.perf_counter() - APP_START_TIME
+        built = ", ".join(f"{index + 1}: {seconds:.3f}s" for index, seconds in sorted(self.section_build_times.items()))
+        logging.info(f"Startup: first paint after {first_paint:.3f} seconds (sections built: {built or 'none'})")
+
+    def configure_styles(self):
+        """Configure ttk styles for light and dark themes."""
+        # --- Light Theme ---
+        LIGHT_BG = "#f0f0f0"
+        LIGHT_FG = "black"
+        LIGHT_SCROLLBAR_TROUGH = "#e0e0e0"
+        LIGHT_SCROLLBAR_BG = "#c0c0c0"
+        self.style.configure("Light.TFrame", background=LIGHT_BG)
+        self.style.configure("Light.TLabel", background=LIGHT_BG, foreground=LIGHT_FG)
+        self.style.configure("Light.TCheckbutton", background=LIGHT_BG, foreground=LIGHT_FG)
+        self.style.configure("Light.Vertical.TScrollbar", troughcolor=LIGHT_SCROLLBAR_TROUGH, background=LIGHT_SCROLLBAR_BG)
+
+        # --- Dark Theme ---
+        DARK_BG = "#000000" # Pure Black
+        DARK_FG = "#FFFFFF" # Pure White
+        DARK_SCROLLBAR_TROUGH = "#2e2e2e"
+        DARK_SCROLLBAR_BG = "#444444"
+        self.style.configure("Dark.TFrame", background=DARK_BG)
+        self.style.configure("Dark.TLabel", background=DARK_BG, foreground=DARK_FG)
+        self.style.configure("Dark.TCheckbutton", background=DARK_BG, foreground=DARK_FG, indicatorcolor=DARK_BG)
+        self.style.configure("Dark.Vertical.TScrollbar", troughcolor=DARK_SCROLLBAR_TROUGH, background=DARK_SCROLLBAR_BG)
+
+        # --- Green Button Style (Solid green background, black text) ---
+        GREEN_BG = "#4CAF50" # Material Green 500
+        GREEN_BG_HOVER = "#45a049"
+        GREEN_BG_PRESSED = "#3d8b40"
+        BUTTON_FG = "black" # Black text for buttons
+
+        # Use map to define different states, ensuring solid background
+        self.style.configure("Green.TButton",
+                             foreground=BUTTON_FG,
+                             background=GREEN_BG, # Solid background
+                             borderwidth=1) # Minimal border
+        self.style.map("Green.TButton",
+                       background=[('active', GREEN_BG_HOVER), ('pressed', GREEN_BG_PRESSED)],
+                       foreground=[('pressed', BUTTON_FG), ('active', BUTTON_FG)])
+
+
+    def apply_theme(self, theme_name):
+        """Apply the selected theme to the application."""
+        self.current_theme = theme_name
+        suffix = "Dark" if theme_name == "dark" else "Light"
+        DARK_BG = "#000000"
+        DARK_FG = "#FFFFFF"
+        LIGHT_BG = "#f0f0f0"
+        LIGHT_FG = "black"
+
+        # --- Apply base theme style ---
+        bg_color = DARK_BG if theme_name == "dark" else LIGHT_BG
+        fg_color = DARK_FG if theme_name == "dark" else LIGHT_FG
+        self.root.configure(bg=bg_color) # Root window background
+        self.main_frame.configure(style=f"{suffix}.TFrame") # Main container frame
+
+        # --- Apply theme to Navigation Bar ---
+        self.nav_frame.configure(style=f"{suffix}.TFrame")
+        # Update nav buttons style (they use Green.TButton, which is static)
+        # Update additional buttons style (they also use Green.TButton)
+
+        # --- Update styles for existing widgets in sections ---
+        for i, section in enumerate(self.sections):
+            if section is None:
+                continue # Not built yet; it picks up self.current_theme when it is
+            # --- Section Frame itself ---
+            section.configure(style=f"{suffix}.TFrame")
 
-            exec_logger = logging.getLogger(f"Section3_Exec_{threading.get_ident()}")
-            exec_logger.setLevel(logging.INFO)
-            exec_logger.handlers.clear()
-            text_handler = TextHandler(self.output_text3)
-            formatter = logging.Formatter("[%(asctime)s] %(levelname)s: %(message)s", datefmt='%H:%M:%S')
-            text_handler.setFormatter(formatter)
-            exec_logger.addHandler(text_handler)
+            # --- Left Frame (Checkboxes) ---
+            left_frame = section.winfo_children()[0] if section.winfo_children() else None
+            if left_frame and isinstance(left_frame, ttk.Frame):
+                left_frame.configure(style=f"{suffix}.TFrame")
+                # Update left frame's canvas background
+                canvas = left_frame.winfo_children()[0] if left_frame.winfo_children() else None
+                if canvas and isinstance(canvas, tk.Canvas):
+                    canvas.configure(bg=bg_color) # Match section bg
+                    # Update scrollable frame
+                    scrollable_frame = canvas.winfo_children()[0] if canvas.winfo_children() else None
+                    if scrollable_frame and isinstance(scrollable_frame, ttk.Frame):
+                        scrollable_frame.configure(style=f"{suffix}.TFrame")
+                        # Update individual checkboxes and labels within the scrollable frame
+                        for child in scrollable_frame.winfo_children():
+                            if isinstance(child, ttk.Checkbutton):
+                                child.configure(style=f"{suffix}.TCheckbutton")
+                            elif isinstance(child, ttk.Label): # For section 4 categories
+                                child.configure(style=f"{suffix}.TLabel")
 
-            selected = [name for name, var in self.section3_vars.items() if var.get()]
-            if not selected:
-                exec_logger.info("No options selected for execution.")
-                logging.info("Section3: No options selected for execution.")
-                return
+            # --- Right Frame (Output) ---
+            # Assuming right frame is the second child
+            right_frame = section.winfo_children()[1] if len(section.winfo_children()) > 1 else None
+            if right_frame and isinstance(right_frame, ttk.Frame):
+                right_frame.configure(style=f"{suffix}.TFrame")
+                # Update output label
+                output_label = right_frame.winfo_children()[0] if right_frame.winfo_children() else None
+                if output_label and isinstance(output_label, ttk.Label):
+                     output_label.configure(style=f"{suffix}.TLabel")
+                # Update output text widget
+                output_text_widget = None
+                for widget in right_frame.winfo_children():
+                    if isinstance(widget, tk.Text):
+                        output_text_widget = widget
+                        break
+                if output_text_widget:
+                    output_text_widget.configure(
+                        bg='#111111' if theme_name == 'dark' else 'white', # Slightly off-black for dark theme
+                        fg=DARK_FG if theme_name == 'dark' else LIGHT_FG
+                    )
+                # Update output scrollbar trough and slider color
+                output_scrollbar = None
+                for widget in right_frame.winfo_children():
+                    if isinstance(widget, ttk.Scrollbar) and widget.cget('orient') == 'vertical':
+                        output_scrollbar = widget
+                        break
+                if output_scrollbar:
+                    # Reconfigure the scrollbar style based on theme
+                    if theme_name == "dark":
+                        self.style.configure("Vertical.TScrollbar", troughcolor="#2e2e2e", background="#444444")
+                    else:
+                        self.style.configure("Vertical.TScrollbar", troughcolor="#e0e0e0", background="#c0c0c0")
+                    output_scrollbar.configure(style="Vertical.TScrollbar")
 
-            self.progress3["value"] = 0
-            self.progress3["maximum"] = len(selected)
 
-            self.output_text3.configure(state='normal')
-            self.output_text3.delete(1.0, tk.END)
-            self.output_text3.configure(state='disabled')
+            # --- Bottom Frame (Progress/Execute Button) ---
+            # Find the bottom frame within the left frame
+            if left_frame:
+                 for child in left_frame.winfo_children():
+                      if isinstance(child, ttk.Frame) and child != canvas: # Assuming canvas is the first child
+                           # This should be the bottom frame
+                           child.configure(style=f"{suffix}.TFrame")
+                           # Update progress bar if it exists within (usually doesn't need specific styling)
+                           # Update execute/install buttons (they use Green.TButton)
 
-            for i, option in enumerate(selected):
-                try:
-                    exec_logger.info(f"Starting: {option}")
-                    if option == "Disable Background Apps":
-                        self.disable_background_apps(exec_logger)
-                    elif option == "Disable Fullscreen Optimizations":
-                        self.disable_fullscreen_optimizations(exec_logger) # Already implemented
-                    elif option == "Disable Copilot":
-                        self.disable_copilot(exec_logger) # Already implemented
-                    elif option == "Disable Intel MM":
-                        self.disable_intel_mm(exec_logger)
-                    elif option == "Set Display for Performance":
-                        self.set_display_performance(exec_logger)
-                    elif option == "Set Classic Right Click Menu":
-                        self.set_classic_right_click(exec_logger) # Already implemented
-                    elif option == "Enable End Task With Right Click":
-                        self.enable_end_task(exec_logger) # Already implemented
-                    elif option == "Hide Search Button":
-                        self.hide_search_button(exec_logger)
-                    elif option == "Hide Task View Button":
-                        self.hide_task_view_button(exec_logger)
-                    elif option == "Enable Snap Window":
-                        self.enable_snap_window(exec_logger)
-                    elif option == "Enable Snap Assist Flyout":
-                        self.enable_snap_assist_flyout(exec_logger)
-                    elif option == "Enable Snap Assist Suggestion":
-                        self.enable_snap_assist_suggestion(exec_logger)
-                    elif option == "Enable Mouse Acceleration":
-                        self.enable_mouse_acceleration(exec_logger)
-                    elif option == "Enable Sticky Keys":
-                        self.enable_sticky_keys(exec_logger)
-                    elif option == "Show Hidden Files":
-                        self.show_hidden_files(exec_logger)
-                    elif option == "Show File Extensions":
-                        self.show_file_extensions(exec_logger) # Already implemented
-                    elif option == "Enable S3 Sleep":
-                        self.enable_s3_sleep(exec_logger)
-                    exec_logger.info(f"Completed: {option}")
-                    logging.info(f"Section3 {option}: Enabled")
-                    self.progress3["value"] = i + 1
-                    self.progress3.update()
-                except Exception as e:
-                    error_msg = f"Failed: {option} - {str(e)}"
-                    exec_logger.error(error_msg)
-                    logging.error(f"Section3 {option}: Failed - {str(e)}\n{traceback.format_exc()}")
 
-            for name, var in self.section3_vars.items():
-                var.set(False)
+        # --- Update scrollbar styles for main sections (left side lists) ---
+        # This is tricky because scrollbars are inside dynamic frames.
+        # The best way is to reconfigure the style globally and ensure it's applied.
+        # We already did this above for the output scrollbars.
+        # For the section scrollbars, they should pick up the style when created/updated.
+        # Let's try reconfiguring the global Vertical.TScrollbar style here again.
+        if theme_name == "dark":
+             self.style.configure("Vertical.TScrollbar", troughcolor="#2e2e2e", background="#444444")
+             # Also explicitly set the background of the nav frame's potential background
+             self.nav_frame.configure(style=f"{suffix}.TFrame") # Re-assert
+        else: # light
+             self.style.configure("Vertical.TScrollbar", troughcolor="#e0e0e0", background="#c0c0c0")
+             self.nav_frame.configure(style=f"{suffix}.TFrame") # Re-assert
 
-            exec_logger.info(f"Execution Complete: Applied {len(selected)} tweaks!")
-            logging.info(f"Section3: Finished applying {len(selected)} tweaks")
+        # --- Update About Window if it exists ---
+        for w in self.root.winfo_children():
+            if isinstance(w, tk.Toplevel) and w.title() == "About Win11Optimizator":
+                 try:
+                     # Update main frame of about window
+                     about_main_frame = w.winfo_children()[0] if w.winfo_children() else None
+                     if about_main_frame and isinstance(about_main_frame, ttk.Frame):
+                         about_main_frame.configure(style=f"{suffix}.TFrame")
+                         # Update labels inside about window
+                         for child in about_main_frame.winfo_children():
+                             if isinstance(child, ttk.Label):
+                                 child.configure(style=f"{suffix}.TLabel")
+                             elif isinstance(child, tk.Text):
+                                 child.configure(bg='#111111' if theme_name == 'dark' else '#f0f0f0',
+                                                 fg=DARK_FG if theme_name == 'dark' else LIGHT_FG)
+                 except tk.TclError:
+                     pass # Ignore errors if widget structure is unexpected
 
-        except Exception as e:
-            logging.error(f"Execute section 3 failed: {str(e)}\n{traceback.format_exc()}")
-            if hasattr(self, 'output_text3'):
-                try:
-                    fatal_logger = logging.getLogger(f"Section3_Exec_{threading.get_ident()}")
-                    if not fatal_logger.handlers:
-                        fatal_logger.addHandler(TextHandler(self.output_text3))
-                        fatal_logger.setLevel(logging.ERROR)
-                    fatal_logger.error(f"Execution Failed: {str(e)}")
-                except:
-                    pass
-            raise
+        logging.info(f"Theme applied: {theme_name}")
 
-    # --- Section 3 Methods (Updated to accept logger) ---
-    def disable_background_apps(self, logger):
-        try:
-            key_path = r"SOFTWARE\Policies\Microsoft\Windows\AppPrivacy"
-            with winreg.CreateKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
-                winreg.SetValueEx(key, "LetAppsRunInBackground", 0, winreg.REG_DWORD, 2)
-            logger.info("Disable background apps: Applied registry change.")
-            logger.info(f"Command: reg add \"HKLM\\{key_path}\" /v \"LetAppsRunInBackground\" /t REG_DWORD /d 2 /f")
-        except Exception as e:
-            logger.error(f"Disable background apps failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+    def toggle_theme(self):
+        """Toggle between light and dark themes."""
+        new_theme = "dark" if self.current_theme == "light" else "light"
+        self.apply_theme(new_theme)
+        logging.info(f"Theme toggled to: {new_theme}")
 
-    def disable_intel_mm(self, logger):
-        try:
-            logger.warning("disable_intel_mm: Placeholder function, implementation needed (e.g., disable Intel ME service)")
-        except Exception as e:
-            logger.error(f"Disable Intel MM failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+    #def create_menu(self):
+    #    menubar = Menu(self.root)
+    #    self.root.config(menu=menubar)
 
-    def set_display_performance(self, logger):
-        try:
-            key_path = r"Control Panel\Desktop"
-            with winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path) as key:
-                winreg.SetValueEx(key, "VisualFXSetting", 0, winreg.REG_DWORD, 2) # 2 = Adjust for best performance
-            logger.info("Set display for performance: Applied registry change.")
-            logger.info(f"Command: reg add \"HKCU\\{key_path}\" /v \"VisualFXSetting\" /t REG_DWORD /d 2 /f")
-        except Exception as e:
-            logger.error(f"Set display for performance failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+        # --- Help Menu ---
+    #    help_menu = Menu(menubar, tearoff=0)
+    #    menubar.add_cascade(label="Help", menu=help_menu)
+    #    help_menu.add_command(label="About", command=self.show_about)
+    #    help_menu.add_command(label="Import Configuration", command=self.import_config)
+    #    help_menu.add_command(label="Export Configuration", command=self.export_config)
 
-    def hide_search_button(self, logger):
-        try:
-            key_path = r"Software\Microsoft\Windows\CurrentVersion\Search"
-            with winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path) as key:
-                winreg.SetValueEx(key, "SearchboxTaskbarMode", 0, winreg.REG_DWORD, 0)
-            logger.info("Hide Search Button: Applied registry change.")
-            logger.info(f"Command: reg add \"HKCU\\{key_path}\" /v \"SearchboxTaskbarMode\" /t REG_DWORD /d 0 /f")
-        except Exception as e:
-            logger.error(f"Hide Search Button failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+    def show_section(self, index):
+        self.current_section = index
+        if self.sections[index] is None:
+            self.create_section(index)
+        for i, section in enumerate(self.sections):
+            if section is None:
+                continue
+            if i == index:
+                section.pack(fill="both", expand=True)
+            else:
+                section.pack_forget()
 
-    def hide_task_view_button(self, logger):
+    def show_about(self):
         try:
-            key_path = r"Software\Microsoft\Windows\CurrentVersion\Explorer\Advanced"
-            with winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path) as key:
-                winreg.SetValueEx(key, "ShowTaskViewButton", 0, winreg.REG_DWORD, 0)
-            logger.info("Hide Task View Button: Applied registry change.")
-            logger.info(f"Command: reg add \"HKCU\\{key_path}\" /v \"ShowTaskViewButton\" /t REG_DWORD /d 0 /f")
+            about_window = tk.Toplevel(self.root)
+            about_window.title("About Win11Optimizator")
+            about_window.geometry("500x400")
+            about_window.resizable(False, False)
+            # Apply theme to about window if desired (requires more setup)
+            main_frame = ttk.Frame(about_window, style=f"{self.current_theme.capitalize()}.TFrame")
+            main_frame.pack(fill="both", expand=True, padx=20, pady=20)
+            title_label = ttk.Label(main_frame, text="Win11Optimizator", font=("Segoe UI", 18, "bold"), style=f"{self.current_theme.capitalize()}.TLabel")
+            title_label.pack(pady=10)
+            version_label = ttk.Label(main_frame, text=f"Version: {APP_VERSION}", style=f"{self.current_theme.capitalize()}.TLabel")
+            version_label.pack()
+            author_label = ttk.Label(main_frame, text="Author: EOLiann", style=f"{self.current_theme.capitalize()}.TLabel")
+            author_label.pack(pady=(10, 0))
+            desc_label = ttk.Label(main_frame, text="Optimize and customize Windows 11", wraplength=450, style=f"{self.current_theme.capitalize()}.TLabel")
+            desc_label.pack(pady=10)
+            disclaimer = tk.Text(main_frame, height=8, wrap="word", bg="#111111" if self.current_theme == "dark" else "#f0f0f0", fg="white" if self.current_theme == "dark" else "black")
+            disclaimer.insert("1.0", "DISCLAIMER:\n"
+                                     "This tool modifies system settings. Use at your own risk.\n"
+                                     "It's highly recommended to create a system restore point before making changes.\n"
+                                     "The author is not responsible for any damage caused by this tool.")
+            disclaimer.config(state="disabled")
+            disclaimer.pack(fill="both", expand=True, pady=10)
+            close_btn = ttk.Button(main_frame, text="Close", command=about_window.destroy, style='Green.TButton')
+            close_btn.pack(pady=5)
         except Exception as e:
-            logger.error(f"Hide Task View Button failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+            logging.error(f"Show about failed: {e}\n{traceback.format_exc()}")
+            messagebox.showerror("Error", f"Failed to show about dialog: {e}")
 
-    def enable_snap_window(self, logger):
+    # --- Import/Export Configuration Methods ---
+    def export_config(self):
         try:
-            key_path = r"Software\Microsoft\Windows\CurrentVersion\Explorer\Advanced"
-            with winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path) as key:
-                winreg.SetValueEx(key, "EnableSnapBar", 0, winreg.REG_DWORD, 1)
-            logger.info("Enable Snap Window: Applied registry change (Set EnableSnapBar=1)")
-            logger.info(f"Command: reg add \"HKCU\\{key_path}\" /v \"EnableSnapBar\" /t REG_DWORD /d 1 /f")
+            file_path = filedialog.asksaveasfilename(defaultextension=".ini", filetypes=[("INI files", "*.ini"), ("All files", "*.*")])
+            if file_path:
+                write_profile(file_path, [{tweak_id: var.get() for tweak_id, var in section_vars.items()} for section_vars in self.section_vars])
+                logging.info("Export Config: Success")
+                messagebox.showinfo("Export Successful", "Configuration exported successfully.")
+            else:
+                logging.info("Export Config: Cancelled - No file selected")
         except Exception as e:
-            logger.error(f"Enable Snap Window failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+            logging.error(f"Export Config failed: {str(e)}\n{traceback.format_exc()}")
+            messagebox.showerror("Export Failed", f"Failed to export configuration: {str(e)}")
 
-    def enable_snap_assist_flyout(self, logger):
+    def import_config(self):
         try:
-            key_path = r"Software\Microsoft\Windows\CurrentVersion\Explorer\Advanced"
-            with winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path) as key:
-                winreg.SetValueEx(key, "EnableSnapAssistFlyout", 0, winreg.REG_DWORD, 1)
-            logger.info("Enable Snap Assist Flyout: Applied registry change.")
-            logger.info(f"Command: reg add \"HKCU\\{key_path}\" /v \"EnableSnapAssistFlyout\" /t REG_DWORD /d 1 /f")
-        except Exception as e:
-            logger.error(f"Enable Snap Assist Flyout failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+            file_path = filedialog.askopenfilename(filetypes=[("INI files", "*.ini"), ("All files", "*.*")])
+            if not file_path:
+                logging.info("Import Config: Cancelled - No file selected")
+                return
 
-    def enable_snap_assist_suggestion(self, logger):
-        try:
-            key_path = r"Software\Microsoft\Windows\CurrentVersion\Explorer\Advanced"
-            with winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path) as key:
-                winreg.SetValueEx(key, "EnableSnapAssistSuggestion", 0, winreg.REG_DWORD, 1)
-            logger.info("Enable Snap Assist Suggestion: Applied registry change (Set EnableSnapAssistSuggestion=1)")
-            logger.info(f"Command: reg add \"HKCU\\{key_path}\" /v \"EnableSnapAssistSuggestion\" /t REG_DWORD /d 1 /f")
-        except Exception as e:
-            logger.error(f"Enable Snap Assist Suggestion failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+            for section_vars, selection in zip(self.section_vars, read_profile(file_path)):
+                for tweak_id, enabled in selection.items():
+                    section_vars[tweak_id].set(enabled)
 
-    def enable_mouse_acceleration(self, logger):
-        try:
-            commands = [
-                'reg add "HKCU\\Control Panel\\Mouse" /v "MouseSpeed" /t REG_SZ /d "1" /f',
-                'reg add "HKCU\\Control Panel\\Mouse" /v "MouseThreshold1" /t REG_SZ /d "6" /f',
-                'reg add "HKCU\\Control Panel\\Mouse" /v "MouseThreshold2" /t REG_SZ /d "10" /f'
-            ]
-            for cmd in commands:
-                self.log_and_run_command(logger, cmd)
-            logger.info("Enable Mouse Acceleration: Applied registry changes (reverted disable settings).")
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Enable Mouse Acceleration failed (Registry error): {str(e)}")
-            raise
+            logging.info("Import Config: Success")
+            messagebox.showinfo("Import Successful", "Configuration imported successfully.")
         except Exception as e:
-            logger.error(f"Enable Mouse Acceleration failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+            logging.error(f"Import Config failed: {str(e)}\n{traceback.format_exc()}")
+            messagebox.showerror("Import Failed", f"Failed to import configuration: {str(e)}")
 
-    def enable_sticky_keys(self, logger):
+    # --- Rollback ---
+    def revert_run(self):
         try:
-            key_path = r"Control Panel\Accessibility\StickyKeys"
-            with winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path) as key:
-                winreg.SetValueEx(key, "Flags", 0, winreg.REG_SZ, "506")
-            logger.info("Enable Sticky Keys: Applied registry change (Reverted to default Flags=506)")
-            logger.info(f"Command: reg add \"HKCU\\{key_path}\" /v \"Flags\" /t REG_SZ /d \"506\" /f")
-        except Exception as e:
-            logger.error(f"Enable Sticky Keys failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+            file_path = filedialog.askopenfilename(initialdir=os.path.abspath(RUNS_DIR),
+                                                   filetypes=[("Run journals", "*.journal.jsonl"), ("All files", "*.*")])
+            if not file_path:
+                logging.info("Revert Run: Cancelled - No file selected")
+                return
+            if not messagebox.askyesno("Revert Run", f"Restore every value changed by this run?\n\n{os.path.basename(file_path)}"):
+                return
 
-    def show_hidden_files(self, logger):
-        try:
-            key_path = r"SOFTWARE\Microsoft\Windows\CurrentVersion\Explorer\Advanced"
-            with winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path) as key:
-                winreg.SetValueEx(key, "Hidden", 0, winreg.REG_DWORD, 1)
-            logger.info("Show Hidden Files: Applied registry change.")
-            logger.info(f"Command: reg add \"HKCU\\{key_path}\" /v \"Hidden\" /t REG_DWORD /d 1 /f")
-        except Exception as e:
-            logger.error(f"Show Hidden Files failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+            def worker():
+                try:
+                    result = self.engine.revert_journal(file_path, logging.getLogger())
+                    if result["failed"]:
+                        message = f"Revert finished with failures in: {', '.join(result['failed'])}. See the log for details."
+                        self.root.after(0, lambda: messagebox.showwarning("Revert Run", message))
+                    else:
+                        message = f"Restored {result['registry']} registry value(s) and {result['commands']} service/task setting(s)."
+                        self.root.after(0, lambda: messagebox.showinfo("Revert Run", message))
+                except Exception as e:
+                    logging.error(f"Revert Run failed: {str(e)}\n{traceback.format_exc()}")
+                    error = str(e)
+                    self.root.after(0, lambda: messagebox.showerror("Revert Run", f"Failed to revert run: {error}"))
 
-    def enable_s3_sleep(self, logger):
-        try:
-            logger.info("Enable S3 Sleep: Command 'powercfg /setactive SCHEME_CURRENT' executed. Ensure S3 is enabled in BIOS/UEFI and power plan settings.")
-            logger.info("Command: powercfg /setactive \"SCHEME_CURRENT\"")
-            subprocess.run('powercfg /setactive "SCHEME_CURRENT"', shell=True, check=True)
-        except subprocess.CalledProcessError as e:
-            logger.warning(f"Enable S3 Sleep: Command might have failed or S3 not supported. Error: {e}")
+            threading.Thread(target=worker, daemon=True).start()
         except Exception as e:
-            logger.error(f"Enable S3 sleep failed: {str(e)}\n{traceback.format_exc()}")
-            raise
+            logging.error(f"Revert Run failed: {str(e)}\n{traceback.format_exc()}")
+            messagebox.showerror("Revert Run", f"Failed to revert run: {str(e)}")
 
-    # --- Section 4: Install Software ---
-    def create_section4(self):
+    # --- Sections (built from the tweak catalog) ---
+    def create_section(self, index):
         try:
+            start_time = time.perf_counter()
+            layout = SECTIONS[index]
+            section_name = f"Section{index + 1}"
             frame = ttk.Frame(self.section_container, style=f"{self.current_theme.capitalize()}.TFrame")
-            self.sections.append(frame)
-
-            software_categories = {
-                "Browsers": [
-                    ("Google Chrome", "Google.Chrome"),
-                    ("Mozilla Firefox", "Mozilla.Firefox"),
-                    ("Brave Browser", "Brave.Brave")
-                ],
-                "Development": [
-                    ("Git", "Git.Git"),
-                    ("Node.js LTS", "OpenJS.NodeJS.LTS"),
-                    ("Python 3", "Python.Python.3"),
-                    ("Visual Studio Code", "Microsoft.VisualStudioCode")
-                ],
-                "Documents": [
-                    ("Adobe Acrobat Reader", "Adobe.Acrobat.Reader.64-bit"),
-                    ("LibreOffice", "TheDocumentFoundation.LibreOffice"),
-                    ("Notepad++", "Notepad++.Notepad++"),
-                    ("OnlyOffice", "ONLYOFFICE.DesktopEditors")
-                ],
-                "Multimedia": [
-                    ("GIMP (Image Editor)", "GIMP.GIMP"),
-                    ("OBS Studio", "OBSProject.OBSStudio"),
-                    ("Paint.NET", "dotPDN.PaintDotNet"),
-                    ("VLC (Video Player)", "VideoLAN.VLC")
-                ],
-                "Utilities": [
-                    ("7-Zip", "7zip.7zip"),
-                    ("AnyDesk", "AnyDeskSoftwareGmbH.AnyDesk"),
-                    ("Bitwarden", "Bitwarden.Bitwarden"),
-                    ("Malwarebytes", "Malwarebytes.Malwarebytes"),
-                    ("TeamViewer", "TeamViewer.TeamViewer"),
-                    ("qBittorrent", "qBittorrent.qBittorrent")
-                ]
-            }
-
-            self.section4_vars = {}
-            row_counter = 0
+            self.sections[index] = frame
+            section_vars = self.section_vars[index]
 
             # --- Layout Split ---
             left_frame = ttk.Frame(frame, style=f"{self.current_theme.capitalize()}.TFrame")
@@ -2136,128 +3603,542 @@ class Win11Optimizator:
             canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
             canvas.configure(yscrollcommand=scrollbar.set)
 
-            # --- Bind Mousewheel to Scrollable Frame for Section 4 ---
+            # --- Bind Mousewheel to Scrollable Frame ---
+            # Use lambda to capture the correct canvas instance
             scrollable_frame.bind("<MouseWheel>", lambda event: canvas.yview_scroll(int(-1*(event.delta/120)), "units"))
+            # Also bind to canvas to ensure it works if mouse is over the canvas but not directly over a widget
             canvas.bind("<MouseWheel>", lambda event: canvas.yview_scroll(int(-1*(event.delta/120)), "units"))
             # --- End Mousewheel Binding ---
 
-            for category, apps in software_categories.items():
-                cat_label = ttk.Label(scrollable_frame, text=category, font=("Segoe UI", 10, "bold"), style=f"{self.current_theme.capitalize()}.TLabel")
-                cat_label.grid(row=row_counter, column=0, sticky="w", padx=10, pady=(10, 2))
-                row_counter += 1
-                for name, package_id in apps:
-                    var = BooleanVar(value=False)
-                    self.section4_vars[name] = {"var": var, "package_id": package_id}
-                    chk = ttk.Checkbutton(
-                        scrollable_frame,
-                        text=name,
-                        variable=var,
-                        command=lambda n=name: logging.info(f"Section4 {n}: Toggled to {self.section4_vars[n]['var'].get()}"),
-                        style=f"{self.current_theme.capitalize()}.TCheckbutton"
-                    )
-                    chk.grid(row=row_counter, column=0, sticky="w", padx=20, pady=2)
+            row_counter = 0
+            current_category = None
+            for tweak_id in layout["tweaks"]:
+                tweak = TWEAKS[tweak_id]
+                # Section 4 groups its entries under category headings
+                if tweak.category and tweak.category != current_category:
+                    current_category = tweak.category
+                    cat_label = ttk.Label(scrollable_frame, text=current_category, font=("Segoe UI", 10, "bold"), style=f"{self.current_theme.capitalize()}.TLabel")
+                    cat_label.grid(row=row_counter, column=0, sticky="w", padx=10, pady=(10, 2))
                     row_counter += 1
+                chk = ttk.Checkbutton(
+                    scrollable_frame,
+                    text=tweak.label,
+                    variable=section_vars[tweak_id],
+                    command=lambda t=tweak: logging.info(f"{section_name} {t.label}: Toggled to {section_vars[t.id].get()}"),
+                    style=f"{self.current_theme.capitalize()}.TCheckbutton"
+                )
+                if tweak.category:
+                    chk.grid(row=row_counter, column=0, sticky="w", padx=20, pady=2)
+                else:
+                    chk.grid(row=row_counter, column=0, sticky="w", padx=10, pady=5)
+                row_counter += 1
 
             canvas.pack(side="left", fill="both", expand=True)
             scrollbar.pack(side="right", fill="y")
 
             # --- Right Column: Execution Output ---
-            output_label = ttk.Label(right_frame, text="Installation Output:", font=("Segoe UI", 10, "bold"), style=f"{self.current_theme.capitalize()}.TLabel")
+            output_label = ttk.Label(right_frame, text=layout.get("output_label", "Execution Output:"), font=("Segoe UI", 10, "bold"), style=f"{self.current_theme.capitalize()}.TLabel")
             output_label.pack(anchor="w", padx=5, pady=(5, 0))
 
-            self.output_text4 = tk.Text(right_frame, state='disabled', wrap='word',
-                                        bg='black' if self.current_theme == 'dark' else 'white',
-                                        fg='white' if self.current_theme == 'dark' else 'black')
-            output_scrollbar = ttk.Scrollbar(right_frame, orient="vertical", command=self.output_text4.yview, style="Vertical.TScrollbar")
-            self.output_text4.configure(yscrollcommand=output_scrollbar.set)
-
-            self.output_text4.pack(side="left", fill="both", expand=True, padx=(5, 0), pady=5)
+            # --- Slowest tweaks of the last run (filled from its RunMetrics) ---
+            slowest_frame = ttk.Frame(right_frame, style=f"{self.current_theme.capitalize()}.TFrame")
+            slowest_frame.pack(side="bottom", fill="x", padx=5, pady=(0, 5))
+            slowest_label = ttk.Label(slowest_frame, text="Slowest tweaks (last run):", font=("Segoe UI", 10, "bold"), style=f"{self.current_theme.capitalize()}.TLabel")
+            slowest_label.pack(anchor="w")
+            slowest_table = ttk.Treeview(slowest_frame, columns=("seconds", "processes", "outcome"), height=SLOWEST_TWEAKS_SHOWN)
+            slowest_table.heading("#0", text="Tweak")
+            slowest_table.heading("seconds", text="Seconds")
+            slowest_table.heading("processes", text="Processes")
+            slowest_table.heading("outcome", text="Outcome")
+            slowest_table.column("#0", width=170)
+            slowest_table.column("seconds", width=60, anchor="e")
+            slowest_table.column("processes", width=65, anchor="e")
+            slowest_table.column("outcome", width=95)
+            slowest_table.pack(fill="x")
+            self.slowest_tables[index] = slowest_table
+
+            output_text = tk.Text(right_frame, state='disabled', wrap='word',
+                                  bg='#111111' if self.current_theme == 'dark' else 'white',
+                                  fg='white' if self.current_theme == 'dark' else 'black')
+            output_scrollbar = ttk.Scrollbar(right_frame, orient="vertical", command=output_text.yview, style="Vertical.TScrollbar")
+            output_text.configure(yscrollcommand=output_scrollbar.set)
+
+            output_text.pack(side="left", fill="both", expand=True, padx=(5, 0), pady=5)
             output_scrollbar.pack(side="right", fill="y", pady=5, padx=(0, 5))
-
-            # --- Bottom Frame (MOVED to LEFT FRAME) ---
-            bottom_frame = ttk.Frame(left_frame, style=f"{self.current_theme.capitalize()}.TFrame") # Changed parent to left_frame
-            bottom_frame.pack(side="bottom", fill="x", padx=10, pady=10) # Adjusted padding if needed
-
-            self.progress4 = ttk.Progressbar(bottom_frame, orient="horizontal", mode="determinate", length=300)
-            self.progress4.pack(side="left", fill="x", expand=True, padx=(0, 10))
+            self.output_texts[index] = output_text
+            self.log_panes[index] = LogPane(output_text, interval_ms=None) # Flushed by process_events
+
+            # --- Bottom Frame (in LEFT FRAME) ---
+            bottom_frame = ttk.Frame(left_frame, style=f"{self.current_theme.capitalize()}.TFrame")
+            bottom_frame.pack(side="bottom", fill="x", padx=10, pady=10)
+
+            progress = ttk.Progressbar(bottom_frame, orient="horizontal", mode="determinate", length=300)
+            progress.pack(side="left", fill="x", expand=True, padx=(0, 10))
+            self.progress_bars[index] = progress
+
+            # Download / DISM progress of the command running now (packed above the run progress bar)
+            item_frame = ttk.Frame(left_frame, style=f"{self.current_theme.capitalize()}.TFrame")
+            item_frame.pack(side="bottom", fill="x", padx=10)
+            item_label = ttk.Label(item_frame, text="", style=f"{self.current_theme.capitalize()}.TLabel")
+            item_label.pack(side="top", anchor="w")
+            item_bar = ttk.Progressbar(item_frame, orient="horizontal", mode="determinate", maximum=100)
+            item_bar.pack(side="top", fill="x")
+            self.item_progress[index] = (item_label, item_bar)
 
             execute_btn = ttk.Button(
                 bottom_frame,
-                text="Install Selected",
-                command=lambda: threading.Thread(target=self.execute_section4, daemon=True).start(),
+                text=layout.get("execute_text", "Execute"),
+                command=lambda: self.start_execution(index),
                 style='Green.TButton'
             )
             execute_btn.pack(side="right")
 
-            logging.info("Section 4 created successfully")
+            self.section_build_times[index] = time.perf_counter() - start_time
+            logging.info(f"Section {index + 1} created successfully in {self.section_build_times[index]:.3f} seconds")
         except Exception as e:
-            logging.error(f"Create section 4 failed: {str(e)}\n{traceback.format_exc()}")
+            logging.error(f"Create section {index + 1} failed: {str(e)}\n{traceback.format_exc()}")
             raise
 
-    def execute_section4(self):
+    def process_events(self):
+        """Apply queued run events on the Tk thread; progress bars are redrawn once per batch."""
         try:
-            if not hasattr(self, 'output_text4'):
-                logging.error("Output text widget for section 4 not found.")
+            progress = {}
+            item_progress = {} # index -> latest EVENT_SUBPROGRESS data; only the last frame of a batch is drawn
+            for event in self.events.drain():
+                if event.kind == EVENT_LOG:
+                    self.log_panes[event.target].write(event.data["line"])
+                elif event.kind == EVENT_STARTED:
+                    self.progress_bars[event.target].configure(maximum=max(event.data["total"], 1))
+                    progress[event.target] = 0
+                elif event.kind == EVENT_PROGRESS:
+                    progress[event.target] = event.data["done"]
+                elif event.kind == EVENT_SUBPROGRESS:
+                    item_progress[event.target] = event.data
+                elif event.kind == EVENT_COMPLETED:
+                    for section_vars in self.active_runs.pop(event.target, []):
+                        for var in section_vars.values():
+                            var.set(False)
+                elif event.kind == EVENT_FAILED:
+                    self.active_runs.pop(event.target, None)
+                elif event.kind == EVENT_METRICS:
+                    self.show_slowest_tweaks(event.target, event.data["slowest"])
+            for index, done in progress.items():
+                self.progress_bars[index].configure(value=done)
+            for index, data in item_progress.items():
+                self.show_item_progress(index, data)
+            for pane in self.log_panes:
+                if pane is not None:
+                    pane.flush()
+        except Exception as e:
+            logging.error(f"Processing UI events failed: {str(e)}\n{traceback.format_exc()}")
+        self.root.after(UI_EVENT_INTERVAL_MS, self.process_events)
+
+    def show_item_progress(self, index, data):
+        """Draw the progress of the section's running download or DISM command; a None percent clears it."""
+        label, bar = self.item_progress[index]
+        if data["percent"] is None:
+            label.configure(text="")
+            bar.configure(value=0)
+        else:
+            label.configure(text=f"{data['item']}: {data['detail']}")
+            bar.configure(value=data["percent"])
+
+    def cancel_run(self):
+        """Stop scheduling new tweaks and kill the commands of the run in progress."""
+        if self.engine.cancel():
+            logging.info("Cancel requested by the user.")
+        else:
+            messagebox.showinfo("Cancel Run", "No run is in progress.")
+
+    def on_close(self, deadline=None):
+        """Closing the window cancels a run in progress and waits (up to CLOSE_WAIT_SECONDS)
+        for it to stop, so the worker is not killed halfway through a write."""
+        if deadline is None:
+            if not self.engine.cancel():
+                self.root.destroy()
                 return
-
-            exec_logger = logging.getLogger(f"Section4_Exec_{threading.get_ident()}")
-            exec_logger.setLevel(logging.INFO)
-            exec_logger.handlers.clear()
-            text_handler = TextHandler(self.output_text4)
-            formatter = logging.Formatter("[%(asctime)s] %(levelname)s: %(message)s", datefmt='%H:%M:%S')
-            text_handler.setFormatter(formatter)
-            exec_logger.addHandler(text_handler)
-
-            selected = [(name, data["package_id"]) for name, data in self.section4_vars.items() if data["var"].get() and data["package_id"]]
+            logging.info("Window closed during a run: cancelling it first.")
+            deadline = time.monotonic() + CLOSE_WAIT_SECONDS
+        if self.engine.run_lock.locked() and time.monotonic() < deadline:
+            self.root.after(100, lambda: self.on_close(deadline))
+            return
+        self.root.destroy()
+
+    def show_slowest_tweaks(self, index, slowest):
+        table = self.slowest_tables[index]
+        table.delete(*table.get_children())
+        for tweak_id, stats in slowest:
+            table.insert("", "end", text=stats["label"],
+                         values=(f"{stats['duration']:.2f}", stats["processes"], stats["outcome"]))
+
+    def execute_all_sections(self):
+        """Run the selections of every section as one compiled plan, reporting in the visible section."""
+        self.start_execution(self.current_section, all_sections=True)
+
+    def start_execution(self, index, all_sections=False):
+        """Read the selection and compile the plan on the Tk thread, then run it on a worker thread."""
+        section_name = "All sections" if all_sections else f"Section{index + 1}"
+        pane = self.log_panes[index]
+        var_sets = self.section_vars if all_sections else [self.section_vars[index]]
+        try:
+            selected = [TWEAKS[tweak_id] for section_vars in var_sets for tweak_id, var in section_vars.items() if var.get()]
             if not selected:
-                exec_logger.info("No software selected for installation.")
-                logging.info("Section4: No software selected for installation.")
+                pane.write(f"[{datetime.now():%H:%M:%S}] INFO: No options selected for execution.")
+                logging.info(f"{section_name}: No options selected for execution.")
                 return
 
-            self.progress4["value"] = 0
-            self.progress4["maximum"] = len(selected)
-
-            self.output_text4.configure(state='normal')
-            self.output_text4.delete(1.0, tk.END)
-            self.output_text4.configure(state='disabled')
+            pane.clear()
+            plan = compile_plan(selected)
+            for line in plan.describe():
+                pane.write(f"[{datetime.now():%H:%M:%S}] INFO: {line}")
+            if plan.conflicts:
+                pane.write(f"[{datetime.now():%H:%M:%S}] ERROR: Execution cancelled: uncheck one tweak of each conflicting pair and try again.")
+                logging.warning(f"{section_name}: {PlanConflictError(plan.conflicts)}")
+                message = "\n".join(f"{TWEAKS[c.first].label}  vs  {TWEAKS[c.second].label}" for c in plan.conflicts)
+                messagebox.showerror("Conflicting Tweaks", f"These selected tweaks contradict each other:\n\n{message}")
+                return
 
-            for i, (name, package_id) in enumerate(selected):
-                try:
-                    exec_logger.info(f"Installing: {name}")
-                    self.install_software(exec_logger, name, package_id) # Reuse existing method
-                    exec_logger.info(f"Installed: {name}")
-                    logging.info(f"Section4 {name}: Installed")
-                    self.progress4["value"] = i + 1
-                    self.progress4.update()
-                except Exception as e:
-                    error_msg = f"Failed to install {name}: {str(e)}"
-                    exec_logger.error(error_msg)
-                    logging.error(f"Section4 {name}: Failed - {str(e)}\n{traceback.format_exc()}")
+            self.active_runs[index] = var_sets
+            threading.Thread(target=self.execute_section, args=(index, plan, section_name), daemon=True).start()
+        except Exception as e:
+            logging.error(f"Start {section_name} failed: {str(e)}\n{traceback.format_exc()}")
+            messagebox.showerror("Error", f"Failed to start execution: {str(e)}")
+
+    def execute_section(self, index, plan, section_name):
+        """Worker thread: run a compiled plan. Reports only through its RunLog and the event bus."""
+        events = self.events.channel(index)
+        metrics = RunMetrics()
+        run = RunLog(sinks=[pane_sink(events), file_log_sink, metrics])
+        profiler = RunProfiler(f"run_{run.run_id}") if "run" in self.profile else None
+        try:
+            journal = RunJournal.for_new_run(run.run_id)
+            report = self.engine.run_plan(plan, run, journal=journal, events=events, profiler=profiler)
+            if profiler is not None:
+                log_profile(profiler, run)
+            if journal.count:
+                run.info(f"Rollback journal: {journal.count} prior value(s) saved to {journal.path}")
+            events.publish(EVENT_METRICS, slowest=metrics.slowest(SLOWEST_TWEAKS_SHOWN))
+            run.info(f"Run metrics: {', '.join(metrics.write())}")
+            run.flush()
+            run.info(f"Run trace (chrome://tracing, Perfetto): {write_trace(run.path)}")
+            if report.cancelled:
+                run.warning(f"Execution Cancelled: {len(report.cancelled)} of {len(plan.tweaks)} tweaks not applied (run {run.run_id})")
+            else:
+                run.info(f"Execution Complete: Applied {len(plan.tweaks)} tweaks! (run {run.run_id})")
+        except Exception as e:
+            logging.error(f"Execute {section_name} failed: {str(e)}\n{traceback.format_exc()}")
+            run.error(f"Execution Failed: {str(e)}")
+        finally:
+            run.close()
+
+# --- Startup Diagnostics ---
+# Budget for the imports paid before the first paint. --import-times re-runs the
+# startup path under `python -X importtime` and reports the cost per module.
+IMPORT_BUDGET_MS = 150
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+def parse_importtime(stderr):
+    """Parse `-X importtime` output into {module: (self us, cumulative us, depth)}."""
+    modules = {}
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            modules[match.group(4)] = (int(match.group(1)), int(match.group(2)), len(match.group(3)) // 2)
+    return modules
+
+def measure_import_times():
+    """Return ({module: (self us, cumulative us, depth)}, module init seconds) for the GUI startup path.
+
+    Modules the bare interpreter imports by itself are left out.
+    """
+    if getattr(sys, "frozen", False):
+        raise RuntimeError("Import timing needs a Python interpreter; it is not available in the packaged executable.")
+    baseline = subprocess.run([sys.executable, "-X", "importtime", "-c", "pass"], capture_output=True, text=True)
+    probe = subprocess.run([sys.executable, "-X", "importtime", os.path.abspath(__file__), "--startup-probe"],
+                           capture_output=True, text=True)
+    if probe.returncode != 0:
+        raise RuntimeError(f"Startup probe failed: {probe.stderr.strip().splitlines()[-1:]}")
+    interpreter = parse_importtime(baseline.stderr)
+    modules = {name: cost for name, cost in parse_importtime(probe.stderr).items() if name not in interpreter}
+    init = next((float(line.split()[1]) for line in probe.stdout.splitlines() if line.startswith("module-init ")), 0.0)
+    return modules, init
+
+def startup_probe():
+    """Child process of --import-times: load what first paint needs, without opening a window."""
+    load_gui_modules()
+    print(f"module-init {time.perf_counter() - APP_START_TIME:.6f}")
+    return EXIT_OK
+
+def report_import_times(logger, top=15):
+    try:
+        modules, init = measure_import_times()
+    except (OSError, RuntimeError) as e:
+        logger.error(str(e))
+        return EXIT_USAGE
+    # Top-level imports (depth 0) include their sub-imports, so they add up to the total
+    top_level = sorted(((cost[1], name) for name, cost in modules.items() if cost[2] == 0), reverse=True)
+    total_ms = sum(cumulative for cumulative, _ in top_level) / 1000
+    print(f"{'cumulative ms':>14}  {'self ms':>8}  module")
+    for cumulative, name in top_level[:top]:
+        print(f"{cumulative / 1000:>14.1f}  {modules[name][0] / 1000:>8.1f}  {name}")
+    verdict = "within" if total_ms <= IMPORT_BUDGET_MS else "OVER"
+    summary = (f"Startup imports: {total_ms:.1f} ms across {len(modules)} module(s), {verdict} the {IMPORT_BUDGET_MS} ms budget; "
+               f"module initialization to first-paint readiness: {init * 1000:.1f} ms")
+    print(summary)
+    logging.info(summary)
+    return EXIT_OK if total_ms <= IMPORT_BUDGET_MS else EXIT_OVER_BUDGET
+
+# --- Headless Command Line ---
+# Unattended runs for provisioning: applies a profile with the same engine as the
+# GUI, streams progress to stdout and reports the outcome through the exit code.
+EXIT_OK = 0
+EXIT_TWEAKS_FAILED = 1 # The run completed but at least one tweak failed
+EXIT_USAGE = 2 # Bad arguments or unreadable profile (argparse also uses 2)
+EXIT_CONFLICT = 3 # The selection contains contradicting tweaks; nothing was changed
+EXIT_NOT_ADMIN = 4 # Changes requested without administrative privileges
+EXIT_OVER_BUDGET = 5 # --import-times: startup imports exceed IMPORT_BUDGET_MS
+EXIT_REGRESSION = 6 # --benchmark: slower than the stored baseline
+EXIT_CANCELLED = 7 # Interrupted with Ctrl+C; the tweaks not applied are listed in the report
+SUBPROGRESS_STEP = 25 # A download or DISM progress line is printed every this many percent
+BENCHMARK_BASELINE_FILENAME = "win11optimizator_benchmarks.json"
+BENCHMARK_THRESHOLD = 0.25 # Allowed slowdown against the baseline (timings on shared CI runners vary ~10-20%)
+APP_MODULE = "win11optimizator" # Name w11o_sim imports this script under
+
+def load_simulator():
+    """Import w11o_sim.py (Windows simulator, benchmark suite) from next to this script.
+    It imports the engine back from this module, so the module is registered under APP_MODULE first."""
+    sys.modules.setdefault(APP_MODULE, sys.modules[__name__])
+    directory = os.path.dirname(os.path.abspath(__file__))
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    import w11o_sim
+    return w11o_sim
+
+def build_arg_parser():
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog="win11optimizator",
+        description=f"{APP_NAME} v{APP_VERSION}. Without arguments the GUI starts.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--apply", metavar="PROFILE", help="apply a profile exported from the GUI (INI)")
+    mode.add_argument("--tweaks", metavar="IDS", help="apply a comma-separated list of tweak ids")
+    mode.add_argument("--check", metavar="PROFILE", help="report which tweaks of a profile are already applied (read-only)")
+    mode.add_argument("--revert", metavar="JOURNAL", help="restore the values recorded in a run journal")
+    mode.add_argument("--list", action="store_true", help="list the available tweak ids and exit")
+    mode.add_argument("--export-services", metavar="PATH", help="write the service list of \"Set Services to Manual\" as an editable service profile")
+    mode.add_argument("--trace", metavar="EVENTS", help="convert a run event log (.events.jsonl) to a Trace Event timeline")
+    mode.add_argument("--import-times", action="store_true", help="report the import cost of startup, module by module")
+    mode.add_argument("--benchmark", action="store_true", help="run the benchmark suite on simulated backends and compare with the baseline")
+    mode.add_argument("--benchmark-log", metavar="RECORDS", type=int, help="measure output pane throughput in records/second (needs a display)")
+    parser.add_argument("--benchmark-baseline", metavar="PATH", default=BENCHMARK_BASELINE_FILENAME,
+                        help=f"benchmark baseline file (default: {BENCHMARK_BASELINE_FILENAME})")
+    parser.add_argument("--benchmark-threshold", metavar="PERCENT", type=float, default=BENCHMARK_THRESHOLD * 100,
+                        help=f"allowed slowdown before --benchmark fails (default: {BENCHMARK_THRESHOLD * 100:.0f})")
+    parser.add_argument("--benchmark-save", action="store_true", help="store this --benchmark run as the new baseline")
+    parser.add_argument("--services", metavar="PATH",
+                        help=f"service profile for \"Set Services to Manual\" (default: {SERVICE_PROFILE_FILENAME} if present, else the built-in list)")
+    parser.add_argument("--simulate", action="store_true", help="run against an in-memory simulated Windows machine instead of this one")
+    parser.add_argument("--dry-run", action="store_true", help="compile and print the plan without changing anything")
+    parser.add_argument("--quiet", action="store_true", help="only print warnings, errors and the final report")
+    parser.add_argument("--profile", metavar="TARGETS", nargs="?", const="run",
+                        help=f"profile the run and/or GUI startup with cProfile: run, startup or all (default: run; "
+                             f"also set by {PROFILE_ENV})")
+    parser.add_argument("--metrics-textfile", metavar="PATH", help="also write the run's metrics to PATH (Prometheus textfile collector)")
+    return parser
+
+def is_headless(args):
+    return bool(args.apply or args.tweaks or args.check or args.revert or args.list or args.import_times
+                or args.benchmark or args.benchmark_log or args.trace or args.export_services)
+
+def cli_logger(quiet=False):
+    logger = logging.getLogger(f"{APP_NAME}.cli")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False # Console only; runs reach the log file through their RunLog
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("[%(asctime)s] %(levelname)s: %(message)s", datefmt='%H:%M:%S'))
+        handler.setLevel(logging.WARNING if quiet else logging.INFO)
+        logger.addHandler(handler)
+    return logger
+
+def run_cli(args):
+    """Run a headless command and return the process exit code."""
+    import configparser
+    logger = cli_logger(args.quiet)
+    if args.import_times:
+        return report_import_times(logger)
+    if args.benchmark:
+        return load_simulator().report_benchmarks(logger, args.benchmark_baseline, args.benchmark_threshold / 100, args.benchmark_save)
+    if args.benchmark_log:
+        for name, rate in benchmark_log_rendering(args.benchmark_log).items():
+            print(f"{name:<20} {rate:>12,.0f} records/s")
+        return EXIT_OK
+    if args.trace:
+        try:
+            print(f"Run trace: {write_trace(args.trace)}")
+        except (OSError, ValueError) as e:
+            logger.error(f"Cannot convert event log: {e}")
+            return EXIT_USAGE
+        return EXIT_OK
+    if args.list:
+        for index, layout in enumerate(SECTIONS):
+            print(f"[Section{index + 1}] {layout['title']}")
+            for tweak_id in layout["tweaks"]:
+                print(f"  {tweak_id:<45} {TWEAKS[tweak_id].label}")
+        return EXIT_OK
+    try:
+        services = load_service_profile(args.services)
+    except (OSError, ValueError, configparser.Error) as e:
+        logger.error(f"Cannot read service profile: {e}")
+        return EXIT_USAGE
+    if args.export_services:
+        write_service_profile(args.export_services, services)
+        print(f"Service profile: {args.export_services} ({len(services)} service(s))")
+        return EXIT_OK
 
-            # Deselect checkboxes after installation
-            for data in self.section4_vars.values():
-                data["var"].set(False)
+    try:
+        if args.tweaks:
+            ids = [tweak_id.strip() for tweak_id in args.tweaks.split(",") if tweak_id.strip()]
+            unknown = [tweak_id for tweak_id in ids if tweak_id not in TWEAKS]
+            if unknown:
+                logger.error(f"Unknown tweak id(s): {', '.join(unknown)} (see --list)")
+                return EXIT_USAGE
+            selected = [TWEAKS[tweak_id] for tweak_id in ids]
+        elif args.apply or args.check:
+            selected = selected_tweaks(read_profile(args.apply or args.check))
+        else:
+            selected = []
+    except (OSError, configparser.Error) as e:
+        logger.error(f"Cannot read profile: {e}")
+        return EXIT_USAGE
+
+    # Off Windows only the in-memory registry exists, so there is nothing to protect
+    needs_admin = winreg is not None and not (args.check or args.dry_run or args.simulate)
+    if needs_admin and not is_admin():
+        logger.error("Administrative privileges are required. Run from an elevated prompt.")
+        return EXIT_NOT_ADMIN
+
+    if args.simulate:
+        engine, machine = load_simulator().simulated_engine()
+        logger.info("Simulation: changes go to an in-memory Windows machine, nothing on this system is touched.")
+    else:
+        engine, machine = TweakEngine(), None
+    engine.service_profile = args.services
+    try:
+        if args.revert:
+            if args.dry_run:
+                for entry in RunJournal.original_states(RunJournal.load(args.revert)):
+                    print(f"{entry['kind']}: {entry['target']} -> {entry['prior']}")
+                return EXIT_OK
+            result = engine.revert_journal(args.revert, logger)
+            return EXIT_TWEAKS_FAILED if result["failed"] else EXIT_OK
+
+        if args.check:
+            status = engine.check_tweaks(compile_plan(selected).tweaks)
+            for tweak_id, state in status.items():
+                print(f"{state:<8} {TWEAKS[tweak_id].label}")
+            return EXIT_OK
+
+        plan = compile_plan(selected)
+        for line in plan.describe():
+            logger.info(line)
+        if plan.conflicts:
+            logger.error(str(PlanConflictError(plan.conflicts)))
+            return EXIT_CONFLICT
+        if not plan.tweaks:
+            logger.warning("No tweaks selected; nothing to do.")
+            return EXIT_OK
+        if args.dry_run:
+            for tweak in plan.tweaks:
+                print(f"  {tweak.id:<45} {tweak.label}")
+            return EXIT_OK
+
+        item_steps = {} # item -> last SUBPROGRESS_STEP printed
+        def show_progress(event):
+            if event.kind == EVENT_PROGRESS:
+                logger.info(f"Progress: {event.data['done']}/{event.data['total']}")
+            elif event.kind == EVENT_SUBPROGRESS:
+                item, percent = event.data["item"], event.data["percent"]
+                if percent is None:
+                    item_steps.pop(item, None)
+                elif item_steps.get(item) != int(percent // SUBPROGRESS_STEP):
+                    item_steps[item] = int(percent // SUBPROGRESS_STEP)
+                    logger.info(f"  {item}: {event.data['detail']}")
+
+        events = EventBus(queued=False)
+        events.subscribe(show_progress)
+
+        def interrupt(signum, frame):
+            if engine.cancelled: # Second Ctrl+C: stop waiting
+                raise KeyboardInterrupt
+            logger.warning("Cancelling: no new tweaks start, running commands are killed (Ctrl+C again to abort)")
+            engine.cancel()
+        import signal
+        signal.signal(signal.SIGINT, interrupt)
+
+        metrics = RunMetrics()
+        run = RunLog(sinks=[stream_sink(sys.stdout, "WARNING" if args.quiet else "INFO"), file_log_sink, metrics,
+                            pane_sink(events.channel(None))])
+        profiler = RunProfiler(f"run_{run.run_id}") if "run" in requested_profile(args) else None
+        try:
+            journal = RunJournal.for_new_run(run.run_id)
+            report = engine.run_plan(plan, run, journal=journal, events=events.channel(None), profiler=profiler)
+            if profiler is not None:
+                log_profile(profiler, run)
+            if journal.count:
+                run.info(f"Rollback journal: {journal.count} prior value(s) saved to {journal.path}")
+        finally:
+            run.close()
+        print(report.summary())
+        print("Slowest tweaks:")
+        for tweak_id, stats in metrics.slowest(5):
+            print(f"  {stats['duration']:>8.3f}s  {stats['processes']:>3} process(es)  {tweak_id}")
+        print(f"Run events: {run.path}")
+        print(f"Run metrics: {', '.join(metrics.write(textfile=args.metrics_textfile))}")
+        print(f"Run trace: {write_trace(run.path)}")
+        if machine is not None:
+            print(machine.summary())
+        if report.cancelled:
+            return EXIT_CANCELLED
+        return EXIT_TWEAKS_FAILED if report.failed else EXIT_OK
+    except Exception as e:
+        logger.error(f"Run failed: {str(e)}")
+        logging.error(f"Headless run failed: {str(e)}\n{traceback.format_exc()}")
+        return EXIT_TWEAKS_FAILED
+    finally:
+        engine.close()
+
+def create_app(profile=()):
+    load_gui_modules()
+    root = tk.Tk()
+    return root, Win11Optimizator(root, profile)
 
-            exec_logger.info(f"Installation Complete: Installed {len(selected)} applications!")
-            logging.info(f"Section4: Finished installing {len(selected)} applications")
+def run_gui(profile=()):
+    request_admin_privileges()
+    if "startup" in profile:
+        profiler = RunProfiler(f"startup_{datetime.now():%Y%m%d-%H%M%S}")
+        root, app = profiler.profile(create_app, profile)
+        log_profile(profiler, logging)
+    else:
+        root, app = create_app(profile)
+    root.mainloop()
+    app.engine.close()
+    logging.info("--- Application closed ---")
 
-        except Exception as e:
-            logging.error(f"Execute section 4 failed: {str(e)}\n{traceback.format_exc()}")
-            if hasattr(self, 'output_text4'):
-                try:
-                    fatal_logger = logging.getLogger(f"Section4_Exec_{threading.get_ident()}")
-                    if not fatal_logger.handlers:
-                        fatal_logger.addHandler(TextHandler(self.output_text4))
-                        fatal_logger.setLevel(logging.ERROR)
-                    fatal_logger.error(f"Installation Failed: {str(e)}")
-                except:
-                    pass
-            raise
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv == ["--startup-probe"]:
+        return startup_probe()
+    setup_logging()
+    if not argv: # Plain GUI launch: skip argparse entirely
+        run_gui(requested_profile())
+        return EXIT_OK
+    args = build_arg_parser().parse_args(argv)
+    if is_headless(args):
+        return run_cli(args)
+    run_gui(requested_profile(args))
+    return EXIT_OK
 
 # --- Main Execution ---
 if __name__ == "__main__":
-    request_admin_privileges()
-    root = tk.Tk()
-    app = Win11Optimizator(root)
-    root.mainloop()
-    logging.info("--- Application closed ---")
+    sys.exit(main())